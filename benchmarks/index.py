@@ -0,0 +1,103 @@
+""" Build time, size and query latency of a local Index over a synthetic corpus
+
+The corpus is made of the fixture articles with their title, intro and step
+descriptions rewritten from a vocabulary of 50000 made-up words drawn with
+Zipf's law, as words are in real text, so that every article has its own
+postings. Queries are drawn the same way.
+
+Usage:
+    python benchmarks/index.py [--articles 20000] [--queries 200]
+"""
+
+import argparse
+import glob
+import itertools
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import wikihowunofficialapi as wha
+from wikihowunofficialapi.index import Index
+
+FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'wikihowunofficialapi', 'fixtures', 'articles')
+VOCABULARY = 50000
+
+
+def load_fixtures():
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, '*.html'))):
+        article = wha.Article('https://www.wikihow.com/' + os.path.basename(path))
+        with open(path, 'rb') as f:
+            article._parse_content(f.read())
+        corpus.append(article.to_dict())
+    return corpus
+
+
+def vocabulary(rng, size=VOCABULARY):
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    words = {''.join(rng.choices(letters, k=rng.randint(3, 9))) for _ in range(size)}
+    return sorted(words), list(itertools.accumulate(1 / rank for rank in range(1, len(words) + 1)))
+
+
+def synthetic(corpus, n, rng, words, weights):
+    def text(k):
+        return ' '.join(rng.choices(words, cum_weights=weights, k=k))
+    for i in range(n):
+        data = dict(rng.choice(corpus))
+        data['url'] = 'https://www.wikihow.com/Synthetic-{}'.format(i)
+        data['title'] = 'How to ' + text(4)
+        data['intro'] = text(40)
+        data['methods'] = [[title, [[step_title, text(12), picture] for step_title, _, picture in steps]]
+                           for title, steps in data['methods']]
+        yield wha.Article.from_dict(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=20000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--segment-size', type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    corpus = load_fixtures()
+    words, weights = vocabulary(rng)
+    articles = list(synthetic(corpus, args.articles, rng, words, weights))
+    directory = tempfile.mkdtemp()
+    try:
+        start = time.perf_counter()
+        with Index(directory) as index:
+            index.add(articles, args.segment_size)
+        build = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+        start = time.perf_counter()
+        index = Index(directory)
+        opened = time.perf_counter() - start
+        queries = [' '.join(rng.choices(words, cum_weights=weights, k=rng.randint(2, 3))) for _ in range(args.queries)]
+        for label in ('segments', 'merged'):
+            latencies = []
+            for query in queries:
+                start = time.perf_counter()
+                list(index.search_results(query, 10))
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            print('{:<9} segments: {:>3}  query median: {:.2f} ms  p99: {:.2f} ms'.format(
+                label, len(index._snapshot.segments), statistics.median(latencies) * 1000,
+                latencies[int(len(latencies) * 0.99) - 1] * 1000))
+            index.merge()
+        print('articles: {}  build: {:.1f} s ({:.0f} articles/s)  size: {:.1f} MiB  open: {:.0f} ms'.format(
+            len(index), build, args.articles / build, size / 2 ** 20, opened * 1000))
+        index.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
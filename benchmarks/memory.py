@@ -0,0 +1,65 @@
+""" Memory used by parsed articles held in memory, measured with tracemalloc """
+
+import glob
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import wikihowunofficialapi as wha
+
+FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'wikihowunofficialapi', 'fixtures', 'articles')
+COUNT = 2000
+
+
+def load_blobs():
+    blobs = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, '*.html'))):
+        article = wha.Article('https://www.wikihow.com/' + os.path.basename(path))
+        with open(path, 'rb') as f:
+            try:
+                article._parse_content(f.read())
+            except Exception:
+                continue
+        blobs.append(article.to_bytes())
+    return blobs
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return held, after - before
+
+
+def main():
+    blobs = load_blobs()
+    # restored from bytes so that every article owns its own strings, as after a real parse
+    articles, article_bytes = measure(
+        lambda: [wha.Article.from_bytes(blobs[i % len(blobs)]) for i in range(COUNT)])
+    n_steps = sum(len(method.steps) for article in articles for method in article.methods)
+    print('articles: {}  steps: {}'.format(COUNT, n_steps))
+    print('Article objects:  {:8.0f} bytes/article'.format(article_bytes / COUNT))
+
+    # steps are rebuilt from JSON so that both containers own their strings
+    rows = json.dumps([[step.number, step.title, step.description, step.picture]
+                       for article in articles for method in article.methods for step in method.steps])
+    _, step_bytes = measure(lambda: [wha.Steps(*row) for row in json.loads(rows)])
+    print('Steps objects:    {:8.0f} bytes/step'.format(step_bytes / n_steps))
+
+    if hasattr(wha, 'StepTable'):
+        def build_table():
+            table = wha.StepTable()
+            for row in json.loads(rows):
+                table.append(wha.Steps(*row))
+            return table
+        _, table_bytes = measure(build_table)
+        print('StepTable:        {:8.0f} bytes/step'.format(table_bytes / n_steps))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+""" Offline parse benchmark over the fixture corpus
+
+Reports, for every fixture article, the median time to parse it, the time spent
+building the tree and in each Article._parse_* method, and the memory peak,
+retained size and retained allocations of one parse, measured with tracemalloc.
+
+Usage:
+    python benchmarks/parse.py [--repeat N] [--backend lxml|html.parser] [--json results.json]
+"""
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bs4 import BeautifulSoup
+
+import wikihowunofficialapi as wha
+
+FIXTURES = os.path.join(os.path.dirname(__file__), '..', 'wikihowunofficialapi', 'fixtures', 'articles')
+
+
+class MethodTimer:
+    """Wraps the Article._parse_* methods to add up the time spent in each."""
+
+    def __init__(self):
+        self.totals = {}
+        self._originals = {}
+
+    def __enter__(self):
+        for parser, _, _ in wha.Article._FIELD_PARSERS:
+            original = getattr(wha.Article, parser)
+            self._originals[parser] = original
+            setattr(wha.Article, parser, self._wrap(parser, original))
+        return self
+
+    def __exit__(self, *exc_info):
+        for parser, original in self._originals.items():
+            setattr(wha.Article, parser, original)
+
+    def _wrap(self, parser, original):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.totals[parser] = self.totals.get(parser, 0) + time.perf_counter() - start
+        return timed
+
+
+def parse(read_content, backend):
+    article = wha.Article('https://www.wikihow.com/', backend=backend)
+    article._parse_content(read_content)
+    return article
+
+
+def bench_file(path, backend, repeat):
+    with open(path, 'rb') as f:
+        read_content = f.read()
+
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(read_content, backend)
+        latencies.append(time.perf_counter() - start)
+
+    soup_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        BeautifulSoup(read_content, wha._resolve_backend(backend))
+        soup_times.append(time.perf_counter() - start)
+
+    with MethodTimer() as timer:
+        for _ in range(repeat):
+            parse(read_content, backend)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    base = tracemalloc.get_traced_memory()[0]
+    article = parse(read_content, backend)
+    current, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+    del article
+
+    return {
+        'file': os.path.basename(path),
+        'bytes': len(read_content),
+        'parse_ms': statistics.median(latencies) * 1000,
+        'soup_ms': statistics.median(soup_times) * 1000,
+        'methods_ms': {parser: total / repeat * 1000 for parser, total in timer.totals.items()},
+        'peak_kib': (peak - base) / 1024,
+        'retained_kib': (current - base) / 1024,
+        'retained_blocks': blocks,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--backend', default='auto')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args(argv)
+
+    paths = sorted(glob.glob(os.path.join(FIXTURES, '*.html')))
+    results = [bench_file(path, args.backend, args.repeat) for path in paths]
+
+    print('backend: {}  repeat: {}'.format(wha._resolve_backend(args.backend), args.repeat))
+    print('{:<22} {:>8} {:>9} {:>8} {:>9} {:>10} {:>8}'.format(
+        'file', 'KiB', 'parse ms', 'soup ms', 'peak KiB', 'kept KiB', 'blocks'))
+    for result in results:
+        print('{:<22} {:>8.1f} {:>9.2f} {:>8.2f} {:>9.0f} {:>10.0f} {:>8}'.format(
+            result['file'], result['bytes'] / 1024, result['parse_ms'], result['soup_ms'],
+            result['peak_kib'], result['retained_kib'], result['retained_blocks']))
+
+    print()
+    print('{:<26} {:>12}'.format('_parse_* method', 'total ms'))
+    totals = {}
+    for result in results:
+        for method, ms in result['methods_ms'].items():
+            totals[method] = totals.get(method, 0) + ms
+    for method, ms in sorted(totals.items(), key=lambda item: -item[1]):
+        print('{:<26} {:>12.3f}'.format(method, ms))
+    print('{:<26} {:>12.3f}'.format('all articles', sum(result['parse_ms'] for result in results)))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'backend': wha._resolve_backend(args.backend), 'results': results}, f, indent=1)
+
+
+if __name__ == '__main__':
+    main()
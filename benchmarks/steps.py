@@ -0,0 +1,69 @@
+""" Time spent extracting the steps of one method, by number of steps
+
+Builds articles whose single method has 50 to 1600 steps, each with a picture,
+a bold summary, a reference and a script, and reports the median time of
+Article._parse_methods and the time per step, which stays flat while the
+extraction is linear in the size of the method.
+
+Usage:
+    python benchmarks/steps.py [--repeat N] [--backend lxml|html.parser]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bs4 import BeautifulSoup
+
+import wikihowunofficialapi as wha
+
+STEPS = (50, 100, 200, 400, 800, 1600)
+
+STEP = ('<li id="step-id-{0}"><div class="mwimg largeimage"><a class="image" href="/Image:Step-{0}.jpg">'
+        '<img alt="Step {0}" data-src="https://www.wikihow.com/images/thumb/Step-{0}.jpg" src="data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"/>'
+        '</a></div><div class="step_num">{0}</div><div class="step"><b class="whb">Do step {0}.</b> '
+        'Hold a treat above the dog\'s nose.<sup class="reference"><a href="#_note-{0}">[{0}]</a></sup>'
+        '<script>WH.performance.mark("step{0}");</script></div><div class="clearall"></div></li>\n')
+
+
+def article_html(steps):
+    return ('<html><body><div class="section steps steps_first sticky"><h3><span class="mw-headline">Method</span>'
+            '</h3><div class="section_text"><ol>{}</ol></div></div></body></html>').format(
+        ''.join(STEP.format(number) for number in range(1, steps + 1)))
+
+
+def bench_steps(steps, backend, repeat):
+    html = article_html(steps)
+    times = []
+    for _ in range(repeat):
+        # _parse_methods removes the tags it has read, so every run needs a new tree
+        soup = BeautifulSoup(html, backend)
+        methods = soup.find_all('div', {'class': 'section'})
+        article = wha.Article('https://www.wikihow.com/')
+        start = time.perf_counter()
+        article._parse_methods(methods)
+        times.append(time.perf_counter() - start)
+    assert len(article._methods[0]._steps) == steps
+    return statistics.median(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--backend', default='auto')
+    args = parser.parse_args(argv)
+    backend = wha._resolve_backend(args.backend)
+
+    print('backend: {}  repeat: {}'.format(backend, args.repeat))
+    print('{:>8} {:>10} {:>10}'.format('steps', 'ms', 'us/step'))
+    for steps in STEPS:
+        seconds = bench_steps(steps, backend, args.repeat)
+        print('{:>8} {:>10.2f} {:>10.1f}'.format(steps, seconds * 1000, seconds / steps * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+""" Articles fetched and parsed per second against the local mock server, by number of workers
+
+Usage:
+    python benchmarks/throughput.py [--latency 0.2] [--bandwidth BYTES] [--throttle-rate 0.05] [--articles 64]
+                                    [--rate-limit 20 --scheduler]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import wikihowunofficialapi as wha
+from wikihowunofficialapi.mockserver import MockWikiHow
+
+WORKERS = (1, 2, 4, 8, 16, 32)
+
+
+def fetch(url, transport):
+    try:
+        return wha.Article(url, transport=transport).title
+    except wha.ParseError:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=64)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--bandwidth', type=int)
+    parser.add_argument('--error-rate', type=float, default=0)
+    parser.add_argument('--throttle-rate', type=float, default=0)
+    parser.add_argument('--rate-limit', type=float, help='requests per second the mock server allows')
+    parser.add_argument('--scheduler', action='store_true', help='send requests through a HostScheduler')
+    args = parser.parse_args(argv)
+
+    with MockWikiHow(latency=args.latency, bandwidth=args.bandwidth, error_rate=args.error_rate,
+                     throttle_rate=args.throttle_rate, rate_limit=args.rate_limit, seed=0) as mock:
+        urls = ['https://www.wikihow.com/Article-{}'.format(i) for i in range(args.articles)]
+        print('latency: {}s  articles: {}'.format(args.latency, args.articles))
+        print('{:>8} {:>10} {:>10} {:>8} {:>8} {:>8}'.format(
+            'workers', 'articles/s', 'parsed', '429s', 'errors', 'limit'))
+        for workers in WORKERS:
+            mock.reset_stats()
+            scheduler = wha.HostScheduler(rate=None, concurrency=workers) if args.scheduler else None
+            transport = mock.transport(pool_size=workers, scheduler=scheduler)
+            start = time.perf_counter()
+            with ThreadPoolExecutor(workers) as pool:
+                titles = list(pool.map(lambda url: fetch(url, transport), urls))
+            elapsed = time.perf_counter() - start
+            transport.close()
+            print('{:>8} {:>10.1f} {:>10} {:>8} {:>8} {:>8}'.format(
+                workers, len(urls) / elapsed, sum(title is not None for title in titles),
+                mock.stats[429], mock.stats[500], scheduler.limit(urls[0]) if scheduler else '-'))
+
+
+if __name__ == '__main__':
+    main()
@@ -15,12 +15,14 @@ setuptools.setup(
     author_email='vigilant.umbrella@gmail.com',
     license='MIT',
     packages=setuptools.find_packages(),
+    package_data={'wikihowunofficialapi': ['fixtures/articles/*.html', 'fixtures/search/*.html']},
     install_requires=['bs4', 'tqdm'],
+    extras_require={'lxml': ['lxml'], 'brotli': ['brotli']},
     classifiers=[
         'Intended Audience :: Science/Research',
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
         'Programming Language :: Python :: 3'
     ],
-    python_requires='>=3.6'
+    python_requires='>=3.7'
 )
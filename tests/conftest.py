@@ -0,0 +1,27 @@
+""" Fixtures shared by the tests that talk to the mock wikiHow server """
+
+import pytest
+
+from wikihowunofficialapi.mockserver import MockWikiHow
+
+# the fault settings of MockWikiHow, as a fresh server has them
+MOCK_DEFAULTS = {'latency': 0, 'bandwidth': None, 'error_rate': 0, 'throttle_rate': 0, 'rate_limit': None,
+                 'retry_after': 1, 'random_articles': 1 << 30, 'compress': True, 'search_pages': 3,
+                 'https_only': False}
+
+
+@pytest.fixture(scope='module')
+def server():
+    with MockWikiHow(seed=0) as server:
+        yield server
+
+
+@pytest.fixture
+def mock(server):
+    """The module's server with default fault settings and zeroed counters; settings a test changes are undone."""
+    for name, value in MOCK_DEFAULTS.items():
+        setattr(server, name, value)
+    server.reset_stats()
+    yield server
+    for name, value in MOCK_DEFAULTS.items():
+        setattr(server, name, value)
@@ -0,0 +1,56 @@
+""" Awaited articles must parse as Article does, and gather_articles must keep order and bound what is in flight """
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import wikihowunofficialapi as wha
+from wikihowunofficialapi import aio
+
+URLS = ['https://www.wikihow.com/Page-{}'.format(i) for i in range(12)]
+# a results page, not an article
+NOT_AN_ARTICLE = 'https://www.wikihow.com/wikiHowTo?search=dog'
+
+
+@pytest.fixture
+def mock(mock):
+    mock.latency = 0.05
+    return mock
+
+
+def test_awaiting_an_article(mock):
+    transport = mock.transport()
+
+    async def fetch():
+        article = aio.AsyncArticle(URLS[0], transport, backend='html.parser')
+        assert await article is article
+        assert await article.parse() is article
+        return article
+
+    article = asyncio.run(fetch())
+    assert mock.stats[200] == 1
+    assert article.to_dict() == wha.Article(URLS[0], transport=transport, backend='html.parser').to_dict()
+
+
+def test_gather_keeps_order_and_bounds_concurrency(mock):
+    articles = asyncio.run(aio.gather_articles(URLS, concurrency=3, transport=mock.transport(), backend='html.parser'))
+    assert [article.url for article in articles] == URLS
+    assert all(isinstance(article, aio.AsyncArticle) and article.title for article in articles)
+    assert 1 < mock.max_in_flight <= 3
+
+
+def test_gather_runs_on_the_given_executor(mock):
+    with ThreadPoolExecutor(2) as executor:
+        articles = asyncio.run(aio.gather_articles(URLS, transport=mock.transport(), executor=executor,
+                                                   backend='html.parser'))
+    assert len(articles) == len(URLS)
+    assert mock.max_in_flight == 2
+
+
+def test_gather_failed_articles(mock):
+    urls = [URLS[0], NOT_AN_ARTICLE, URLS[1]]
+    with pytest.raises(wha.ParseError):
+        asyncio.run(aio.gather_articles(urls, transport=mock.transport()))
+    articles = asyncio.run(aio.gather_articles(urls, transport=mock.transport(), return_exceptions=True))
+    assert [type(article) for article in articles] == [aio.AsyncArticle, wha.ParseError, aio.AsyncArticle]
@@ -0,0 +1,31 @@
+""" Differential test: every parser backend must extract the same fields from the fixture corpus """
+
+import glob
+import os
+
+import pytest
+from bs4.builder import builder_registry
+
+import wikihowunofficialapi as wha
+from wikihowunofficialapi.mockserver import DEFAULT_FIXTURES
+
+FIXTURES = sorted(glob.glob(os.path.join(DEFAULT_FIXTURES, 'articles', '*.html')))
+INSTALLED_BACKENDS = [name for name in wha.BACKENDS if builder_registry.lookup(name)]
+
+
+def parse(path, backend):
+    article = wha.Article('https://www.wikihow.com/' + os.path.basename(path), backend=backend)
+    with open(path, 'rb') as f:
+        article._parse_content(f.read())
+    return article.to_dict()
+
+
+@pytest.mark.parametrize('path', FIXTURES, ids=os.path.basename)
+@pytest.mark.parametrize('backend', INSTALLED_BACKENDS)
+def test_backend_matches_html_parser(path, backend):
+    assert parse(path, backend) == parse(path, 'html.parser')
+
+
+def test_unavailable_backend_falls_back():
+    assert wha._resolve_backend('no-such-parser') in INSTALLED_BACKENDS
+    assert wha._resolve_backend('auto') == INSTALLED_BACKENDS[0]
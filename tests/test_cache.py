@@ -0,0 +1,72 @@
+""" The response cache must evict least recently used entries, skip the network while fresh and key pages canonically """
+
+import os
+import time
+
+import wikihowunofficialapi as wha
+
+URL = 'https://www.wikihow.com/en'
+SPELLINGS = ['https://www.wikihow.com/en', 'http://www.wikihow.com/en', 'https://wikihow.com/en',
+             'http://wikihow.com/en', 'HTTPS://WWW.WIKIHOW.COM/en#Steps', 'https://m.wikihow.com/en']
+
+
+def fetch(transport, url=URL):
+    with transport.open(url) as response:
+        return response.from_cache, response.read()
+
+
+def test_lru_eviction(tmp_path):
+    cache = wha.ResponseCache(str(tmp_path))
+    body = b'x' * 1000
+    cache.put('https://www.wikihow.com/a', 200, {}, body)
+    entry_size = os.path.getsize(cache._path('https://www.wikihow.com/a'))
+    # room for three entries, whose sizes differ by a byte or two with the digits of their timestamps
+    cache = wha.ResponseCache(str(tmp_path), max_size=3 * entry_size + entry_size // 2)
+    for name in 'bc':
+        time.sleep(0.01)
+        cache.put('https://www.wikihow.com/' + name, 200, {}, body)
+    time.sleep(0.01)
+    # reading a marks it as recently used, so b is now the oldest
+    assert cache.get('https://www.wikihow.com/a').body == body
+    time.sleep(0.01)
+    cache.put('https://www.wikihow.com/d', 200, {}, body)
+    kept = [name for name in 'abcd' if cache.get('https://www.wikihow.com/' + name) is not None]
+    assert kept == ['a', 'c', 'd']
+    assert len(os.listdir(str(tmp_path))) == 3
+
+
+def test_fresh_entries_skip_the_network(mock, tmp_path):
+    transport = mock.transport(cache=wha.ResponseCache(str(tmp_path)))
+    from_cache, page = fetch(transport)
+    assert not from_cache
+    for _ in range(3):
+        assert fetch(transport) == (True, page)
+    assert mock.stats == {200: 1}
+
+
+def test_expired_entries_are_revalidated(mock, tmp_path):
+    transport = mock.transport(cache=wha.ResponseCache(str(tmp_path), ttl=0))
+    _, page = fetch(transport)
+    assert fetch(transport) == (True, page)
+    assert mock.stats == {200: 1, 304: 1}
+
+
+def test_lang_ttl_overrides(mock, tmp_path):
+    cache = wha.ResponseCache(str(tmp_path), ttl=3600, lang_ttl={'de': 0})
+    assert cache.ttl_for('https://de.wikihow.com/de') == 0
+    assert cache.ttl_for(URL) == cache.ttl_for('https://fr.wikihow.com/fr') == 3600
+    transport = mock.transport(cache=cache)
+    for _ in range(2):
+        fetch(transport, URL)
+        fetch(transport, 'https://de.wikihow.com/de')
+    # only the German page went back to the server
+    assert mock.stats == {200: 2, 304: 1}
+
+
+def test_url_spellings_share_one_entry(mock, tmp_path):
+    transport = mock.transport(cache=wha.ResponseCache(str(tmp_path)))
+    _, page = fetch(transport, SPELLINGS[0])
+    for url in SPELLINGS[1:]:
+        assert fetch(transport, url) == (True, page)
+    assert mock.stats == {200: 1}
+    assert len(os.listdir(str(tmp_path))) == 1
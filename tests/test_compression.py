@@ -0,0 +1,67 @@
+""" Content-Encoding negotiation, streaming decompression and byte accounting """
+
+import gzip
+import zlib
+
+import pytest
+
+import wikihowunofficialapi as wha
+from wikihowunofficialapi.instrument import Recorder
+from wikihowunofficialapi.transport import _Decoder
+
+URL = 'http://www.wikihow.com/en_long'
+
+
+@pytest.fixture(scope='module')
+def page(server):
+    with server.transport(headers={'Accept-Encoding': 'identity'}).open(URL) as response:
+        assert 'Content-Encoding' not in response.headers
+        return response.read()
+
+
+@pytest.mark.parametrize('encoding', ['gzip', 'deflate'])
+def test_decoded_body_matches(mock, page, encoding):
+    with mock.transport(headers={'Accept-Encoding': encoding}).open(URL) as response:
+        assert response.headers['Content-Encoding'] == encoding
+        assert response.read() == page
+        assert response.bytes_decoded == len(page)
+        assert 0 < response.bytes_received < len(page) / 4
+
+
+def test_default_headers_accept_compression(mock, page):
+    with mock.transport().open(URL) as response:
+        assert response.headers['Content-Encoding'] in ('gzip', 'br')
+        assert response.read() == page
+
+
+def test_streamed_reads_never_return_empty_early(mock, page):
+    chunks = []
+    with mock.transport().open(URL) as response:
+        while True:
+            chunk = response.read(64)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    assert b''.join(chunks) == page
+
+
+@pytest.mark.parametrize('compress', [zlib.compress, lambda data: zlib.compress(data)[2:-4], gzip.compress],
+                         ids=['zlib', 'raw-deflate', 'gzip'])
+def test_decoder(compress):
+    data = b'<p>How to</p>' * 500
+    decoder = _Decoder('gzip' if compress is gzip.compress else 'deflate')
+    encoded = compress(data)
+    decoded = b''.join(decoder.decode(encoded[i:i + 7], False) for i in range(0, len(encoded), 7))
+    assert decoded + decoder.decode(b'', True) == data
+
+
+def test_transfer_event_and_cache(mock, page, tmp_path):
+    transport = mock.transport(cache=wha.ResponseCache(str(tmp_path)))
+    with Recorder() as recorder:
+        article = wha.Article('https://www.wikihow.com/en_long', transport=transport)
+        article.title
+    transfer = next(data for event, data in recorder.events if event == 'transfer')
+    assert transfer['bytes_decoded'] == len(page) > transfer['bytes_received']
+    # the cache holds the decoded page
+    with transport.open(URL) as response:
+        assert response.from_cache and response.read() == page
@@ -0,0 +1,192 @@
+""" A crawl must resume where an interrupted one stopped, and a refresh must parse only the articles that changed """
+
+import json
+import os
+import shutil
+
+import pytest
+
+from wikihowunofficialapi import crawl
+from wikihowunofficialapi.cache import canonical_url
+from wikihowunofficialapi.mockserver import DEFAULT_FIXTURES, MockWikiHow
+
+URLS = ['https://www.wikihow.com/en', 'https://www.wikihow.com/en_long', 'https://de.wikihow.com/de']
+PAGES = ['https://www.wikihow.com/Page-{}'.format(i) for i in range(12)]
+
+
+@pytest.fixture
+def fixtures(tmp_path):
+    directory = str(tmp_path / 'fixtures')
+    shutil.copytree(DEFAULT_FIXTURES, directory)
+    return directory
+
+
+def edit(fixtures, name, old, new):
+    path = os.path.join(fixtures, 'articles', name + '.html')
+    with open(path, 'rb') as f:
+        page = f.read()
+    assert old in page
+    with open(path, 'wb') as f:
+        f.write(page.replace(old, new))
+
+
+def crawl_with(fixtures, tmp_path, output, refresh, urls=URLS):
+    with MockWikiHow(fixtures) as server:
+        crawler = crawl.Crawler(str(tmp_path / output), fetch_workers=2, parse_processes=1,
+                                transport=server.transport(), backend='html.parser',
+                                manifest=str(tmp_path / 'manifest'))
+        stats = crawler.refresh(urls) if refresh else crawler.run(urls)
+        return stats, server.stats
+
+
+def resume_with(mock, tmp_path, urls=PAGES, limit=None):
+    mock.reset_stats()
+    crawler = crawl.Crawler(str(tmp_path / 'articles.jsonl'), fetch_workers=2, parse_processes=1,
+                            transport=mock.transport(), backend='html.parser')
+    return crawler.run(urls, limit)
+
+
+def interrupted(urls, after):
+    yield from urls[:after]
+    raise KeyboardInterrupt
+
+
+def records(path):
+    with open(str(path), encoding='utf-8') as f:
+        return sorted(canonical_url(json.loads(line)['url']) for line in f)
+
+
+def titles(path):
+    return [article.title for article in crawl.read_articles(str(path))]
+
+
+def test_resume_after_a_limit(mock, tmp_path):
+    stats = resume_with(mock, tmp_path, limit=4)
+    assert stats['parsed'] == 4
+    stats = resume_with(mock, tmp_path)
+    assert stats['skipped'] == 4 and stats['parsed'] == 8
+    assert mock.stats[200] == 8
+    assert records(tmp_path / 'articles.jsonl') == sorted(canonical_url(url) for url in PAGES)
+
+
+def test_resume_after_an_interruption(mock, tmp_path):
+    with pytest.raises(KeyboardInterrupt):
+        resume_with(mock, tmp_path, interrupted(PAGES, 8))
+    before = records(tmp_path / 'articles.jsonl')
+    with open(str(tmp_path / 'articles.jsonl.checkpoint'), encoding='utf-8') as f:
+        finished = len(f.readlines())
+    stats = resume_with(mock, tmp_path)
+    # pages in flight when the crawl stopped are fetched again, finished ones are not
+    assert stats['skipped'] == finished == len(before)
+    assert stats['parsed'] == mock.stats[200] == len(PAGES) - finished
+    assert records(tmp_path / 'articles.jsonl') == sorted(canonical_url(url) for url in PAGES)
+
+
+def test_resume_drops_lines_cut_short(mock, tmp_path):
+    resume_with(mock, tmp_path, limit=2)
+    # a crash in the middle of writing a record and the checkpoint line after it
+    output, checkpoint = str(tmp_path / 'articles.jsonl'), str(tmp_path / 'articles.jsonl.checkpoint')
+    with open(output, encoding='utf-8') as f:
+        record = f.readline()
+    with open(output, 'a', encoding='utf-8') as f:
+        f.write(record[:len(record) // 2])
+    with open(checkpoint, 'a', encoding='utf-8') as f:
+        f.write(canonical_url(PAGES[2])[:-2])
+    stats = resume_with(mock, tmp_path)
+    assert stats['skipped'] == 2 and stats['parsed'] == 10
+    assert records(output) == sorted(canonical_url(url) for url in PAGES)
+    assert len(titles(output)) == len(PAGES)
+    # every URL after the cut line was recorded as done
+    stats = resume_with(mock, tmp_path)
+    assert stats['skipped'] == len(PAGES) and stats['parsed'] == 0
+
+
+@pytest.mark.parametrize('content, kept', [
+    (b'', b''),
+    (b'{"a": 1}\n{"b": 2}\n', b'{"a": 1}\n{"b": 2}\n'),
+    (b'{"a": 1}\n{"b": 2}\n{"c": 3', b'{"a": 1}\n{"b": 2}\n'),
+    (b'{"a": 1}\n' + b'x' * 40, b'{"a": 1}\n'),
+    (b'x' * 40, b''),
+], ids=['empty', 'complete', 'partial', 'long_partial', 'only_partial'])
+def test_trim_partial_line(tmp_path, monkeypatch, content, kept):
+    # blocks far smaller than a line, so that the search back spans several of them
+    monkeypatch.setattr(crawl, '_TAIL_BLOCK_SIZE', 7)
+    path = tmp_path / 'articles.jsonl'
+    path.write_bytes(content)
+    crawl._trim_partial_line(str(path))
+    assert path.read_bytes() == kept
+
+
+def test_resume_retries_rate_limited_pages(mock, tmp_path):
+    mock.throttle_rate = 1
+    stats = resume_with(mock, tmp_path)
+    assert stats['failed'] == len(PAGES) and mock.stats[429] == len(PAGES)
+    mock.throttle_rate = 0
+    stats = resume_with(mock, tmp_path)
+    assert stats['skipped'] == 0 and stats['parsed'] == len(PAGES)
+    assert records(tmp_path / 'articles.jsonl') == sorted(canonical_url(url) for url in PAGES)
+
+
+def test_resume_skips_pages_that_cannot_be_parsed(mock, tmp_path):
+    results_page = 'https://www.wikihow.com/wikiHowTo?search=dog'
+    assert resume_with(mock, tmp_path, [results_page])['failed'] == 1
+    assert resume_with(mock, tmp_path, [results_page])['skipped'] == 1
+
+
+def test_manifest(tmp_path):
+    path = str(tmp_path / 'manifest')
+    manifest = crawl.Manifest(path)
+    entry = crawl.ManifestEntry('2021-03-29T00:00:00', '"abc"', None, 'ff')
+    manifest.add('https://www.wikihow.com/en', entry)
+    manifest.add('https://wikihow.com/en', entry._replace(etag='"abc2"'))
+    manifest.add('http://wikihow.com/en', entry._replace(etag='"def"'))
+    manifest.close()
+    manifest = crawl.Manifest(path)
+    assert len(manifest) == 1
+    assert manifest.get('https://wikihow.com/en') == entry._replace(etag='"def"')
+    assert 'https://wikihow.com/fr' not in manifest
+    manifest.close()
+    # outdated lines are dropped once they outnumber the current ones
+    with open(path, encoding='utf-8') as f:
+        assert len(f.readlines()) == 1
+
+
+def test_refresh_of_unchanged_pages_is_answered_with_304(fixtures, tmp_path):
+    stats, _ = crawl_with(fixtures, tmp_path, 'articles.jsonl', False)
+    assert stats['parsed'] == 3
+    # the crawl checkpoint does not make the refreshes skip anything, nor does the last refresh
+    for _ in range(2):
+        stats, served = crawl_with(fixtures, tmp_path, 'articles.jsonl', True, None)
+        assert stats['unchanged'] == 3 and stats['parsed'] == stats['skipped'] == 0
+        assert served[304] == 3 and served[200] == 0
+    assert len(titles(tmp_path / 'articles.jsonl')) == 3
+    assert not os.path.exists(str(tmp_path / 'articles.jsonl.checkpoint.refresh'))
+
+
+def test_refresh_parses_only_changed_pages(fixtures, tmp_path):
+    crawl_with(fixtures, tmp_path, 'articles.jsonl', False)
+    # new bytes but the same last update: not worth a full parse
+    edit(fixtures, 'en', b'</body>', b'<!-- served by another node --></body>')
+    # a new last update
+    edit(fixtures, 'en_long', b'March 29, 2021', b'January 2, 2024')
+    # no last update date the manifest could compare, so the body is parsed
+    edit(fixtures, 'de', b'</body>', b'<!-- 2 --></body>')
+    stats, served = crawl_with(fixtures, tmp_path, 'changes.jsonl', True, None)
+    assert served[200] == 3
+    assert stats['unchanged'] == 1 and stats['parsed'] == 2
+    with open(str(tmp_path / 'changes.jsonl'), encoding='utf-8') as f:
+        changed = {canonical_url(record['url']): record for record in map(json.loads, f)}
+    assert set(changed) == {canonical_url(URLS[1]), canonical_url(URLS[2])}
+    assert changed[canonical_url(URLS[1])]['last_updated'] == '2024-01-02T00:00:00'
+
+    manifest = crawl.Manifest(str(tmp_path / 'manifest'))
+    assert manifest.get(URLS[1]).last_updated == '2024-01-02T00:00:00'
+    manifest.close()
+    # the manifest now holds the new validators of every page
+    stats, served = crawl_with(fixtures, tmp_path, 'changes.jsonl', True, None)
+    assert stats['unchanged'] == 3 and served[304] == 3
+
+
+def test_refresh_needs_a_manifest(tmp_path):
+    with pytest.raises(ValueError):
+        crawl.Crawler(str(tmp_path / 'articles.jsonl')).refresh()
@@ -0,0 +1,81 @@
+""" Stalled requests must time out, and searches must end with what they have when their deadline passes """
+
+import time
+
+import pytest
+
+import wikihowunofficialapi as wha
+
+URL = 'https://www.wikihow.com/en'
+
+
+def elapsed(function):
+    start = time.monotonic()
+    function()
+    return time.monotonic() - start
+
+
+def test_read_timeout(mock):
+    mock.latency = 1
+    transport = mock.transport(read_timeout=0.2)
+    with pytest.raises(TimeoutError):
+        transport.open(URL)
+    with pytest.raises(wha.FetchTimeout):
+        wha.Article(URL, transport=transport).title
+
+
+def test_article_deadline_covers_the_body(mock):
+    # the body alone takes seconds at this bandwidth, though no single read stalls
+    mock.bandwidth = 500
+    article = wha.Article(URL, transport=mock.transport(), deadline=0.5)
+    start = time.monotonic()
+    with pytest.raises(wha.FetchTimeout):
+        article.title
+    assert time.monotonic() - start < 1
+    assert not article._parsed_fields
+
+
+def test_deadline_is_per_fetch(mock):
+    mock.latency = 0.2
+    article = wha.Article(URL, transport=mock.transport(), deadline=1)
+    assert article.title
+    assert article.intro
+
+
+@pytest.mark.parametrize('cached', [False, True])
+def test_timeout_in_the_body_releases_the_scheduler_slot(mock, tmp_path, cached):
+    mock.bandwidth = 2000
+    scheduler = wha.HostScheduler(rate=None)
+    cache = wha.ResponseCache(str(tmp_path)) if cached else None
+    transport = mock.transport(scheduler=scheduler, cache=cache)
+    # with a cache the body is read inside open
+    with pytest.raises(TimeoutError):
+        with transport.open(URL, timeout=0.3) as response:
+            response.read()
+    assert scheduler._hosts[scheduler.host_key(URL)].in_flight == 0
+
+
+def test_scheduler_acquire_timeout():
+    scheduler = wha.HostScheduler(rate=None, concurrency=1)
+    scheduler.acquire(URL)
+    with pytest.raises(TimeoutError):
+        scheduler.acquire(URL, timeout=0.1)
+    scheduler.release(URL)
+    scheduler.acquire(URL, timeout=0.1)
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_search_returns_partial_results(mock, workers):
+    mock.latency = 0.1
+    results = []
+    seconds = elapsed(lambda: results.extend(
+        wha.WikiHow.search('dog', 10, transport=mock.transport(), workers=workers, deadline=0.45)))
+    assert 0 < len(results) < 10
+    assert seconds < 0.7
+
+
+def test_search_deadline_before_first_page(mock):
+    mock.latency = 1
+    transport = mock.transport()
+    assert wha.search_wikihow('dog', 3, transport=transport, deadline=0.1) == []
+    assert list(wha.WikiHow.search_results('dog', 3, transport=transport, deadline=0.1)) == []
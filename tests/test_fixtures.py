@@ -0,0 +1,180 @@
+""" Parse the recorded fixture corpus offline and check every field against its expected output """
+
+import glob
+import json
+import copy
+import os
+import pickle
+import zlib
+
+import pytest
+
+import wikihowunofficialapi as wha
+from wikihowunofficialapi.mockserver import DEFAULT_FIXTURES
+
+EXPECTED = os.path.join(os.path.dirname(__file__), 'fixtures', 'expected')
+ARTICLES = sorted(glob.glob(os.path.join(DEFAULT_FIXTURES, 'articles', '*.html')))
+SEARCHES = sorted(glob.glob(os.path.join(DEFAULT_FIXTURES, 'search', '*.html')))
+
+
+def name_of(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def parse(path, **kwargs):
+    article = wha.Article('https://www.wikihow.com/' + name_of(path), **kwargs)
+    with open(path, 'rb') as f:
+        article._parse_content(f.read(), kwargs.get('fields'))
+    return article
+
+
+def expected(path):
+    with open(os.path.join(EXPECTED, name_of(path) + '.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_corpus_covers_every_language():
+    assert set(wha.WikiHow.lang2url) <= {name_of(path) for path in ARTICLES}
+    assert set(wha.WikiHow.lang2url) <= {name_of(path) for path in SEARCHES}
+
+
+@pytest.mark.parametrize('path', ARTICLES, ids=name_of)
+def test_article_matches_expected(path):
+    data = parse(path, backend='html.parser').to_dict()
+    del data['version'], data['url']
+    assert data == expected(path)
+
+
+@pytest.mark.parametrize('path', ARTICLES, ids=name_of)
+def test_every_property_is_readable(path):
+    article = parse(path)
+    info = article.get()
+    assert info['n_methods'] == len(article.methods)
+    for method in article.methods:
+        for step in method.steps:
+            assert step.get()['number'] == step.number
+
+
+@pytest.mark.parametrize('path', ARTICLES, ids=name_of)
+def test_serialization_round_trip(path):
+    article = parse(path)
+    restored = wha.Article.from_bytes(article.to_bytes())
+    assert restored.to_dict() == article.to_dict()
+
+
+@pytest.mark.parametrize('path', ARTICLES[:3], ids=name_of)
+def test_pickle_and_deepcopy(path):
+    article = parse(path)
+    # a parsed article holds its lock, and this one a transport with pooled connections
+    article._transport = wha.Transport()
+    article._parse_lock()
+    for restored in (pickle.loads(pickle.dumps(article)), copy.deepcopy(article)):
+        assert restored.to_dict() == article.to_dict()
+        assert restored._parse_lock() is not article._lock
+        assert restored._transport is None
+
+
+def test_serialized_by_another_parser_version():
+    article = parse(ARTICLES[0])
+    data = article.to_dict()
+    data['version'] = wha.PARSER_VERSION + 1
+    with pytest.raises(wha.SerializationError):
+        wha.Article.from_dict(data)
+    blob = bytearray(article.to_bytes())
+    blob[len(b'WHA')] = wha.PARSER_VERSION + 1
+    with pytest.raises(wha.SerializationError):
+        wha.Article.from_bytes(bytes(blob))
+
+
+@pytest.mark.parametrize('data', [None, [], {'version': wha.PARSER_VERSION},
+                                  {'version': wha.PARSER_VERSION, 'url': 'https://www.wikihow.com/x'}],
+                         ids=['none', 'list', 'no_url', 'no_fields'])
+def test_malformed_dict(data):
+    with pytest.raises(wha.SerializationError):
+        wha.Article.from_dict(data)
+
+
+def test_malformed_bytes():
+    blob = parse(ARTICLES[0]).to_bytes()
+    for data in (b'', b'XYZ' + blob[3:], blob[:4] + b'not zlib', blob[:-10], blob[:4] + zlib.compress(b'[1, 2]')):
+        with pytest.raises(wha.SerializationError):
+            wha.Article.from_bytes(data)
+
+
+@pytest.mark.parametrize('path', ARTICLES, ids=name_of)
+def test_selected_fields_match_full_parse(path):
+    fields = {'title', 'intro', 'summary', 'last_updated'}
+    article = parse(path, fields=fields)
+    full = expected(path)
+    assert {field: getattr(article, field) for field in fields - {'last_updated'}} == \
+        {field: full[field] for field in fields - {'last_updated'}}
+    assert 'methods' not in article._parsed_fields
+
+
+@pytest.mark.parametrize('fields', [(), set(), ['title', 'body']], ids=['tuple', 'set', 'unknown'])
+def test_empty_or_unknown_fields_are_rejected(fields):
+    with pytest.raises(ValueError):
+        wha.Article('https://www.wikihow.com/en', fields=fields)
+
+
+def comparable(article, field):
+    value = getattr(article, field)
+    if field == 'methods':
+        return [(method.title, [step.get() for step in method.steps]) for method in value]
+    return value
+
+
+@pytest.mark.parametrize('path', ARTICLES, ids=name_of)
+def test_each_field_alone_matches_full_parse(path):
+    full = parse(path)
+    for field in wha.Article.FIELDS:
+        article = parse(path, fields={field})
+        assert article._parsed_fields == {field} or field in ('num_votes', 'percent_helpful')
+        assert comparable(article, field) == comparable(full, field), field
+
+
+def test_to_dict_of_selected_fields_parses_every_field(mock):
+    article = wha.Article('https://www.wikihow.com/en', fields={'title'}, transport=mock.transport(),
+                          backend='html.parser')
+    assert article.title
+    data = article.to_dict()
+    del data['version'], data['url']
+    assert data == expected(os.path.join(DEFAULT_FIXTURES, 'articles', 'en.html'))
+    assert wha.Article.from_dict(article.to_dict()).methods
+    # one fetch for the title, one for everything else
+    assert mock.stats[200] == 2
+    fresh = wha.Article('https://www.wikihow.com/en', fields={'title'}, transport=mock.transport(),
+                        backend='html.parser')
+    assert fresh.to_dict()['methods'] == article.to_dict()['methods']
+    assert mock.stats[200] == 3
+
+
+@pytest.mark.parametrize('path', SEARCHES, ids=name_of)
+def test_search_results_page(path):
+    from bs4 import BeautifulSoup
+
+    with open(path, 'rb') as f:
+        links = BeautifulSoup(f.read(), 'html.parser').find_all('a', {'class': 'result_link'})
+    results = [wha.SearchResult._from_link(link) for link in links]
+    assert results
+    assert all(result.url.startswith('http') and result.title for result in results)
+
+
+def test_method_step_edge_cases():
+    html = ('<div class="section steps sticky"><h3><span class="mw-headline">Method</span></h3><ol>'
+            '<li id="step-id-1"><a class="image"><img data-src="a.jpg"/></a><div class="step">'
+            '<b>Bold <div>hidden</div>part.</b> Rest<sup>[1]</sup>.<script>x = 1;</script></div></li>'
+            '<li id="step-id-2"><a class="image"></a><div class="step"><b>Link <a class="external free">x</a></b>'
+            ' Two.</div></li>'
+            '<li id="step-id-3"><div class="step"> No summary.</div></li>'
+            '<li id="step-id-4"><a class="image"><img data-src="extra.jpg"/></a></li></ol>'
+            '<a class="external free">ref</a></div>')
+    article = wha.Article('https://www.wikihow.com/Edge-Cases', backend='html.parser')
+    article._parse_content(html.encode(), ['methods', 'references'])
+    steps = [(step.title, step.description, step.picture) for step in article.methods[0].steps]
+    assert steps == [('Bold part.', 'Rest.', 'a.jpg'), ('Link x', 'Two.', ''), ('', 'No summary.', None)]
+    # links inside the bold summary of a step are not references, whether or not the methods were parsed
+    assert article.references == 1
+    article = wha.Article('https://www.wikihow.com/Edge-Cases', backend='html.parser')
+    article._parse_content(html.encode(), ['references'])
+    assert article.references == 1
@@ -0,0 +1,128 @@
+""" The local index must rank the fixture articles with BM25 and survive reopening, re-adding and merging """
+
+import glob
+import os
+
+import pytest
+
+import wikihowunofficialapi as wha
+from wikihowunofficialapi.index import Index, tokenize
+from wikihowunofficialapi.mockserver import DEFAULT_FIXTURES
+
+FIXTURES = os.path.join(DEFAULT_FIXTURES, 'articles')
+
+
+def load(name, url=None):
+    article = wha.Article(url or 'https://www.wikihow.com/' + name, backend='html.parser')
+    with open(os.path.join(FIXTURES, name + '.html'), 'rb') as f:
+        article._parse_content(f.read())
+    return article
+
+
+@pytest.fixture(scope='module')
+def articles():
+    names = [os.path.splitext(os.path.basename(path))[0] for path in sorted(glob.glob(os.path.join(FIXTURES, '*.html')))]
+    return {name: load(name) for name in names}
+
+
+@pytest.fixture
+def index(tmp_path, articles):
+    with Index(str(tmp_path / 'index')) as index:
+        index.add(articles.values())
+        yield index
+
+
+def test_tokenize():
+    assert tokenize('How to Train a Dog!') == ['how', 'to', 'train', 'a', 'dog']
+    # no spaces between words: overlapping pairs
+    assert tokenize('训练狗') == ['训练', '练狗']
+
+
+def test_tokenize_keeps_combining_marks():
+    assert tokenize('कुत्ते को प्रशिक्षित करें।') == ['कुत्ते', 'को', 'प्रशिक्षित', 'करें']
+    # pairs of Thai characters keep the vowel and tone marks of each
+    assert tokenize('วิธีฝึกสุนัข') == ['วิธี', 'ธีฝึ', 'ฝึก', 'กสุ', 'สุนั', 'นัข']
+
+
+def test_search_returns_parsed_articles(index, articles):
+    results = list(index.search(articles['fr'].title, 3))
+    assert results[0].to_dict() == articles['fr'].to_dict()
+    assert all(isinstance(result, wha.Article) for result in results)
+
+
+def test_search_results(index, articles):
+    result = next(index.search_results(articles['de'].title))
+    assert result.url == articles['de'].url
+    assert result.title == articles['de'].title
+    assert result.intro == articles['de'].intro
+
+
+def test_scores_are_ranked(index):
+    scores = index.scores('dog treat sit', -1)
+    assert scores
+    assert [score for score, _ in scores] == sorted((score for score, _ in scores), reverse=True)
+    assert index.scores('zzzunknownword') == []
+
+
+@pytest.mark.parametrize('lang', ['zh', 'th', 'hi'])
+def test_languages_with_unspaced_words_or_marks(index, articles, lang):
+    title = articles[lang].title
+    assert index.scores(title, 1)[0][1] == 'https://wikihow.com/' + lang
+
+
+def test_reopen_and_incremental_add(tmp_path, articles):
+    directory = str(tmp_path / 'index')
+    with Index(directory) as index:
+        index.add([articles['en'], articles['fr']])
+    with Index(directory) as index:
+        assert len(index) == 2
+        index.add([articles['de']])
+        assert len(index) == 3
+        assert 'https://www.wikihow.com/de' in index
+        assert len(os.listdir(directory)) == 7
+
+
+def test_readd_replaces_earlier_copy(index, articles):
+    count = len(index)
+    replacement = load('en_long', articles['en'].url)
+    index.add([replacement])
+    assert len(index) == count
+    assert index.get(articles['en'].url).title == replacement.title
+    urls = [url for _, url in index.scores(replacement.title, -1)]
+    assert urls.count('https://wikihow.com/en') == 1
+
+
+def test_merge(index, articles):
+    index.add([load('en_long', articles['en'].url)])
+    before = {url for _, url in index.scores('train dog', -1)}
+    index.merge()
+    assert len(index._snapshot.segments) == 1
+    # document frequencies no longer count the replaced copy, so only the scores change
+    assert {url for _, url in index.scores('train dog', -1)} == before
+    assert len(Index(index.directory)) == len(articles)
+
+
+def test_merge_includes_other_writers(tmp_path, articles):
+    directory = str(tmp_path / 'index')
+    with Index(directory) as merger, Index(directory) as writer:
+        merger.add([articles['en']])
+        # added after the merger last read the manifest
+        writer.add([articles['fr']])
+        writer.add([articles['de']])
+        merger.merge()
+        assert len(merger) == 3
+    with Index(directory) as index:
+        assert len(index) == 3 and len(index._snapshot.segments) == 1
+        assert index._snapshot.segments[0].name == '000004'
+        assert index.get(articles['de'].url).title == articles['de'].title
+
+
+def test_refresh_sees_other_writers(tmp_path, articles):
+    directory = str(tmp_path / 'index')
+    reader = Index(directory)
+    with Index(directory) as writer:
+        writer.add([articles['en']])
+    assert len(reader) == 0
+    reader.refresh()
+    assert len(reader) == 1
+    reader.close()
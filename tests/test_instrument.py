@@ -0,0 +1,83 @@
+""" Instrumentation events reported while fetching and parsing articles """
+
+import os
+
+import pytest
+
+import wikihowunofficialapi as wha
+from wikihowunofficialapi import instrument
+from wikihowunofficialapi.instrument import Recorder
+from wikihowunofficialapi.mockserver import DEFAULT_FIXTURES
+
+FIXTURE = os.path.join(DEFAULT_FIXTURES, 'articles', 'en_train_a_dog.html')
+
+
+def parse_fixture(**kwargs):
+    article = wha.Article('https://www.wikihow.com/Train-a-Dog', **kwargs)
+    with open(FIXTURE, 'rb') as f:
+        article._parse_content(f.read(), kwargs.get('fields'))
+    return article
+
+
+def test_every_phase_is_timed(mock):
+    with Recorder() as recorder:
+        wha.Article('https://www.wikihow.com/en_train_a_dog', transport=mock.transport()).title
+    names = [event for event, _ in recorder.events]
+    assert names[:5] == ['request', 'fetch', 'transfer', 'read', 'soup']
+    assert names[-1] == 'parse'
+    phases = [data['phase'] for event, data in recorder.events if event == 'parse_field']
+    assert phases == [parser for parser, _, _ in wha.Article._FIELD_PARSERS]
+    read = next(data for event, data in recorder.events if event == 'read')
+    assert read['bytes'] == os.path.getsize(FIXTURE)
+    assert all(data['seconds'] >= 0 for event, data in recorder.events if event != 'transfer')
+
+
+def test_selected_fields_only_time_their_parsers():
+    with Recorder() as recorder:
+        parse_fixture(fields=['title'])
+    assert [data['phase'] for event, data in recorder.events if event == 'parse_field'] == ['_parse_title']
+
+
+def test_parse_error_names_the_failing_field(monkeypatch):
+    def broken(self, nodes):
+        raise AttributeError('no steps')
+
+    monkeypatch.setattr(wha.Article, '_parse_methods', broken)
+    with Recorder() as recorder, pytest.raises(AttributeError):
+        parse_fixture()
+    event, data = recorder.events[-1]
+    assert event == 'parse_error'
+    assert data['phase'] == '_parse_methods'
+    assert data['fields'] == ('methods',)
+
+
+def test_fetch_error(mock):
+    mock.error_rate = 1
+    try:
+        with Recorder() as recorder, pytest.raises(wha.ParseError):
+            wha.Article('https://www.wikihow.com/Fails', transport=mock.transport()).title
+    finally:
+        mock.error_rate = 0
+    assert recorder.events[-1][0] == 'parse_error'
+    assert recorder.events[-1][1]['phase'] == 'fetch'
+
+
+def test_cache_events(mock, tmp_path):
+    transport = mock.transport(cache=wha.ResponseCache(str(tmp_path), ttl=0))
+    with Recorder() as recorder:
+        for _ in range(2):
+            transport.open('http://www.wikihow.com/Train-a-Dog').read()
+    assert [data['result'] for event, data in recorder.events if event == 'cache'] == ['miss', 'revalidated']
+
+
+def test_removed_listener_is_not_called():
+    events = []
+
+    def listener(event, data):
+        events.append(event)
+
+    wha.add_listener(listener)
+    wha.remove_listener(listener)
+    parse_fixture()
+    assert events == []
+    assert instrument._listeners == ()
@@ -0,0 +1,62 @@
+""" The local mock server must stand in for every wikiHow host and inject the faults it is configured with """
+
+import urllib.error
+
+import pytest
+
+import wikihowunofficialapi as wha
+
+
+def test_article_is_served_by_name(mock):
+    article = wha.Article('https://www.wikihow.com/en_long', transport=mock.transport(), backend='html.parser')
+    assert article.title == 'How to Train a Dog (Long)'
+
+
+@pytest.mark.parametrize('lang', sorted(wha.WikiHow.lang2url))
+def test_randomizer_redirects_on_every_host(mock, lang):
+    article = wha.random_article(lang, transport=mock.transport(), backend='html.parser')
+    assert article.title
+    assert mock.stats[302] == 1
+
+
+def test_search(mock):
+    results = wha.search_wikihow('dog', 3, transport=mock.transport(), backend='html.parser')
+    assert len(results) == 3
+    assert mock.stats[200] == 4
+
+
+def test_injected_errors(mock):
+    transport = mock.transport()
+    mock.error_rate = 1
+    with pytest.raises(urllib.error.HTTPError) as error:
+        transport.open('http://www.wikihow.com/Train-a-Dog')
+    assert error.value.code == 500
+
+    mock.error_rate, mock.throttle_rate, mock.retry_after = 0, 1, 7
+    with pytest.raises(urllib.error.HTTPError) as error:
+        transport.open('http://www.wikihow.com/Train-a-Dog')
+    assert error.value.code == 429
+    assert error.value.headers['Retry-After'] == '7'
+
+
+def test_rate_limit(mock):
+    transport = mock.transport()
+    mock.rate_limit = 2
+    codes = []
+    for _ in range(4):
+        try:
+            with transport.open('http://www.wikihow.com/Train-a-Dog') as response:
+                codes.append(response.status)
+        except urllib.error.HTTPError as e:
+            codes.append(e.code)
+    assert codes[:2] == [200, 200]
+    assert 429 in codes[2:]
+
+
+def test_etag_revalidation(mock):
+    transport = mock.transport()
+    with transport.open('http://www.wikihow.com/Train-a-Dog') as response:
+        etag = response.headers['ETag']
+        response.read()
+    with transport.open('http://www.wikihow.com/Train-a-Dog', headers={'If-None-Match': etag}) as response:
+        assert response.status == 304
@@ -0,0 +1,59 @@
+""" Article.parse_many must return what a parse in this process returns, in order, with pooled connections warm or cold """
+
+import os
+
+import pytest
+
+import wikihowunofficialapi as wha
+from wikihowunofficialapi.mockserver import DEFAULT_FIXTURES
+
+FIXTURES = os.path.join(DEFAULT_FIXTURES, 'articles')
+NAMES = ['en', 'fr', 'de', 'en_long']
+URLS = ['https://www.wikihow.com/Page-{}'.format(i) for i in range(40)]
+
+
+def read(name):
+    with open(os.path.join(FIXTURES, name + '.html'), 'rb') as f:
+        return f.read()
+
+
+def parse_here(url, read_content):
+    article = wha.Article(url, backend='html.parser')
+    article._parse_content(read_content)
+    return article.to_dict()
+
+
+@pytest.fixture
+def shared_transport(mock):
+    previous = wha.get_transport()
+    wha.set_transport(mock.transport())
+    yield mock
+    wha.set_transport(previous)
+
+
+def test_html_and_pairs_keep_their_order():
+    pairs = [('https://www.wikihow.com/' + name, read(name)) for name in NAMES]
+    articles = wha.Article.parse_many(pairs, processes=2, backend='html.parser')
+    assert [article.to_dict() for article in articles] == [parse_here(url, html) for url, html in pairs]
+    articles = wha.Article.parse_many([html for _, html in pairs], processes=2, backend='html.parser')
+    assert [article.title for article in articles] == [wha.Article.from_dict(parse_here(*pair)).title
+                                                       for pair in pairs]
+
+
+def test_failed_items():
+    items = [read('en'), b'<html></html>']
+    with pytest.raises(wha.ParseError):
+        wha.Article.parse_many(items, processes=2)
+    articles = wha.Article.parse_many(items, processes=2, return_exceptions=True)
+    assert isinstance(articles[0], wha.Article)
+    assert isinstance(articles[1], wha.ParseError)
+
+
+@pytest.mark.parametrize('warm', [False, True])
+def test_urls_with_pooled_connections(shared_transport, warm):
+    if warm:
+        # the workers are forked with this connection in the pool
+        wha.Article(URLS[0]).title
+    articles = wha.Article.parse_many(URLS, processes=8, return_exceptions=True)
+    assert all(isinstance(article, wha.Article) for article in articles)
+    assert [article.url for article in articles] == URLS
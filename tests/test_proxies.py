@@ -0,0 +1,85 @@
+""" Proxies must receive the credentials of their URL and be reached on the default port of their scheme """
+
+import base64
+import http.server
+import threading
+
+import pytest
+
+import wikihowunofficialapi as wha
+
+CREDENTIALS = 'user:p@ss w'
+PROXY_USER = 'user:p%40ss%20w'
+
+
+class _ProxyHandler(http.server.BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _record(self):
+        self.server.requests.append((self.command, self.path, self.headers.get('Proxy-Authorization')))
+
+    def do_GET(self):
+        self._record()
+        body = b'<html></html>'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_CONNECT(self):
+        # refusing the tunnel is enough, its headers have arrived by then
+        self._record()
+        self.send_response(502)
+        self.end_headers()
+
+
+@pytest.fixture
+def proxy():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _ProxyHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def basic(credentials):
+    return 'Basic ' + base64.b64encode(credentials.encode('utf-8')).decode('ascii')
+
+
+def test_http_page_sends_credentials_with_each_request(proxy):
+    address = 'http://{}@127.0.0.1:{}'.format(PROXY_USER, proxy.server_port)
+    transport = wha.Transport(proxies={'http': address})
+    for _ in range(2):
+        with transport.open('http://www.wikihow.com/en') as response:
+            assert response.read() == b'<html></html>'
+    assert proxy.requests == [('GET', 'http://www.wikihow.com/en', basic(CREDENTIALS))] * 2
+
+
+def test_https_page_sends_credentials_in_the_tunnel_request(proxy):
+    address = 'http://{}@127.0.0.1:{}'.format(PROXY_USER, proxy.server_port)
+    transport = wha.Transport(proxies={'https': address})
+    with pytest.raises(OSError):
+        transport.open('https://www.wikihow.com/en')
+    assert proxy.requests == [('CONNECT', 'www.wikihow.com:443', basic(CREDENTIALS))]
+
+
+def test_proxy_without_credentials(proxy):
+    transport = wha.Transport(proxies={'http': '127.0.0.1:{}'.format(proxy.server_port)})
+    transport.open('http://www.wikihow.com/en').read()
+    assert proxy.requests == [('GET', 'http://www.wikihow.com/en', None)]
+
+
+@pytest.mark.parametrize('proxy_url, port', [
+    ('http://proxy.example', 80),
+    ('proxy.example', 80),
+    ('https://proxy.example', 443),
+    ('http://proxy.example:3128', 3128),
+])
+@pytest.mark.parametrize('scheme', ['http', 'https'])
+def test_proxy_port_defaults_by_the_proxy_scheme(proxy_url, port, scheme):
+    transport = wha.Transport(proxies={scheme: proxy_url})
+    conn = transport._connect(scheme, 'www.wikihow.com', 443 if scheme == 'https' else 80)
+    assert (conn.host, conn.port) == ('proxy.example', port)
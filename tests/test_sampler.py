@@ -0,0 +1,62 @@
+""" Random sampling with redirect resolution and Bloom filter dedup """
+
+import wikihowunofficialapi as wha
+from wikihowunofficialapi.cache import canonical_url
+from wikihowunofficialapi.sampler import BloomFilter, RandomSampler
+
+
+def test_bloom_filter():
+    seen = BloomFilter(capacity=1000, error_rate=0.01)
+    assert seen.add('a') and not seen.add('a')
+    assert 'a' in seen and len(seen) == 1
+    for i in range(1000):
+        seen.add(str(i))
+    false_positives = sum('x{}'.format(i) in seen for i in range(10000))
+    assert false_positives < 300
+
+
+def test_article_records_final_url(mock):
+    article = wha.random_article('es', transport=mock.transport(), backend='html.parser')
+    assert article.url.startswith('http://es.wikihow.com/Random-Article-')
+    assert article.to_dict()['url'] == article.url
+
+
+def test_resolve_sends_only_head_requests(mock):
+    url = mock.transport().resolve('http://www.wikihow.com/Special:Randomizer', max_hops=1)
+    assert url.startswith('http://www.wikihow.com/Random-Article-')
+    assert mock.stats == {302: 1}
+
+
+def test_sample_is_unique(mock):
+    mock.random_articles = 6
+    sampler = RandomSampler(workers=4, transport=mock.transport(), backend='html.parser')
+    articles = list(sampler.draw(6, max_attempts=200))
+    urls = {canonical_url(article.url) for article in articles}
+    assert len(urls) == len(articles) == 6
+    assert sampler.stats['duplicate'] > 0
+    # only the unique articles were downloaded
+    assert mock.stats[200] == 6
+
+
+def test_randomizer_redirecting_to_itself_over_https(mock):
+    # lang2url holds http:// URLs, so Special:Randomizer first redirects to its https:// self
+    mock.https_only = True
+    sampler = RandomSampler(workers=2, transport=mock.transport(), backend='html.parser')
+    articles = list(sampler.draw(5, max_attempts=5))
+    assert len({canonical_url(article.url) for article in articles}) == 5
+    assert all(article.url.startswith('https://www.wikihow.com/Random-Article-') for article in articles)
+    assert sampler.stats == {'drawn': 5, 'duplicate': 0, 'failed': 0}
+    assert mock.stats[301] == 5
+
+
+def test_sample_gives_up_when_attempts_run_out(mock):
+    mock.random_articles = 2
+    sampler = RandomSampler(workers=2, transport=mock.transport(), backend='html.parser')
+    assert len(list(sampler.draw(5, max_attempts=20))) == 2
+
+
+def test_sample_per_language(mock):
+    sampler = RandomSampler(transport=mock.transport(), backend='html.parser')
+    sample = sampler.sample(2, langs=['en', 'de'])
+    assert {lang: len(articles) for lang, articles in sample.items()} == {'en': 2, 'de': 2}
+    assert all(article.url.startswith('http://de.wikihow.com/') for article in sample['de'])
@@ -0,0 +1,117 @@
+""" Per-host rate limiting, adaptive concurrency, retries and the fetch error types """
+
+import pickle
+import threading
+import time
+import urllib.error
+
+import pytest
+
+import wikihowunofficialapi as wha
+from wikihowunofficialapi.instrument import Recorder
+from wikihowunofficialapi.scheduler import HostScheduler, parse_retry_after
+
+URL = 'https://www.wikihow.com/Train-a-Dog'
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('3') == 3
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+    assert 0 <= parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') < 1
+
+
+def test_aimd():
+    scheduler = HostScheduler(concurrency=8, max_concurrency=10, backoff=0)
+    scheduler.record(URL, ok=False)
+    assert scheduler.limit(URL) == 4
+    # www., m. and the scheme do not make a different host
+    assert scheduler.limit('http://m.wikihow.com/Other') == 4
+    # one more slot per window of successes
+    for _ in range(5):
+        scheduler.record(URL, ok=True)
+    assert scheduler.limit(URL) == 5
+    for _ in range(10):
+        scheduler.record(URL, ok=False)
+    assert scheduler.limit(URL) == 1
+    for _ in range(200):
+        scheduler.record(URL, ok=True)
+    assert scheduler.limit(URL) == 10
+    assert scheduler.limit('https://es.wikihow.com/') == 8
+
+
+def test_failures_in_one_window_halve_once():
+    scheduler = HostScheduler(concurrency=8, backoff=60)
+    for _ in range(5):
+        scheduler.record(URL, ok=False)
+    assert scheduler.limit(URL) == 4
+
+
+def test_token_bucket():
+    scheduler = HostScheduler(rate=20, burst=1, concurrency=10)
+    start = time.monotonic()
+    for _ in range(5):
+        scheduler.acquire(URL)
+        scheduler.release(URL)
+    assert time.monotonic() - start >= 0.19
+
+
+def test_concurrency_limit():
+    scheduler = HostScheduler(rate=None, concurrency=1)
+    scheduler.acquire(URL)
+    acquired = threading.Event()
+    thread = threading.Thread(target=lambda: (scheduler.acquire(URL), acquired.set()))
+    thread.start()
+    assert not acquired.wait(0.1)
+    scheduler.release(URL)
+    assert acquired.wait(1)
+    thread.join()
+
+
+def test_retry_honours_retry_after(mock):
+    mock.rate_limit = 2
+    transport = mock.transport(scheduler=HostScheduler(rate=None, concurrency=1, backoff=0.01))
+    start = time.monotonic()
+    with Recorder() as recorder:
+        for _ in range(4):
+            with transport.open(URL) as response:
+                response.read()
+                assert response.status == 200
+    assert mock.stats[429] >= 1
+    assert time.monotonic() - start >= 0.9
+    assert any(event == 'retry' for event, _ in recorder.events)
+
+
+def test_retries_run_out(mock):
+    mock.error_rate = 1
+    transport = mock.transport(scheduler=HostScheduler(retries=2, backoff=0.01))
+    with pytest.raises(wha.HTTPError) as error:
+        wha.Article(URL, transport=transport).title
+    assert error.value.status == 500
+    assert isinstance(error.value, wha.ParseError)
+    assert mock.stats[500] == 3
+
+
+def test_rate_limited(mock):
+    mock.throttle_rate, mock.retry_after = 1, 7
+    with pytest.raises(wha.RateLimited) as error:
+        wha.Article(URL, transport=mock.transport()).title
+    assert error.value.retry_after == 7
+    assert isinstance(error.value.__cause__, urllib.error.HTTPError)
+
+
+def test_network_error():
+    transport = wha.Transport(host_overrides={'www.wikihow.com': '127.0.0.1:1'}, proxies={})
+    with pytest.raises(wha.NetworkError):
+        wha.Article(URL, transport=transport).title
+
+
+def test_search_page_errors(mock):
+    mock.error_rate = 1
+    with pytest.raises(wha.HTTPError):
+        wha.search_wikihow('dog', transport=mock.transport())
+
+
+def test_fetch_errors_pickle():
+    error = pickle.loads(pickle.dumps(wha.RateLimited(URL, 429, 2.0)))
+    assert (type(error), error.url, error.status, error.retry_after) == (wha.RateLimited, URL, 429, 2.0)
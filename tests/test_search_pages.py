@@ -0,0 +1,87 @@
+""" Search results spanning several pages, with the next page prefetched """
+
+import asyncio
+import os
+import shutil
+import time
+
+import pytest
+
+import wikihowunofficialapi as wha
+from wikihowunofficialapi import aio
+from wikihowunofficialapi.mockserver import DEFAULT_FIXTURES, MockWikiHow
+
+
+def test_every_page_is_read(mock):
+    results = list(wha.WikiHow.search_results('dog', transport=mock.transport()))
+    assert len(results) == len({result.url for result in results}) == 9
+    assert results[3].url.endswith('-page-1')
+    # the last page links back but not forward, so no empty page is requested
+    assert mock.stats == {200: 3}
+
+
+@pytest.mark.parametrize('max_results, pages', [(2, 1), (3, 1), (4, 2), (7, 3)])
+def test_no_page_past_max_results(mock, max_results, pages):
+    results = list(wha.WikiHow.search_results('dog', max_results, transport=mock.transport()))
+    assert len(results) == max_results
+    assert mock.stats == {200: pages}
+
+
+def test_next_page_is_prefetched(mock):
+    mock.latency = 0.1
+    results = wha.WikiHow.search_results('dog', transport=mock.transport())
+    next(results)
+    time.sleep(0.3)
+    # the second page arrived while the first was being used
+    assert mock.stats[200] == 2
+    results.close()
+
+
+def test_page_without_pager(mock):
+    mock.search_pages = 1
+    page, next_url = wha.WikiHow._search_page(wha.WikiHow._search_url('dog'), mock.transport())
+    assert len(page) == 3
+    assert next_url.endswith('wikiHowTo?search=dog&start=3')
+    assert len(list(wha.WikiHow.search_results('dog', transport=mock.transport()))) == 3
+
+
+def test_search_articles_across_pages(mock):
+    articles = wha.search_wikihow('dog', 5, transport=mock.transport(), workers=3, backend='html.parser')
+    assert len(articles) == 5
+
+
+def test_async_search_across_pages(mock):
+    async def search():
+        return [article async for article in aio.AsyncWikiHow.search(
+            'dog', 5, transport=mock.transport(), backend='html.parser')]
+
+    assert len(asyncio.run(search())) == 5
+
+
+@pytest.fixture
+def broken_second_result(tmp_path):
+    # the second result of every page links to a results page, which does not parse as an article
+    fixtures = str(tmp_path / 'fixtures')
+    shutil.copytree(DEFAULT_FIXTURES, fixtures)
+    path = os.path.join(fixtures, 'search', 'en.html')
+    with open(path, 'rb') as f:
+        page = f.read()
+    with open(path, 'wb') as f:
+        f.write(page.replace(b'https://www.wikihow.com/Train-a-Dog-2"', b'https://www.wikihow.com/wikiHowTo?search=x"'))
+    with MockWikiHow(fixtures) as server:
+        server.latency = 0.02
+        yield server
+
+
+@pytest.mark.parametrize('max_results', [2, 4, -1])
+def test_concurrent_search_replaces_failed_results_in_rank_order(broken_second_result, max_results):
+    transport = broken_second_result.transport()
+    ranked = [url for url in (result.url for result in wha.WikiHow.search_results('dog', transport=transport))
+              if 'wikiHowTo' not in url]
+    expected = ranked[:max_results] if max_results > 0 else ranked
+    for workers in (1, 3):
+        articles = list(wha.WikiHow.search('dog', max_results, transport=transport, workers=workers,
+                                           backend='html.parser'))
+        assert [article.url for article in articles] == expected
+    assert expected[:2] == ['https://www.wikihow.com/Train-a-Dog', 'https://www.wikihow.com/Train-a-Dog-3']
+    assert len(ranked) == 6
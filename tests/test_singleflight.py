@@ -0,0 +1,77 @@
+""" Concurrent reads of an Article must share one fetch, and so must articles of the same page """
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import wikihowunofficialapi as wha
+from wikihowunofficialapi.singleflight import SingleFlight
+
+THREADS = 8
+
+
+@pytest.fixture
+def mock(mock):
+    mock.latency = 0.2
+    return mock
+
+
+def run_together(function, n=THREADS):
+    barrier = threading.Barrier(n)
+
+    def call(_):
+        barrier.wait()
+        return function()
+    with ThreadPoolExecutor(n) as pool:
+        return list(pool.map(call, range(n)))
+
+
+def test_single_flight_shares_result():
+    flight = SingleFlight()
+    calls = []
+
+    def work():
+        calls.append(1)
+        time.sleep(0.2)
+        return 'done'
+    results = run_together(lambda: flight.run('key', work))
+    assert len(calls) == 1
+    assert sorted(results) == [('done', False)] + [('done', True)] * (THREADS - 1)
+    assert len(flight) == 0
+
+
+def test_single_flight_shares_errors():
+    flight = SingleFlight()
+
+    def fail():
+        raise wha.ParseError
+    with pytest.raises(wha.ParseError):
+        flight.run('key', fail)
+    assert flight.run('key', lambda: 1) == (1, False)
+
+
+def test_threads_share_one_parse(mock):
+    article = wha.Article('https://www.wikihow.com/en_long', transport=mock.transport(), backend='html.parser')
+    methods = run_together(lambda: article.methods)
+    assert mock.stats[200] == 1
+    assert all(result is methods[0] for result in methods)
+    assert [len(method.steps) for method in article.methods] == [30, 30]
+    assert len(article.tips) == len(set(article.tips))
+
+
+def test_articles_of_one_page_share_one_fetch(mock):
+    transport = mock.transport()
+    articles = run_together(lambda: wha.Article('https://www.wikihow.com/en', transport=transport))
+    data = run_together(lambda: articles.pop().to_dict())
+    assert mock.stats[200] == 1
+    assert all(item == data[0] for item in data)
+
+
+def test_random_articles_are_not_merged(mock):
+    transport = mock.transport()
+    articles = run_together(lambda: wha.random_article(transport=transport, backend='html.parser'), n=4)
+    assert all(article.title for article in articles)
+    assert mock.stats[302] == 4
+    assert len({article.url for article in articles}) == 4
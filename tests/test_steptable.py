@@ -0,0 +1,68 @@
+""" StepTable must hand back the steps it was given, across the blocks its columns are split into """
+
+import glob
+import os
+
+import pytest
+
+import wikihowunofficialapi as wha
+from wikihowunofficialapi.mockserver import DEFAULT_FIXTURES
+
+BLOCK_SIZE = wha._TextColumn.BLOCK_SIZE
+COUNT = 3 * BLOCK_SIZE + 5
+
+
+def make_steps(n=COUNT):
+    # empty strings, None pictures and non-ASCII text, so that offsets and missing values are exercised
+    return [wha.Steps(i % 7 + 1, 'Step {} ✓'.format(i) if i % 5 else '',
+                      'Description {}'.format('é' * (i % 13)), None if i % 3 else 'https://img/{}.jpg'.format(i))
+            for i in range(n)]
+
+
+@pytest.fixture(scope='module')
+def steps():
+    return make_steps()
+
+
+@pytest.fixture(scope='module')
+def table(steps):
+    return wha.StepTable(steps)
+
+
+def test_indexing_across_blocks(steps, table):
+    assert len(table) == len(steps)
+    for index in (0, 1, BLOCK_SIZE - 1, BLOCK_SIZE, BLOCK_SIZE + 1, 2 * BLOCK_SIZE, COUNT - 1, -1, -COUNT):
+        assert table[index].get() == steps[index].get()
+    with pytest.raises(IndexError):
+        table[COUNT]
+    with pytest.raises(IndexError):
+        table[-COUNT - 1]
+
+
+def test_iteration_and_slices(steps, table):
+    assert [step.get() for step in table] == [step.get() for step in steps]
+    window = slice(BLOCK_SIZE - 3, 2 * BLOCK_SIZE + 3, 2)
+    assert [step.get() for step in table[window]] == [step.get() for step in steps[window]]
+
+
+def test_appending_after_reads(steps):
+    table = wha.StepTable(steps[:BLOCK_SIZE - 1])
+    assert table[-1].get() == steps[BLOCK_SIZE - 2].get()
+    for step in steps[BLOCK_SIZE - 1:]:
+        table.append(step)
+    assert [step.get() for step in table] == [step.get() for step in steps]
+
+
+def test_from_articles():
+    articles = []
+    for path in sorted(glob.glob(os.path.join(DEFAULT_FIXTURES, 'articles', '*.html'))):
+        article = wha.Article('https://www.wikihow.com/' + os.path.basename(path), backend='html.parser')
+        with open(path, 'rb') as f:
+            article._parse_content(f.read())
+        articles.append(article)
+    # the corpus repeated until its steps span several blocks
+    articles *= BLOCK_SIZE // sum(len(method.steps) for article in articles for method in article.methods) + 2
+    table = wha.StepTable.from_articles(articles)
+    expected = [step.get() for article in articles for method in article.methods for step in method.steps]
+    assert len(table) == len(expected) > BLOCK_SIZE
+    assert [step.get() for step in table] == expected
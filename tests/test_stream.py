@@ -0,0 +1,46 @@
+""" Streamed downloads must stop once the requested fields have arrived and parse them as a full download does """
+
+import os
+
+import pytest
+
+import wikihowunofficialapi as wha
+from wikihowunofficialapi.instrument import Recorder
+from wikihowunofficialapi.mockserver import DEFAULT_FIXTURES
+
+URL = 'https://www.wikihow.com/en_long'
+PAGE = os.path.join(DEFAULT_FIXTURES, 'articles', 'en_long.html')
+TOP_FIELDS = ('title', 'intro', 'is_expert', 'last_updated')
+
+
+@pytest.fixture(scope='module')
+def full():
+    article = wha.Article(URL, backend='html.parser')
+    with open(PAGE, 'rb') as f:
+        article._parse_content(f.read())
+    return article
+
+
+def read_event(recorder):
+    return next(data for event, data in recorder.events if event == 'read')
+
+
+def test_stream_stops_after_the_fields(mock, full):
+    # uncompressed, so that bytes on the wire and bytes of HTML are the same
+    transport = mock.transport(headers={'Accept-Encoding': 'identity'})
+    article = wha.Article(URL, fields=TOP_FIELDS, stream=True, transport=transport, backend='html.parser')
+    with Recorder() as recorder:
+        values = {field: getattr(article, field) for field in TOP_FIELDS}
+    read = read_event(recorder)
+    assert read['bytes'] == read['bytes_received'] == wha.Article.STREAM_CHUNK_SIZE
+    assert read['bytes'] < os.path.getsize(PAGE)
+    assert values == {field: getattr(full, field) for field in TOP_FIELDS}
+
+
+def test_stream_reads_the_whole_page_for_fields_at_the_bottom(mock, full):
+    article = wha.Article(URL, fields={'title', 'references'}, stream=True,
+                          transport=mock.transport(headers={'Accept-Encoding': 'identity'}), backend='html.parser')
+    with Recorder() as recorder:
+        assert article.references == full.references
+    assert read_event(recorder)['bytes'] == os.path.getsize(PAGE)
+    assert article.title == full.title
@@ -9,13 +9,68 @@ __author__ = 'Aniket Sharma, Ashok Arora'
 __credits__ = 'Aniket Sharma & Ashok Arora'
 
 from bs4 import BeautifulSoup
+from bs4.element import CData, NavigableString, Tag
 import urllib.request
 from wikihowunofficialapi.exceptions import *
+from wikihowunofficialapi.cache import ResponseCache, canonical_url
+from wikihowunofficialapi.transport import Transport, fetch_error, get_transport, set_transport, time_left
+from wikihowunofficialapi.scheduler import HostScheduler
+from wikihowunofficialapi.singleflight import SingleFlight
+from wikihowunofficialapi import instrument
+from wikihowunofficialapi.instrument import add_listener, remove_listener
+from bs4.builder import builder_registry
 from datetime import datetime
+import json
 import re
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from html.parser import HTMLParser
+import codecs
+import functools
+import threading
+import time
+from array import array
+
+# Bump whenever a change to the parser changes what it extracts, so that
+# articles serialized by an older parser are rejected rather than trusted.
+PARSER_VERSION = 1
+
+_SERIALIZED_MAGIC = b'WHA'
+
+# li ids of the steps of a method
+_STEP_ID = re.compile('step.+')
+# strings get_text returns, by exact type: not comments, script or style contents
+_TEXT_TYPES = frozenset((NavigableString, CData))
+# tags whose text is not part of a step
+_SKIPPED_TAGS = frozenset(('script', 'sup'))
+
+# guards the lazy creation of Article locks
+_article_lock = threading.Lock()
+
+# bs4 tree builders, fastest first; html.parser ships with Python and is always available
+BACKENDS = ('lxml', 'html.parser')
+
+
+def _resolve_backend(backend):
+    """Method to return the tree builder to use for a backend option.
+
+    Args:
+        backend(str): 'auto', None or the name of a tree builder.
+
+    Returns:
+        str: The requested tree builder if it is installed, otherwise the fastest installed one.
+    """
+    if backend not in (None, 'auto') and builder_registry.lookup(backend):
+        return backend
+    for name in BACKENDS:
+        if builder_registry.lookup(name):
+            return name
+    return 'html.parser'
 
 
 class Steps:
+    __slots__ = ('_number', '_title', '_description', '_picture')
+
     def __init__(self, number, title=None, description=None, picture=None):
         self._number = number
         self._title = title
@@ -76,6 +131,8 @@ class Steps:
 
 
 class Methods:
+    __slots__ = ('_number', '_title', '_steps')
+
     def __init__(self, number, title):
         self._number = number
         self._title = title
@@ -124,9 +181,273 @@ class Methods:
         }
 
 
+class StepTable:
+    """Columnar store for a large number of steps.
+
+    Each text column is kept as one string plus an array of end offsets
+    instead of one str object per step, and numbers are kept in an array, so a
+    step costs a few bytes besides its text. Indexing returns a Steps object
+    built on the fly.
+    """
+
+    __slots__ = ('_numbers', '_columns')
+
+    def __init__(self, steps=()):
+        self._numbers = array('I')
+        self._columns = (_TextColumn(), _TextColumn(), _TextColumn())
+        for step in steps:
+            self.append(step)
+
+    def __len__(self):
+        return len(self._numbers)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('StepTable index out of range')
+        title, description, picture = (column[index] for column in self._columns)
+        return Steps(self._numbers[index], title, description, picture)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __repr__(self):
+        return '<StepTable of {} steps>'.format(len(self))
+
+    @ classmethod
+    def from_articles(cls, articles):
+        """Method to collect the steps of every method of several articles.
+
+        Args:
+            articles(iterable): Parsed articles.
+
+        Returns:
+            StepTable: Their steps, article by article and method by method.
+        """
+        table = cls()
+        for article in articles:
+            for method in article.methods:
+                for step in method.steps:
+                    table.append(step)
+        return table
+
+    def append(self, step):
+        """Method to add a step at the end of the table.
+
+        Args:
+            step(Steps): The step to add.
+        """
+        self._numbers.append(step.number)
+        for column, value in zip(self._columns, (step.title, step.description, step.picture)):
+            column.append(value)
+
+
+class _TextColumn:
+    """Optional strings stored back to back in blocks of BLOCK_SIZE, with an array of end offsets."""
+
+    BLOCK_SIZE = 256
+
+    __slots__ = ('_blocks', '_pending', '_ends', '_missing')
+
+    def __init__(self):
+        self._blocks = []
+        self._pending = []
+        self._ends = array('I')
+        self._missing = bytearray()
+
+    def append(self, value):
+        self._missing.append(value is None)
+        self._pending.append(value or '')
+        start = self._ends[-1] if len(self._ends) % self.BLOCK_SIZE else 0
+        self._ends.append(start + len(value or ''))
+        if len(self._pending) == self.BLOCK_SIZE:
+            self._blocks.append(''.join(self._pending))
+            self._pending = []
+
+    def __getitem__(self, index):
+        if self._missing[index]:
+            return None
+        block, offset = divmod(index, self.BLOCK_SIZE)
+        if block == len(self._blocks):
+            return self._pending[offset]
+        start = self._ends[index - 1] if offset else 0
+        return self._blocks[block][start:self._ends[index]]
+
+
+class _ArticleNodes:
+    """The nodes of an article page that the Article parsers read.
+
+    The tree is visited once and every relevant node is filed under the field
+    it belongs to, instead of each parser searching the whole tree again.
+    """
+
+    TITLE_CLASSES = {'title_lg', 'title_md', 'title_sm'}
+    METHOD_CLASSES = {'section steps steps_first sticky', 'section steps sticky'}
+    DIV_IDS = {'byline_info': 'byline', 'summary_wrapper': 'summary',
+               'warnings': 'warnings', 'tips': 'tips'}
+
+    TAGS = ('div', 'h1', 'a')
+
+    def __init__(self, soup):
+        self._nodes = {'title': [], 'intro': [], 'methods': [], 'votes': [], 'byline': [],
+                       'stats': [], 'references': [], 'summary': [], 'warnings': [], 'tips': []}
+        nodes = self._nodes
+        for node in soup.find_all(self.TAGS):
+            for field in self.classify(node.name, node.get('id'), node.get('class') or ()):
+                nodes[field].append(node)
+
+    @ classmethod
+    def classify(cls, name, node_id, classes):
+        """Method to return the fields an element belongs to.
+
+        Args:
+            name(str): Tag name of the element.
+            node_id(str): id attribute of the element, or None.
+            classes(list): Classes of the element.
+
+        Returns:
+            list: Names of the fields the element belongs to
+        """
+        fields = []
+        joined = ' '.join(classes)
+        if name == 'div':
+            field = cls.DIV_IDS.get(node_id)
+            if field:
+                fields.append(field)
+            if 'mf-section-0' in classes:
+                fields.append('intro')
+            if 'sp_helpful_rating_count' in classes:
+                fields.append('votes')
+            if joined in cls.METHOD_CLASSES:
+                fields.append('methods')
+            elif joined == 'sp_box sp_stats_box':
+                fields.append('stats')
+        elif name == 'h1':
+            if cls.TITLE_CLASSES.intersection(classes):
+                fields.append('title')
+        elif name == 'a' and joined == 'external free':
+            fields.append('references')
+        return fields
+
+    def first(self, field):
+        """Method to return the first node of a field still in the tree.
+
+        Args:
+            field(str): Name of the field.
+
+        Returns:
+            bs4.element.Tag: The node, or None
+        """
+        for node in self._nodes[field]:
+            if not getattr(node, 'decomposed', False):
+                return node
+        return None
+
+    def all(self, field):
+        """Method to return every node of a field still in the tree.
+
+        Args:
+            field(str): Name of the field.
+
+        Returns:
+            list: The nodes, in document order
+        """
+        return [node for node in self._nodes[field] if not getattr(node, 'decomposed', False)]
+
+
+class _PageStream(HTMLParser):
+    """Follows a page while it downloads to tell when some fields are complete.
+
+    A single-node field is complete once the closing tag of its first element
+    has arrived; everything after that point is not needed to extract it.
+    """
+
+    TAGS = ('div', 'h1')
+
+    def __init__(self, node_fields):
+        super().__init__(convert_charrefs=False)
+        self._pending = set(node_fields)
+        self._open = []
+
+    @property
+    def complete(self):
+        """Method to check whether every followed field is complete.
+
+        Returns:
+            bool: True if no followed field is still open or unseen, False otherwise.
+        """
+        return not self._pending
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.TAGS:
+            attrs = dict(attrs)
+            fields = _ArticleNodes.classify(tag, attrs.get('id'), (attrs.get('class') or '').split())
+            self._open.append((tag, [field for field in fields if field in self._pending]))
+
+    def handle_endtag(self, tag):
+        if tag in self.TAGS:
+            while self._open:
+                open_tag, fields = self._open.pop()
+                self._pending.difference_update(fields)
+                if open_tag == tag:
+                    break
+
+
 class Article:
-    def __init__(self, url='https://www.wikihow.com/Special:Randomizer', lazy=True):
+    FIELDS = ('title', 'intro', 'methods', 'num_votes', 'percent_helpful', 'is_expert', 'last_updated',
+              'views', 'co_authors', 'references', 'summary', 'warnings', 'tips')
+
+    # (parser, node field it reads, article fields it fills), in the order
+    # the parsers must run: intro and methods decompose nodes that the
+    # parsers after them must no longer see
+    _FIELD_PARSERS = (
+        ('_parse_title', 'title', ('title',)),
+        ('_parse_intro', 'intro', ('intro',)),
+        ('_parse_methods', 'methods', ('methods',)),
+        ('_parse_votes_n_helpful', 'votes', ('num_votes', 'percent_helpful')),
+        ('_parse_is_expert', 'byline', ('is_expert',)),
+        ('_parse_last_updated', 'byline', ('last_updated',)),
+        ('_parse_views', 'stats', ('views',)),
+        ('_parse_co_authors', 'stats', ('co_authors',)),
+        ('_parse_references', 'references', ('references',)),
+        ('_parse_summary', 'summary', ('summary',)),
+        ('_parse_warnings', 'warnings', ('warnings',)),
+        ('_parse_tips', 'tips', ('tips',)),
+    )
+    # node fields whose parser takes every matching node rather than the first
+    _MULTI_NODE_FIELDS = ('methods', 'references')
+    _ALL_FIELDS = frozenset(FIELDS)
+
+    __slots__ = ('_url', '_transport', '_backend', '_title', '_intro', '_methods', '_num_votes', '_percent_helpful',
+                 '_is_expert', '_last_updated', '_views', '_co_authors', '_references', '_summary', '_warnings',
+                 '_tips', '_fields', '_stream', '_deadline', '_parsed_fields', '_parsed', '_lock')
+
+    # attributes left out when an article is pickled or copied: a lock cannot be,
+    # and a transport holds open connections, so the copy gets a new lock and the shared transport
+    _UNPICKLED = ('_lock', '_transport')
+
+    # fetches and parses in progress in this process, so that articles
+    # created at the same time for the same page share one download
+    _flights = SingleFlight()
+
+    STREAM_CHUNK_SIZE = 16 * 1024
+
+    def __init__(self, url='https://www.wikihow.com/Special:Randomizer', lazy=True, transport=None, backend='auto',
+                 fields=None, stream=False, deadline=None):
+        if fields is not None:
+            fields = frozenset(fields)
+            if not fields:
+                raise ValueError('Article fields is empty; pass None to extract every field')
+            unknown = fields.difference(self.FIELDS)
+            if unknown:
+                raise ValueError('Unknown Article fields: {}'.format(', '.join(sorted(unknown))))
         self._url = url
+        self._transport = transport
+        self._backend = backend
         self._title = None
         self._intro = None
         self._methods = []
@@ -141,22 +462,43 @@ class Article:
         self._warnings = []
         self._tips = []
 
+        self._fields = fields
+        self._stream = stream
+        self._deadline = deadline
+        self._parsed_fields = frozenset()
         self._parsed = False
+        self._lock = None
         if not lazy:
             self._parse()
 
     def __repr__(self):
         return self.title
 
+    def __getstate__(self):
+        slots = (name for cls in type(self).__mro__ for name in getattr(cls, '__slots__', ()))
+        return {name: getattr(self, name) for name in slots if name not in self._UNPICKLED and hasattr(self, name)}
+
+    def __setstate__(self, state):
+        for name in self._UNPICKLED:
+            setattr(self, name, None)
+        for name, value in state.items():
+            setattr(self, name, value)
+
     @property
     def url(self):
         """Method to return the URL of a wikiHow article.
 
+        Once the article has been fetched this is the URL that served it, so
+        an article built on Special:Randomizer returns the article it was
+        redirected to.
+
         Returns:
             str: The wikiHow article URL
         """
-        if not self._parsed:
-            self._parse()
+        if not self._parsed and not self._parsed_fields:
+            with self._parse_lock():
+                if not self._parsed and not self._parsed_fields:
+                    self._parse()
         return self._url
 
     @property
@@ -166,8 +508,7 @@ class Article:
         Returns:
             str: The wikiHow article title
         """
-        if not self._parsed:
-            self._parse()
+        self._require('title')
         return self._title
 
     @property
@@ -177,8 +518,7 @@ class Article:
         Returns:
             str: The wikiHow article introduction
         """
-        if not self._parsed:
-            self._parse()
+        self._require('intro')
         return self._intro
 
     @property
@@ -188,8 +528,7 @@ class Article:
         Returns:
             list: A list of method titles
         """
-        if not self._parsed:
-            self._parse()
+        self._require('methods')
         return self._methods
 
     @property
@@ -199,7 +538,7 @@ class Article:
         Returns:
             int: The number of methods in a wikiHow article
         """
-        return len(self._methods)
+        return len(self.methods)
 
     @property
     def num_votes(self):
@@ -208,8 +547,7 @@ class Article:
         Returns:
             int: The number of votes given to a wikiHow article
         """
-        if not self._parsed:
-            self._parse()
+        self._require('num_votes')
         return self._num_votes
 
     @property
@@ -219,8 +557,7 @@ class Article:
         Returns:
             int: The percent of helpful recieved by a wikiHow article
         """
-        if not self._parsed:
-            self._parse()
+        self._require('percent_helpful')
         return self._percent_helpful
 
     @property
@@ -230,8 +567,7 @@ class Article:
         Returns:
             bool: True if written by an expert, False otherwise.
         """
-        if not self._parsed:
-            self._parse()
+        self._require('is_expert')
         return self._is_expert
 
     @property
@@ -241,8 +577,7 @@ class Article:
         Returns:
             str: The last date when a wikiHow article was updated.
         """
-        if not self._parsed:
-            self._parse()
+        self._require('last_updated')
         return self._last_updated
 
     @property
@@ -252,8 +587,7 @@ class Article:
         Returns:
             int: Number of times a wikiHow article was viewed.
         """
-        if not self._parsed:
-            self._parse()
+        self._require('views')
         return self._views
 
     @property
@@ -263,8 +597,7 @@ class Article:
         Returns:
             int: Number of co-authors in a wikiHow article.
         """
-        if not self._parsed:
-            self._parse()
+        self._require('co_authors')
         return self._co_authors
 
     @property
@@ -274,8 +607,7 @@ class Article:
         Returns:
             int: Number of references in a wikiHow article.
         """
-        if not self._parsed:
-            self._parse()
+        self._require('references')
         return self._references
 
     @property
@@ -285,8 +617,7 @@ class Article:
         Returns:
             str: summary of a wikiHow article.
         """
-        if not self._parsed:
-            self._parse()
+        self._require('summary')
         return self._summary
 
     @property
@@ -296,8 +627,7 @@ class Article:
         Returns:
             list: Warnings from a wikiHow article.
         """
-        if not self._parsed:
-            self._parse()
+        self._require('warnings')
         return self._warnings
 
     @property
@@ -307,34 +637,30 @@ class Article:
         Returns:
             list: Tips from a wikiHow article.
         """
-        if not self._parsed:
-            self._parse()
+        self._require('tips')
         return self._tips
 
-    def _parse_title(self, soup):
+    def _parse_title(self, html):
         """Method to extract the title of a wikiHow article.
         Args:
-            soup(bs4.BeautifulSoup): An instance of BeautifulSoup class for the entire article.
+            html(bs4.element.Tag): The title heading of the article, or None.
 
         Raises:
             ParseError: The given article could not be parsed.
         """
-        html = soup.findAll(
-            'h1', {'class': ['title_lg', 'title_md', 'title_sm']})[0]
-        if not html.find('a'):
+        if not html or not html.find('a'):
             raise ParseError
         else:
             self._title = html.text
 
-    def _parse_intro(self, soup):
+    def _parse_intro(self, intro_html):
         """Method to extract the introduction from a wikiHow article.
         Args:
-            soup(bs4.BeautifulSoup): An instance of BeautifulSoup class for the entire article.
+            intro_html(bs4.element.Tag): The mf-section-0 div of the article, or None.
 
         Raises:
             ParseError: The given article could not be parsed.
         """
-        intro_html = soup.find('div', {'class': 'mf-section-0'})
         if not intro_html:
             raise ParseError
         else:
@@ -348,17 +674,15 @@ class Article:
                 intro = intro_html.text
                 self._intro = intro.strip()
 
-    def _parse_methods(self, soup):
+    def _parse_methods(self, methods_html):
         """Method to extract the methods from a wikiHow article.
         Args:
-            soup(bs4.BeautifulSoup): An instance of BeautifulSoup class for the entire article.
+            methods_html(list): The method section divs of the article.
 
         Raises:
             ParseError: The given article could not be parsed.
         """
         self._methods = []
-        methods_html = soup.findAll(
-            'div', {'class': ['section steps steps_first sticky', 'section steps sticky']})
         if not methods_html:
             raise ParseError
         else:
@@ -370,58 +694,92 @@ class Article:
                 method = Methods(count, title)
                 self._methods.append(method)
 
-                step_html = method_html.findAll('div', {'class': 'step'})
-
-                pic_count = 0
-                pictures_list = [None] * len(step_html)
-                for list_html in method_html.findAll('ol'):
-                    for list in list_html.findAll('li', {'id': re.compile('step.+')}):
-                        html = list.find('a', {'class': 'image'})
-                        # handling case when there are no images or for when there are videos/gifs instead of images
-                        if html != None:
-                            html = html.find('img')
-                            i = str(html).find('data-src=')
-                            pic = str(html)[i:].replace('data-src="', '')
-                            pic = pic[:pic.find('"')]
-                            pictures_list[pic_count] = pic
-                        pic_count += 1
-                count_steps = 0
-                for html in step_html:
-                    # exception handling because not all steps have a summary
-                    try:
-                        super = html.find('sup')
-                        script = html.find('script')
-                        if script != None:
-                            for script in html.findAll('script'):
-                                script.decompose()
-                        if super != None:
-                            for sup in html.findAll('sup'):
-                                sup.decompose()
-                        count_steps += 1
-                        summary = html.find('b').text
-
-                        for _extra_div in html.find('b').find_all('div'):
-                            summary = summary.replace(_extra_div.text, '')
-                    except:
-                        summary = ''
-
+                steps, pictures = self._method_steps(method_html)
+                for count_steps, (summary, description) in enumerate(steps, 1):
                     step = Steps(count_steps, summary)
-                    ex_step = html
-                    for b in ex_step.findAll('b'):
-                        b.decompose()
-                    step._description = ex_step.text.strip()
-                    step._picture = pictures_list[count_steps-1]
+                    step._description = description
+                    # handling case when there are no images or for when there are videos/gifs instead of images
+                    step._picture = pictures[count_steps-1] if count_steps <= len(pictures) else None
                     self._methods[count-1]._steps.append(step)
 
-    def _parse_votes_n_helpful(self, soup):
+    @ staticmethod
+    def _method_steps(method_html):
+        """Method to extract the steps and step pictures of one method in a single pass over its nodes.
+
+        A step's summary is the text of its first b tag minus any div inside it, and its description is the
+        rest of its text, leaving out script and sup tags. Those and the b tags are removed from the tree
+        afterwards, so that later fields skip the links inside them. The picture of each li whose id starts
+        with 'step' inside an ol is the data-src of the first img in its first a.image, '' when that has no
+        img and None without one.
+
+        Args:
+            method_html(bs4.element.Tag): A method section div of the article.
+
+        Returns:
+            tuple: List of (summary, description) per div.step and list of pictures per step li, in document order.
+        """
+        steps = []
+        pictures = []
+        filled = set()
+        removed = []
+        # node, open step as [summary parts or None, description parts], summary parts to append to,
+        # inside a b, inside an ol, picture slot of the open step li, picture slot of the open a.image
+        stack = [(node, None, None, False, False, None, None) for node in reversed(method_html.contents)]
+        while stack:
+            node, step, summary, in_b, in_ol, li_slot, img_slot = stack.pop()
+            if type(node) in _TEXT_TYPES:
+                if step is not None and not in_b:
+                    step[1].append(node)
+                if summary is not None:
+                    summary.append(node)
+                continue
+            if not isinstance(node, Tag):
+                continue
+            name = node.name
+            if name in _SKIPPED_TAGS:
+                if step is not None and not in_b:
+                    removed.append(node)
+                continue
+            if name == 'div':
+                if 'step' in (node.get('class') or ()):
+                    step = [None, []]
+                    steps.append(step)
+                    in_b = False
+                summary = None
+            elif name == 'b' and step is not None:
+                if step[0] is None:
+                    summary = step[0] = []
+                if not in_b:
+                    removed.append(node)
+                in_b = True
+            elif name == 'ol':
+                in_ol = True
+            elif name == 'li':
+                if in_ol and _STEP_ID.search(node.get('id') or ''):
+                    li_slot = len(pictures)
+                    pictures.append(None)
+            elif name == 'a':
+                if li_slot is not None and pictures[li_slot] is None and 'image' in (node.get('class') or ()):
+                    pictures[li_slot] = ''
+                    img_slot = li_slot
+            elif name == 'img':
+                if img_slot is not None and img_slot not in filled:
+                    filled.add(img_slot)
+                    pictures[img_slot] = node.get('data-src', '')
+            for child in reversed(node.contents):
+                stack.append((child, step, summary, in_b, in_ol, li_slot, img_slot))
+        for node in removed:
+            node.decompose()
+        return [(''.join(summary or ()), ''.join(description).strip()) for summary, description in steps], pictures
+
+    def _parse_votes_n_helpful(self, num_votes_html):
         """Method to extract the number of helpful votes and helpful percentage given to a wikiHow article.
         Args:
-            soup(bs4.BeautifulSoup): An instance of BeautifulSoup class for the entire article.
+            num_votes_html(bs4.element.Tag): The sp_helpful_rating_count div of the article, or None.
 
         Raises:
             ParseError: The given article could not be parsed.
         """
-        num_votes_html = soup.find('div', {'class': 'sp_helpful_rating_count'})
         if num_votes_html:
             if str(num_votes_html) == '<div class="sp_helpful_rating_count"></div>':
                 return
@@ -431,16 +789,15 @@ class Article:
             self._percent_helpful = int(content[content.find(
                 '- ')+2:content.find('%</div>')])
 
-    def _parse_is_expert(self, soup):
+    def _parse_is_expert(self, expert_html):
         """Method to check if a wikiHow article is written by an expert.
 
         Args:
-            soup(bs4.BeautifulSoup): An instance of BeautifulSoup class for the entire article.
+            expert_html(bs4.element.Tag): The byline_info div of the article, or None.
 
         Raises:
             ParseError: The given article could not be parsed.
         """
-        expert_html = soup.find('div', {'id': 'byline_info'})
         if not expert_html:
             raise ParseError
         else:
@@ -450,16 +807,15 @@ class Article:
             else:
                 self._is_expert = False
 
-    def _parse_last_updated(self, soup):
+    def _parse_last_updated(self, update_html):
         """Method to extract the date of last update of a wikiHow article.
 
         Args:
-            soup(bs4.BeautifulSoup): An instance of BeautifulSoup class for the entire article.
+            update_html(bs4.element.Tag): The byline_info div of the article, or None.
 
         Raises:
             ParseError: The given article could not be parsed.
         """
-        update_html = soup.find('div', {'id': 'byline_info'})
         if not update_html:
             raise ParseError
         else:
@@ -470,16 +826,15 @@ class Article:
             except:
                 pass
 
-    def _parse_views(self, soup):
+    def _parse_views(self, views_html):
         """Method to extract the number of views in a wikiHow article.
 
         Args:
-            soup(bs4.BeautifulSoup): An instance of BeautifulSoup class for the entire article.
+            views_html(bs4.element.Tag): The stats box div of the article, or None.
 
         Raises:
             ParseError: The given article could not be parsed.
         """
-        views_html = soup.find('div', {'class': 'sp_box sp_stats_box'})
         if views_html:
             div = views_html.findAll('div', {'class': 'sp_text'})
             span = str(div[2].find('span', {'class': 'sp_text_data'}))
@@ -488,16 +843,15 @@ class Article:
         else:
             pass
 
-    def _parse_co_authors(self, soup):
+    def _parse_co_authors(self, co_authors_html):
         """Method to extract the number of co-authors in a wikiHow article.
 
         Args:
-            soup(bs4.BeautifulSoup): An instance of BeautifulSoup class for the entire article.
+            co_authors_html(bs4.element.Tag): The stats box div of the article, or None.
 
         Returns:
             None: When no co-authors are found.
         """
-        co_authors_html = soup.find('div', {'class': 'sp_box sp_stats_box'})
         if not co_authors_html:
             return None
         else:
@@ -506,34 +860,59 @@ class Article:
             self._co_authors = int(''.join(
                 (span[span.find('>')+1: span.find('</span>')]).split(',')))
 
-    def _parse_references(self, soup):
+    def _parse_references(self, references_html):
         """Method to extract the number of references in a wikiHow article.
 
         Args:
-            soup(bs4.BeautifulSoup): An instance of BeautifulSoup class for the entire article.
+            references_html(list): The external links of the article.
 
         Returns:
             None: When no references are found.
         """
-        references_html = soup.findAll('a', {'class': 'external free'})
         count = 0
         if not references_html:
             return None
         else:
             for reference in references_html:
-                count += 1
+                if not self._removed_by_other_parsers(reference):
+                    count += 1
         self._references = count
 
-    def _parse_summary(self, soup):
+    @ staticmethod
+    def _removed_by_other_parsers(node):
+        """Method to check whether a node lies in a tag that the intro or methods parser removes from the tree.
+
+        Those parsers remove the sup tags of the intro and the b, sup and
+        script tags of every step. Checking the ancestors of the node gives the
+        same answer whether or not they have run, so that a parse of selected
+        fields counts what a full parse counts.
+
+        Args:
+            node(bs4.element.Tag): A node of the article.
+
+        Returns:
+            bool: True if a full parse removes the node, False otherwise.
+        """
+        removed_tags = set()
+        for parent in node.parents:
+            name = parent.name
+            if name == 'b' or name in _SKIPPED_TAGS:
+                removed_tags.add(name)
+            elif name == 'div' and removed_tags:
+                classes = parent.get('class') or ()
+                if 'step' in classes or 'sup' in removed_tags and 'mf-section-0' in classes:
+                    return True
+        return False
+
+    def _parse_summary(self, summary_html_div):
         """Method to extract summary from a wikiHow article.
 
         Args:
-            soup(bs4.BeautifulSoup): An instance of BeautifulSoup class for the entire article.
+            summary_html_div(bs4.element.Tag): The summary_wrapper div of the article, or None.
 
         Returns:
             None: When no summary is found.
         """
-        summary_html_div = soup.find('div', {'id': 'summary_wrapper'})
         if not summary_html_div:
             return None
         else:
@@ -541,16 +920,15 @@ class Article:
             summary = summary_html.text[:-35]
             self._summary = summary
 
-    def _parse_warnings(self, soup):
+    def _parse_warnings(self, warnings_html_div):
         """Method to extract warnings from a wikiHow article.
 
         Args:
-            soup(bs4.BeautifulSoup): An instance of BeautifulSoup class for the entire article.
+            warnings_html_div(bs4.element.Tag): The warnings div of the article, or None.
 
         Returns:
             None: When no warnings are found.
         """
-        warnings_html_div = soup.find('div', {'id': 'warnings'})
         if not warnings_html_div:
             return None
         else:
@@ -567,16 +945,15 @@ class Article:
                 else:
                     return None
 
-    def _parse_tips(self, soup):
+    def _parse_tips(self, tips_html_div):
         """Method to extract tips from a wikiHow article.
 
         Args:
-            soup(bs4.BeautifulSoup): An instance of BeautifulSoup class for the entire article.
+            tips_html_div(bs4.element.Tag): The tips div of the article, or None.
 
         Returns:
             None: When no tips are found.
         """
-        tips_html_div = soup.find('div', {'id': 'tips'})
         if not tips_html_div:
             return None
         else:
@@ -594,32 +971,231 @@ class Article:
                 else:
                     return None
 
-    def _parse(self):
+    def _fetch(self, fields=None):
+        """Method to download the HTML of a wikiHow article.
+
+        In stream mode the download stops, and the connection is closed, as
+        soon as every given field can be extracted from what has arrived.
+        With a deadline, the whole download must finish within it.
+
+        Args:
+            fields(iterable, optional): Fields that will be extracted. Defaults to None, meaning all of them.
+
+        Returns:
+            bytes: The HTML of the article, or the part of it holding the fields.
+        """
+        transport = self._transport or get_transport()
+        listening = instrument._listeners
+        if listening:
+            start = time.perf_counter()
+        with transport.open(self._url, timeout=self._deadline) as content:
+            if listening:
+                opened = time.perf_counter()
+                instrument.emit('fetch', url=self._url, final_url=content.url, status=content.status,
+                                from_cache=content.from_cache, seconds=opened - start)
+            # record where redirects such as Special:Randomizer led
+            self._url = content.url
+            node_fields = None
+            if self._stream and fields is not None:
+                node_fields = {node_field for _, node_field, filled in self._FIELD_PARSERS
+                               if not set(filled).isdisjoint(fields)}
+            if node_fields is None or not node_fields.isdisjoint(self._MULTI_NODE_FIELDS):
+                # every match in the page is needed, so the whole page is
+                read_content = content.read()
+            else:
+                read_content = self._read_streamed(content, node_fields)
+            if listening:
+                instrument.emit('read', url=self._url, bytes=len(read_content),
+                                bytes_received=content.bytes_received, seconds=time.perf_counter() - opened)
+            return read_content
+
+    def _read_streamed(self, content, node_fields):
+        """Method to read a response until the first element of every given node field has closed.
+
+        Args:
+            content(Response): The response to read.
+            node_fields(set): _ArticleNodes fields to wait for.
+
+        Returns:
+            bytes: The HTML read so far.
+        """
+        stream = _PageStream(node_fields)
+        decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        chunks = []
+        while not stream.complete:
+            chunk = content.read(self.STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            stream.feed(decoder.decode(chunk))
+        return b''.join(chunks)
+
+    def _require(self, field=None):
+        """Method to make sure a field has been parsed, fetching the article if needed.
+
+        Threads reading a field that is missing wait for a single fetch.
+
+        Args:
+            field(str, optional): Name of the field. Defaults to None, meaning every field.
+
+        Raises:
+            ParseError: The given article could not be parsed.
+        """
+        if self._parsed or field in self._parsed_fields:
+            return
+        with self._parse_lock():
+            if not self._parsed and field not in self._parsed_fields:
+                self._parse(every_field=field is None)
+
+    def _parse_lock(self):
+        """Method to return the lock held while the article is parsed, creating it on first use.
+
+        Returns:
+            threading.RLock: The lock of this article.
+        """
+        lock = self._lock
+        if lock is None:
+            with _article_lock:
+                lock = self._lock
+                if lock is None:
+                    lock = self._lock = threading.RLock()
+        return lock
+
+    def _flight_key(self, fields):
+        """Method to return the key under which concurrent fetches of this article are merged.
+
+        Args:
+            fields(frozenset): Fields the fetch will extract, or None for every missing one.
+
+        Returns:
+            tuple: The canonical URL, fields and transport, or None for pages such as
+            Special:Randomizer that answer every request differently.
+        """
+        url = canonical_url(self._url)
+        if 'Special:' in url:
+            return None
+        return url, fields, self._transport
+
+    def _share(self, other):
+        """Method to copy the fields another article has parsed.
+
+        Args:
+            other(Article): An article fetched from the same page.
+        """
+        filled = other._parsed_fields
+        for field in filled:
+            value = getattr(other, '_' + field)
+            setattr(self, '_' + field, list(value) if isinstance(value, list) else value)
+        self._url = other._url
+        self._parsed_fields = self._parsed_fields.union(filled)
+        self._parsed = self._parsed_fields.issuperset(self.FIELDS)
+        if self._parsed:
+            self._parsed_fields = self._ALL_FIELDS
+
+    def _parse(self, every_field=False):
         """Method to extract useful information from a given wikiHow article.
 
+        The first call extracts the fields given to the constructor (all of
+        them by default); a later call extracts every field still missing.
+        Articles of the same page parsed at the same time by other threads
+        wait for the first one and copy its fields instead of fetching again.
+
+        Args:
+            every_field(bool, optional): Extract every missing field even on the first call. Defaults to False.
+
         Raises:
+            FetchError: The article could not be downloaded. RateLimited, HTTPError, FetchTimeout
+                and NetworkError tell the causes apart.
             ParseError: The given article could not be parsed.
         """
+        with self._parse_lock():
+            fields = None if every_field or self._parsed_fields else self._fields
+            key = self._flight_key(fields)
+            if key is None:
+                self._fetch_and_parse(fields)
+                return
+            try:
+                leader, shared = self._flights.run(key, functools.partial(self._fetch_and_parse, fields),
+                                                   self._deadline)
+            except TimeoutError as e:
+                raise FetchTimeout('timed out waiting for another fetch of {}'.format(self._url)) from e
+            if shared:
+                self._share(leader)
+
+    def _fetch_and_parse(self, fields):
+        """Method to download the article and extract the given fields.
+
+        Args:
+            fields(frozenset): Fields to extract, or None for every missing one.
+
+        Raises:
+            FetchError: The article could not be downloaded.
+            ParseError: The given article could not be parsed.
+
+        Returns:
+            Article: This article.
+        """
+        listening = instrument._listeners
+        if listening:
+            start = time.perf_counter()
+        try:
+            read_content = self._fetch(fields)
+        except Exception as e:
+            if instrument._listeners:
+                instrument.emit('parse_error', url=self._url, phase='fetch', fields=fields, error=e)
+            error = fetch_error(e, self._url)
+            if error is None:
+                raise ParseError
+            raise error from e
         try:
-            content = urllib.request.urlopen(self._url)
-            read_content = content.read()
-            soup = BeautifulSoup(read_content, 'html.parser')
-            self._parse_title(soup)
-            self._parse_intro(soup)
-            self._parse_methods(soup)
-            self._parse_votes_n_helpful(soup)
-            self._parse_is_expert(soup)
-            self._parse_last_updated(soup)
-            self._parse_views(soup)
-            self._parse_co_authors(soup)
-            self._parse_references(soup)
-            self._parse_summary(soup)
-            self._parse_warnings(soup)
-            self._parse_tips(soup)
-
-            self._parsed = True
+            self._parse_content(read_content, fields)
         except Exception as e:
             raise ParseError
+        if listening:
+            instrument.emit('parse', url=self._url, fields=fields, seconds=time.perf_counter() - start)
+        return self
+
+    def _parse_content(self, read_content, fields=None):
+        """Method to extract useful information from the HTML of a wikiHow article.
+
+        Args:
+            read_content(bytes): The HTML of the article.
+            fields(iterable, optional): Fields to extract. Defaults to None, which extracts every field not parsed yet.
+        """
+        wanted = set(self.FIELDS if fields is None else fields)
+        listening = instrument._listeners
+        phase, filled = 'soup', fields
+        try:
+            if listening:
+                start = time.perf_counter()
+            backend = _resolve_backend(self._backend)
+            soup = BeautifulSoup(read_content, backend)
+            nodes = _ArticleNodes(soup)
+            if listening:
+                instrument.emit('soup', url=self._url, backend=backend, bytes=len(read_content),
+                                seconds=time.perf_counter() - start)
+            for phase, node_field, filled in self._FIELD_PARSERS:
+                if wanted.isdisjoint(filled) or self._parsed_fields.issuperset(filled):
+                    continue
+                if listening:
+                    start = time.perf_counter()
+                if node_field in self._MULTI_NODE_FIELDS:
+                    getattr(self, phase)(nodes.all(node_field))
+                else:
+                    getattr(self, phase)(nodes.first(node_field))
+                self._parsed_fields = self._parsed_fields.union(filled)
+                if listening:
+                    instrument.emit('parse_field', url=self._url, phase=phase, fields=filled,
+                                    seconds=time.perf_counter() - start)
+        except Exception as e:
+            if instrument._listeners:
+                instrument.emit('parse_error', url=self._url, phase=phase, fields=filled, error=e)
+            raise
+
+        self._parsed = self._parsed_fields.issuperset(self.FIELDS)
+        if self._parsed:
+            # share one frozenset between every fully parsed article
+            self._parsed_fields = self._ALL_FIELDS
 
     def get(self):
         """Method to return a dictionary of class members.
@@ -645,6 +1221,294 @@ class Article:
             'tips': self.tips
         }
 
+    def to_dict(self):
+        """Method to return the parsed article as JSON-compatible data.
+
+        Methods are stored as [title, steps] pairs and steps as [title,
+        description, picture] triples; their numbers follow from their position.
+        An article created with fields is parsed in full first, so that the
+        data never passes an unparsed field off as empty.
+
+        Returns:
+            dict: The article data, tagged with PARSER_VERSION.
+        """
+        self._require()
+        return {
+            'version': PARSER_VERSION,
+            'url': self._url,
+            'title': self._title,
+            'intro': self._intro,
+            'methods': [[method.title, [[step.title, step.description, step.picture] for step in method.steps]]
+                        for method in self._methods],
+            'num_votes': self._num_votes,
+            'percent_helpful': self._percent_helpful,
+            'is_expert': self._is_expert,
+            'last_updated': self._last_updated.strftime('%Y-%m-%dT%H:%M:%S') if self._last_updated else None,
+            'views': self._views,
+            'co_authors': self._co_authors,
+            'references': self._references,
+            'summary': self._summary,
+            'warnings': self._warnings,
+            'tips': self._tips
+        }
+
+    @ classmethod
+    def from_dict(cls, data, transport=None):
+        """Method to restore an article from the output of to_dict without fetching it.
+
+        Args:
+            data(dict): Data returned by to_dict.
+            transport(Transport, optional): Transport the restored article would use. Defaults to the shared transport.
+
+        Raises:
+            SerializationError: The data is malformed or was written by another parser version.
+
+        Returns:
+            Article: The parsed article.
+        """
+        if not isinstance(data, dict) or data.get('version') != PARSER_VERSION:
+            raise SerializationError
+        try:
+            article = cls(data['url'], transport=transport)
+            article._title = data['title']
+            article._intro = data['intro']
+            for count, (title, steps) in enumerate(data['methods'], 1):
+                method = Methods(count, title)
+                for count_steps, (step_title, description, picture) in enumerate(steps, 1):
+                    method._steps.append(
+                        Steps(count_steps, step_title, description, picture))
+                article._methods.append(method)
+            article._num_votes = data['num_votes']
+            article._percent_helpful = data['percent_helpful']
+            article._is_expert = data['is_expert']
+            if data['last_updated']:
+                article._last_updated = datetime.strptime(
+                    data['last_updated'], '%Y-%m-%dT%H:%M:%S')
+            article._views = data['views']
+            article._co_authors = data['co_authors']
+            article._references = data['references']
+            article._summary = data['summary']
+            article._warnings = list(data['warnings'])
+            article._tips = list(data['tips'])
+        except (KeyError, TypeError, ValueError):
+            raise SerializationError
+        article._parsed_fields = cls._ALL_FIELDS
+        article._parsed = True
+        return article
+
+    def to_bytes(self):
+        """Method to return the parsed article as compact bytes.
+
+        Returns:
+            bytes: The zlib-compressed output of to_dict, behind a versioned header.
+        """
+        payload = json.dumps(self.to_dict(), ensure_ascii=False, separators=(',', ':'))
+        return _SERIALIZED_MAGIC + bytes([PARSER_VERSION]) + zlib.compress(payload.encode('utf-8'))
+
+    @ classmethod
+    def from_bytes(cls, data, transport=None):
+        """Method to restore an article from the output of to_bytes without fetching it.
+
+        Args:
+            data(bytes): Data returned by to_bytes.
+            transport(Transport, optional): Transport the restored article would use. Defaults to the shared transport.
+
+        Raises:
+            SerializationError: The data is malformed or was written by another parser version.
+
+        Returns:
+            Article: The parsed article.
+        """
+        header = len(_SERIALIZED_MAGIC)
+        if data[:header] != _SERIALIZED_MAGIC or data[header:header + 1] != bytes([PARSER_VERSION]):
+            raise SerializationError
+        try:
+            payload = json.loads(zlib.decompress(data[header + 1:]).decode('utf-8'))
+        except (zlib.error, ValueError):
+            raise SerializationError
+        return cls.from_dict(payload, transport)
+
+    @ classmethod
+    def parse_many(cls, items, processes=None, backend='auto', return_exceptions=False, chunksize=1):
+        """Method to fetch and parse many wikiHow articles on worker processes.
+
+        Each worker fetches and parses its items and sends back only the
+        to_dict data, from which the articles are rebuilt in this process.
+
+        Args:
+            items(iterable): Article URLs, HTML as bytes, or (url, html) pairs.
+            processes(int, optional): Number of worker processes. Defaults to the number of CPUs.
+            backend(str, optional): Tree builder used to parse HTML, 'lxml' or 'html.parser'. Defaults to 'auto', the fastest one installed.
+            return_exceptions(bool, optional): Put a failed item's exception in its place instead of raising it. Defaults to False.
+            chunksize(int, optional): Items handed to a worker at a time. Defaults to 1.
+
+        Raises:
+            ParseError: An item could not be fetched or parsed and return_exceptions is False.
+
+        Returns:
+            list: The parsed articles, in the same order as items.
+        """
+        articles = []
+        with ProcessPoolExecutor(processes) as executor:
+            worker = functools.partial(_parse_many_worker, backend=backend)
+            for data, error in executor.map(worker, items, chunksize=chunksize):
+                if error is not None:
+                    if not return_exceptions:
+                        raise error
+                    articles.append(error)
+                else:
+                    articles.append(cls.from_dict(data))
+        return articles
+
+
+def _parse_many_worker(item, backend):
+    """Method run in an Article.parse_many worker: fetch and parse one item.
+
+    Args:
+        item(str|bytes|tuple): An article URL, HTML as bytes, or a (url, html) pair.
+        backend(str): Tree builder used to parse HTML.
+
+    Returns:
+        tuple: (to_dict data, None) on success, (None, exception) otherwise.
+    """
+    try:
+        if isinstance(item, (bytes, bytearray)):
+            url, read_content = None, item
+        elif isinstance(item, tuple):
+            url, read_content = item
+        else:
+            url, read_content = item, None
+        article = Article(url, backend=backend)
+        if read_content is None:
+            article._parse()
+        else:
+            try:
+                article._parse_content(read_content)
+            except Exception:
+                raise ParseError
+        return article.to_dict(), None
+    except (ParseError, SerializationError) as e:
+        return None, e
+
+
+class SearchResult:
+    def __init__(self, url, title=None, snippet=None, views=None, last_updated=None, transport=None, backend='auto'):
+        self._url = url
+        self._title = title
+        self._snippet = snippet
+        self._views = views
+        self._last_updated = last_updated
+        self._transport = transport
+        self._backend = backend
+        self._article = None
+
+    def __repr__(self):
+        return self.title or self.url
+
+    def __getattr__(self, name):
+        # anything that is not on the results page comes from the full article
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.article, name)
+
+    @ staticmethod
+    def _from_link(link, transport=None, backend='auto'):
+        """Method to build a SearchResult from a result_link anchor.
+
+        Args:
+            link(bs4.element.Tag): The result_link anchor of the search results page.
+            transport(Transport, optional): Transport used to fetch the article later.
+            backend(str, optional): Tree builder used to parse the article later.
+
+        Returns:
+            SearchResult: The search result described by the anchor.
+        """
+        url = link.get('href')
+        if not url.startswith('http'):
+            url = 'http://' + url
+        title_html = link.find('div', {'class': 'result_title'})
+        title = (title_html or link).text.strip() or None
+        snippet_html = link.find('div', {'class': 'result_snippet'})
+        snippet = snippet_html.text.strip() if snippet_html else None
+        views = None
+        views_html = link.find('li', {'class': 'sr_view'})
+        if views_html:
+            digits = ''.join(c for c in views_html.text if c.isdigit())
+            views = int(digits) if digits else None
+        updated_html = link.find('li', {'class': 'sr_updated'})
+        last_updated = updated_html.text.strip() if updated_html else None
+        return SearchResult(url, title, snippet, views, last_updated, transport, backend)
+
+    @property
+    def url(self):
+        """Method to return the URL of the wikiHow article.
+
+        Returns:
+            str: The wikiHow article URL
+        """
+        return self._url
+
+    @property
+    def title(self):
+        """Method to return the title shown on the search results page.
+
+        Returns:
+            str: The wikiHow article title
+        """
+        return self._title
+
+    @property
+    def snippet(self):
+        """Method to return the text snippet shown on the search results page, if any.
+
+        Returns:
+            str: The snippet of the wikiHow article
+        """
+        return self._snippet
+
+    @property
+    def views(self):
+        """Method to return the number of views shown on the search results page, if any.
+
+        Returns:
+            int: Number of times the wikiHow article was viewed
+        """
+        return self._views
+
+    @property
+    def last_updated(self):
+        """Method to return the update date shown on the search results page, if any.
+
+        Returns:
+            str: The update date, as displayed by wikiHow
+        """
+        return self._last_updated
+
+    @property
+    def article(self):
+        """Method to return the full wikiHow article, fetching it on first access.
+
+        Returns:
+            Article: The wikiHow article
+        """
+        if self._article is None:
+            self._article = Article(self._url, transport=self._transport, backend=self._backend)
+        return self._article
+
+    def get(self):
+        """Method to return a dictionary of SearchResult data members.
+
+        Returns:
+            dict: A dictionary of SearchResult data members
+        """
+        return {
+            'url': self.url,
+            'title': self.title,
+            'snippet': self.snippet,
+            'views': self.views,
+            'last_updated': self.last_updated
+        }
+
 
 class WikiHow:
     lang2url = {
@@ -669,13 +1533,201 @@ class WikiHow:
     }
 
     @ staticmethod
-    def search(search_term, max_results=-1, lang='en'):
+    def _search_url(search_term, lang='en', start=0):
+        """Method to return the URL of a search results page.
+
+        Args:
+            search_term(str): Search string
+            lang(str, optional): Language of the wikiHow articles. Defaults to 'en'.
+            start(int, optional): Rank of the first result on the page. Defaults to 0.
+
+        Raises:
+            UnsupportedLanguage: There are no wikiHow articles with this language.
+
+        Returns:
+            str: The URL of the page.
+        """
+        lang = lang.split('-')[0].lower()
+        if lang not in WikiHow.lang2url:
+            raise UnsupportedLanguage
+        search_url = WikiHow.lang2url[lang] + \
+            'wikiHowTo?search='+urllib.parse.quote(search_term)
+        if start:
+            search_url += '&start={}'.format(start)
+        return search_url
+
+    @ staticmethod
+    def _search_page(search_url, transport=None, backend='auto', until=None):
+        """Method to return the results listed on one search results page.
+
+        Args:
+            search_url(str): URL of the page.
+            transport(Transport, optional): Transport used for the request. Defaults to the shared transport.
+            backend(str, optional): Tree builder used to parse HTML, 'lxml' or 'html.parser'. Defaults to 'auto', the fastest one installed.
+            until(float, optional): time.monotonic() value the page must be downloaded by. Defaults to None.
+
+        Raises:
+            FetchError: The search results page could not be downloaded.
+
+        Returns:
+            tuple: The SearchResult objects of the page in rank order, and the URL of the next page or None.
+        """
+        try:
+            with (transport or get_transport()).open(search_url, timeout=time_left(until)) as content:
+                read_content = content.read()
+        except Exception as e:
+            error = fetch_error(e, search_url)
+            if error is None:
+                raise
+            raise error from e
+        soup = BeautifulSoup(read_content, _resolve_backend(backend))
+        results = [SearchResult._from_link(link, transport, backend)
+                   for link in soup.findAll('a', attrs={'class': 'result_link'})]
+        if not results:
+            return results, None
+
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(search_url).query)
+        start = int((query.get('start') or ['0'])[0])
+        has_pager = False
+        for link in soup.findAll('a', href=True):
+            href = urllib.parse.urljoin(search_url, link['href'])
+            parts = urllib.parse.urlsplit(href)
+            page_start = urllib.parse.parse_qs(parts.query).get('start')
+            if 'wikiHowTo' not in parts.path or not page_start or not page_start[0].isdigit():
+                continue
+            has_pager = True
+            if int(page_start[0]) > start:
+                return results, href
+        if has_pager:
+            # the pager links back but not forward: this is the last page
+            return results, None
+        # no pager on the page, so ask for the results that follow these
+        return results, re.sub(r'(&start=\d+)?$', '&start={}'.format(start + len(results)), search_url, count=1)
+
+    @ staticmethod
+    def _search_results(search_term, lang='en', transport=None, backend='auto', max_results=-1, expected=-1,
+                        until=None):
+        """Method to return the results of a search, page after page.
+
+        While the caller goes through one page, the next one is fetched in
+        the background, until expected results have been returned; after that
+        a page is only fetched once the caller asks for more. No page is
+        requested once max_results results have been returned, and the
+        search ends at a page without new results, or with the results
+        returned so far when until passes.
+
+        Args:
+            search_term(str): Search string
+            lang(str, optional): Language of the wikiHow articles. Defaults to 'en'.
+            transport(Transport, optional): Transport used for the requests. Defaults to the shared transport.
+            backend(str, optional): Tree builder used to parse HTML, 'lxml' or 'html.parser'. Defaults to 'auto', the fastest one installed.
+            max_results(int, optional): Number of results, or a value below 1 for all of them. Defaults to -1.
+            expected(int, optional): Number of results the caller expects to use. Defaults to -1, max_results.
+            until(float, optional): time.monotonic() value by which the search must end. Defaults to None.
+
+        Raises:
+            UnsupportedLanguage: There are no wikiHow articles with this language.
+            FetchError: A search results page could not be downloaded.
+
+        Yields:
+            SearchResult: The search results, in rank order.
+        """
+        search_url = WikiHow._search_url(search_term, lang)
+        remaining = max_results if max_results > 0 else float('inf')
+        expected = expected if expected > 0 else remaining
+        returned = 0
+        seen = set()
+        with ThreadPoolExecutor(1) as executor:
+            page = executor.submit(WikiHow._search_page, search_url, transport, backend, until)
+            try:
+                while page is not None:
+                    try:
+                        results, next_url = page.result()
+                    except FetchTimeout:
+                        if until is None:
+                            raise
+                        return
+                    page = None
+                    results = [result for result in results if result.url not in seen]
+                    seen.update(result.url for result in results)
+                    results = results[:remaining] if remaining < len(results) else results
+                    remaining -= len(results)
+                    returned += len(results)
+                    more = results and next_url and remaining > 0
+                    if more and returned < expected:
+                        page = executor.submit(WikiHow._search_page, next_url, transport, backend, until)
+                    yield from results
+                    if more and page is None:
+                        page = executor.submit(WikiHow._search_page, next_url, transport, backend, until)
+            finally:
+                if page is not None:
+                    page.cancel()
+
+    @ staticmethod
+    def _search_links(search_term, lang='en', transport=None, backend='auto', expected=-1, until=None):
+        """Method to return the article URLs of a search, page after page.
+
+        Args:
+            search_term(str): Search string
+            lang(str, optional): Language of the wikiHow articles. Defaults to 'en'.
+            transport(Transport, optional): Transport used for the requests. Defaults to the shared transport.
+            backend(str, optional): Tree builder used to parse HTML, 'lxml' or 'html.parser'. Defaults to 'auto', the fastest one installed.
+            expected(int, optional): Number of URLs the caller expects to use, which bounds prefetching. Defaults to -1, all.
+            until(float, optional): time.monotonic() value by which the search must end. Defaults to None.
+
+        Raises:
+            UnsupportedLanguage: There are no wikiHow articles with this language.
+
+        Yields:
+            str: The URLs of the search results, in rank order.
+        """
+        for result in WikiHow._search_results(search_term, lang, transport, backend, expected=expected, until=until):
+            yield result.url
+
+    @ staticmethod
+    def search_results(search_term, max_results=-1, lang='en', transport=None, backend='auto', deadline=None):
+        """Method to search for wikiHow articles without downloading them.
+
+        Only search results pages are requested, as many as it takes to reach
+        max_results. Each SearchResult fetches its Article the first time an
+        article field is accessed.
+
+        Args:
+            search_term(str): Search string
+            max_results(int, optional): Number of results. Defaults to -1.
+            lang(str, optional): Language of the wikiHow articles. Defaults to 'en'.
+            transport(Transport, optional): Transport used for every request. Defaults to the shared transport.
+            backend(str, optional): Tree builder used to parse HTML, 'lxml' or 'html.parser'. Defaults to 'auto', the fastest one installed.
+            deadline(float, optional): Seconds the search may take, after which it ends with the results found so far.
+                Defaults to None, no limit.
+
+        Raises:
+            UnsupportedLanguage: There are no wikiHow articles with this language.
+
+        Yields:
+            SearchResult: One of the search results.
+        """
+        until = None if deadline is None else time.monotonic() + deadline
+        yield from WikiHow._search_results(search_term, lang, transport, backend, max_results, until=until)
+
+    @ staticmethod
+    def search(search_term, max_results=-1, lang='en', transport=None, workers=1, backend='auto', deadline=None):
         """Method to search for wikiHow articles.
 
+        Results are read from as many search results pages as it takes to
+        reach max_results, the next page being fetched while the current one
+        is parsed. Once the deadline passes the search ends with the articles
+        yielded so far; an article whose download it cuts short is left out.
+
         Args:
             search_term(str): [description]
             max_results(int, optional): Number of results. Defaults to - 1.
             lang(str, optional):  Language of the wikiHow articles. Defaults to 'en'.
+            transport(Transport, optional): Transport used for every request. Defaults to the shared transport.
+            workers(int, optional): Number of result articles fetched and parsed at the same time. Defaults to 1.
+            backend(str, optional): Tree builder used to parse HTML, 'lxml' or 'html.parser'. Defaults to 'auto', the fastest one installed.
+            deadline(float, optional): Seconds the search may take in total, search pages and articles included.
+                Defaults to None, no limit.
 
         Raises:
             UnsupportedLanguage: There are no wikiHow articles with this language.
@@ -683,21 +1735,16 @@ class WikiHow:
         Yields:
             str: One of the search results.
         """
-        lang = lang.split('-')[0].lower()
-        if lang not in WikiHow.lang2url:
-            raise UnsupportedLanguage
-        search_url = WikiHow.lang2url[lang] + \
-            'wikiHowTo?search='+urllib.parse.quote(search_term)
-        content = urllib.request.urlopen(search_url)
-        read_content = content.read()
-        soup = BeautifulSoup(read_content, 'html.parser').findAll('a', attrs={
-            'class': 'result_link'})
+        until = None if deadline is None else time.monotonic() + deadline
+        urls = WikiHow._search_links(search_term, lang, transport, backend, max_results, until)
+        if workers > 1:
+            yield from WikiHow._parse_concurrently(urls, max_results, transport, workers, backend, until)
+            return
         count = 1
-        for link in soup:
-            url = link.get('href')
-            if not url.startswith('http'):
-                url = 'http://' + url
-            how_to = Article(url)
+        for url in urls:
+            if until is not None and time_left(until) <= 0:
+                return
+            how_to = Article(url, transport=transport, backend=backend, deadline=time_left(until))
             try:
                 how_to._parse()
             except ParseError:
@@ -707,32 +1754,89 @@ class WikiHow:
             if 0 < max_results < count:
                 return
 
+    @ staticmethod
+    def _parse_concurrently(urls, max_results, transport, workers, backend='auto', until=None):
+        """Method to fetch and parse search results on a thread pool.
+
+        Articles are yielded in rank order. At most as many articles are in
+        flight as are still needed to reach max_results; a result that fails
+        to parse frees its slot for the next URL.
 
-def random_article(lang='en'):
+        Args:
+            urls(list): The URLs of the search results, in rank order.
+            max_results(int): Number of results, or a value below 1 for all of them.
+            transport(Transport): Transport used for every request.
+            workers(int): Number of threads.
+            backend(str, optional): Tree builder used to parse HTML, 'lxml' or 'html.parser'. Defaults to 'auto', the fastest one installed.
+            until(float, optional): time.monotonic() value after which no more articles are yielded. Defaults to None.
+
+        Yields:
+            Article: One of the search results.
+        """
+        urls = iter(urls)
+        pending = []
+        remaining = max_results if max_results > 0 else float('inf')
+        with ThreadPoolExecutor(workers) as executor:
+            try:
+                while True:
+                    while len(pending) < min(workers, remaining):
+                        url = next(urls, None)
+                        if url is None:
+                            break
+                        how_to = Article(url, transport=transport, backend=backend, deadline=time_left(until))
+                        pending.append(
+                            (how_to, executor.submit(how_to._parse)))
+                    if not pending:
+                        return
+                    how_to, future = pending.pop(0)
+                    try:
+                        future.result(time_left(until))
+                    except FutureTimeoutError:
+                        future.cancel()
+                        return
+                    except ParseError:
+                        continue
+                    remaining -= 1
+                    yield how_to
+                    if remaining <= 0:
+                        return
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+
+def random_article(lang='en', transport=None, backend='auto'):
     """Method to return a random wikiHow article.
 
     Args:
         lang(str, optional): Language of the wikiHow article. Defaults to 'en'.
+        transport(Transport, optional): Transport used to fetch the article. Defaults to the shared transport.
+        backend(str, optional): Tree builder used to parse HTML, 'lxml' or 'html.parser'. Defaults to 'auto', the fastest one installed.
 
     Returns:
-        str: URL of the article.
+        Article: The article, whose url is the one the randomizer redirected to.
     """
     url = WikiHow.lang2url[lang] + 'Special:Randomizer'
-    return Article(url)
+    return Article(url, transport=transport, backend=backend)
 
 
-def search_wikihow(query, max_results=10, lang='en'):
+def search_wikihow(query, max_results=10, lang='en', transport=None, workers=1, backend='auto', deadline=None):
     """Method to search and return a list of wikHow articles.
 
     Args:
         query(str): Search string
         max_results(int, optional): Number of search results. Defaults to 10.
         lang(str, optional): Language of the wikiHow articles. Defaults to 'en'.
+        transport(Transport, optional): Transport used for every request. Defaults to the shared transport.
+        workers(int, optional): Number of result articles fetched and parsed at the same time. Defaults to 1.
+        backend(str, optional): Tree builder used to parse HTML, 'lxml' or 'html.parser'. Defaults to 'auto', the fastest one installed.
+        deadline(float, optional): Seconds the search may take, after which the articles found so far are returned.
+            Defaults to None, no limit.
 
     Returns:
         list: A list containing the names of the Wikhow articles from the search result.
     """
-    return list(WikiHow.search(query, max_results, lang))
+    return list(WikiHow.search(query, max_results, lang, transport, workers, backend, deadline))
 
 
 if __name__ == '__main__':
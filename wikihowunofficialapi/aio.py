@@ -0,0 +1,144 @@
+"""
+asyncio interface to wikiHowUnofficialAPI.
+
+Fetching and parsing run in an executor so that the event loop stays free and
+many articles can be in flight at once; a semaphore bounds how many.
+"""
+
+import asyncio
+
+from wikihowunofficialapi import Article, WikiHow
+from wikihowunofficialapi.exceptions import ParseError
+
+
+class AsyncArticle(Article):
+    """An Article that is fetched and parsed by awaiting it.
+
+    Awaiting an AsyncArticle (or its parse method) downloads and parses it
+    off the event loop and returns the article itself. The properties are the
+    same as Article once it has been awaited.
+    """
+
+    __slots__ = ('_executor',)
+
+    _UNPICKLED = Article._UNPICKLED + ('_executor',)
+
+    def __init__(self, url='https://www.wikihow.com/Special:Randomizer', transport=None, executor=None, backend='auto'):
+        super().__init__(url, lazy=True, transport=transport, backend=backend)
+        self._executor = executor
+
+    def __await__(self):
+        return self.parse().__await__()
+
+    async def parse(self):
+        """Method to fetch and parse the article without blocking the event loop.
+
+        Raises:
+            ParseError: The given article could not be parsed.
+
+        Returns:
+            AsyncArticle: The parsed article.
+        """
+        if not self._parsed:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._executor, self._parse)
+        return self
+
+
+async def gather_articles(urls, concurrency=10, transport=None, executor=None, return_exceptions=False, backend='auto'):
+    """Method to fetch and parse many wikiHow articles concurrently.
+
+    Args:
+        urls(iterable): URLs of the articles.
+        concurrency(int, optional): Maximum number of articles in flight. Defaults to 10.
+        transport(Transport, optional): Transport used for every request. Defaults to the shared transport.
+        executor(concurrent.futures.Executor, optional): Executor running fetch and parse. Defaults to the loop's default executor.
+        return_exceptions(bool, optional): Return a failed article's exception in its place instead of raising it. Defaults to False.
+        backend(str, optional): Tree builder used to parse HTML, 'lxml' or 'html.parser'. Defaults to 'auto', the fastest one installed.
+
+    Raises:
+        ParseError: An article could not be parsed and return_exceptions is False.
+
+    Returns:
+        list: The parsed articles, in the same order as urls.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(url):
+        async with semaphore:
+            return await AsyncArticle(url, transport, executor, backend).parse()
+
+    return await asyncio.gather(*[bounded(url) for url in urls], return_exceptions=return_exceptions)
+
+
+class AsyncWikiHow:
+    @ staticmethod
+    async def search(search_term, max_results=-1, lang='en', concurrency=4, transport=None, executor=None, backend='auto'):
+        """Method to search for wikiHow articles.
+
+        Result articles are fetched up to concurrency at a time but yielded in
+        search-rank order. Articles that fail to parse are skipped, and no more
+        articles are fetched than are needed to fill max_results.
+
+        Args:
+            search_term(str): Search string
+            max_results(int, optional): Number of results. Defaults to -1.
+            lang(str, optional): Language of the wikiHow articles. Defaults to 'en'.
+            concurrency(int, optional): Maximum number of articles in flight. Defaults to 4.
+            transport(Transport, optional): Transport used for every request. Defaults to the shared transport.
+            executor(concurrent.futures.Executor, optional): Executor running fetch and parse. Defaults to the loop's default executor.
+            backend(str, optional): Tree builder used to parse HTML, 'lxml' or 'html.parser'. Defaults to 'auto', the fastest one installed.
+
+        Raises:
+            UnsupportedLanguage: There are no wikiHow articles with this language.
+
+        Yields:
+            AsyncArticle: One of the search results.
+        """
+        loop = asyncio.get_running_loop()
+        # later results pages are only requested once the earlier ones have been used up
+        urls = WikiHow._search_links(search_term, lang, transport, backend, max_results)
+        pending = []
+        remaining = max_results if max_results > 0 else float('inf')
+        try:
+            while True:
+                while len(pending) < min(concurrency, remaining):
+                    url = await loop.run_in_executor(executor, next, urls, None)
+                    if url is None:
+                        break
+                    pending.append(asyncio.ensure_future(
+                        AsyncArticle(url, transport, executor, backend).parse()))
+                if not pending:
+                    return
+                task = pending.pop(0)
+                try:
+                    how_to = await task
+                except ParseError:
+                    continue
+                remaining -= 1
+                yield how_to
+                if remaining <= 0:
+                    return
+        finally:
+            for task in pending:
+                task.cancel()
+            await loop.run_in_executor(executor, urls.close)
+
+
+async def search_wikihow(query, max_results=10, lang='en', concurrency=4, transport=None, executor=None, backend='auto'):
+    """Method to search and return a list of wikiHow articles.
+
+    Args:
+        query(str): Search string
+        max_results(int, optional): Number of search results. Defaults to 10.
+        lang(str, optional): Language of the wikiHow articles. Defaults to 'en'.
+        concurrency(int, optional): Maximum number of articles in flight. Defaults to 4.
+        transport(Transport, optional): Transport used for every request. Defaults to the shared transport.
+        executor(concurrent.futures.Executor, optional): Executor running fetch and parse. Defaults to the loop's default executor.
+        backend(str, optional): Tree builder used to parse HTML, 'lxml' or 'html.parser'. Defaults to 'auto', the fastest one installed.
+
+    Returns:
+        list: A list of the parsed articles from the search result.
+    """
+    return [how_to async for how_to in AsyncWikiHow.search(
+        query, max_results, lang, concurrency, transport, executor, backend)]
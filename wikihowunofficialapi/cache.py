@@ -0,0 +1,232 @@
+"""
+On-disk HTTP response cache used by Transport.
+
+Entries are keyed by canonical URL, evicted least-recently-used once the
+cache grows past its size bound, and revalidated with ETag/Last-Modified once
+their time-to-live has expired.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.parse
+
+_HOST_PREFIXES = ('www.', 'm.')
+_ENTRY_SUFFIX = '.entry'
+
+
+def canonical_url(url):
+    """Method to return the form of a URL used as a cache key.
+
+    http and https, upper and lower case hostnames, default ports, fragments
+    and the www./m. spellings of a wikiHow host all map to the same key.
+
+    Args:
+        url(str): URL to canonicalize.
+
+    Returns:
+        str: The canonical URL
+    """
+    parts = urllib.parse.urlsplit(url.strip())
+    host = (parts.hostname or '').rstrip('.')
+    for prefix in _HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if parts.port and parts.port not in (80, 443):
+        host = '{}:{}'.format(host, parts.port)
+    path = urllib.parse.quote(urllib.parse.unquote(parts.path or '/'), safe="/:@!$&'()*+,;=-._~")
+    return urllib.parse.urlunsplit(('https', host, path, parts.query, ''))
+
+
+def url_lang(url):
+    """Method to return the wikiHow language of a URL.
+
+    Args:
+        url(str): URL of a wikiHow page.
+
+    Returns:
+        str: The key of WikiHow.lang2url the URL belongs to, or None.
+    """
+    from wikihowunofficialapi import WikiHow
+
+    host = urllib.parse.urlsplit(canonical_url(url)).netloc
+    for lang, base in WikiHow.lang2url.items():
+        if urllib.parse.urlsplit(canonical_url(base)).netloc == host:
+            return lang
+    return None
+
+
+class CacheEntry:
+    def __init__(self, url, status, headers, body, stored_at):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.stored_at = stored_at
+
+    @property
+    def etag(self):
+        """Method to return the ETag validator of the entry.
+
+        Returns:
+            str: The ETag header, or None
+        """
+        return self.headers.get('ETag')
+
+    @property
+    def last_modified(self):
+        """Method to return the Last-Modified validator of the entry.
+
+        Returns:
+            str: The Last-Modified header, or None
+        """
+        return self.headers.get('Last-Modified')
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of response bodies stored in a directory.
+
+    Args:
+        directory(str): Directory holding the cache files. Created if missing.
+        max_size(int, optional): Total bytes kept before evicting. Defaults to 256 MiB.
+        ttl(float, optional): Seconds an entry is served without revalidation. Defaults to one day.
+        lang_ttl(dict, optional): Per-language ttl overrides, keyed like WikiHow.lang2url.
+    """
+
+    # headers kept with an entry; everything else is dropped
+    STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+    def __init__(self, directory, max_size=256 * 1024 * 1024, ttl=24 * 60 * 60, lang_ttl=None):
+        self.directory = os.path.expanduser(directory)
+        self.max_size = max_size
+        self.ttl = ttl
+        self.lang_ttl = dict(lang_ttl or {})
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._size = sum(size for _, _, size in self._entries())
+
+    def _path(self, url):
+        key = hashlib.sha1(canonical_url(url).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, key + _ENTRY_SUFFIX)
+
+    def _entries(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(_ENTRY_SUFFIX):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield path, stat.st_mtime, stat.st_size
+
+    def ttl_for(self, url):
+        """Method to return the time-to-live of a URL.
+
+        Args:
+            url(str): URL of a wikiHow page.
+
+        Returns:
+            float: Seconds an entry for the URL stays fresh
+        """
+        if self.lang_ttl:
+            lang = url_lang(url)
+            if lang in self.lang_ttl:
+                return self.lang_ttl[lang]
+        return self.ttl
+
+    def is_fresh(self, entry):
+        """Method to check whether an entry can be served without revalidation.
+
+        Args:
+            entry(CacheEntry): A cache entry.
+
+        Returns:
+            bool: True if the entry is younger than its ttl, False otherwise.
+        """
+        return time.time() - entry.stored_at < self.ttl_for(entry.url)
+
+    def get(self, url):
+        """Method to look up the entry of a URL and mark it as recently used.
+
+        Args:
+            url(str): URL to look up.
+
+        Returns:
+            CacheEntry: The entry, or None when the URL is not cached.
+        """
+        path = self._path(url)
+        try:
+            with open(path, 'rb') as f:
+                meta = json.loads(f.readline().decode('utf-8'))
+                body = f.read()
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return CacheEntry(meta['url'], meta['status'], meta['headers'], body, meta['stored_at'])
+
+    def put(self, url, status, headers, body):
+        """Method to store a response body.
+
+        Args:
+            url(str): URL the body was served for.
+            status(int): HTTP status of the response.
+            headers(mapping): Response headers.
+            body(bytes): Response body.
+        """
+        kept = {name: headers.get(name) for name in self.STORED_HEADERS if headers.get(name)}
+        self._write(CacheEntry(url, status, kept, body, time.time()))
+
+    def refresh(self, entry, headers=None):
+        """Method to restart the ttl of an entry after a successful revalidation.
+
+        Args:
+            entry(CacheEntry): The revalidated entry.
+            headers(mapping, optional): Headers of the 304 response, which may update the validators.
+        """
+        if headers:
+            for name in self.STORED_HEADERS:
+                if headers.get(name):
+                    entry.headers[name] = headers.get(name)
+        entry.stored_at = time.time()
+        self._write(entry)
+
+    def _write(self, entry):
+        path = self._path(entry.url)
+        meta = json.dumps({'url': entry.url, 'status': entry.status,
+                           'headers': entry.headers, 'stored_at': entry.stored_at})
+        tmp = '{}.{}.{}.tmp'.format(path, os.getpid(), threading.get_ident())
+        with open(tmp, 'wb') as f:
+            f.write(meta.encode('utf-8') + b'\n')
+            f.write(entry.body)
+        with self._lock:
+            try:
+                self._size -= os.path.getsize(path)
+            except OSError:
+                pass
+            os.replace(tmp, path)
+            self._size += os.path.getsize(path)
+            if self._size > self.max_size:
+                self._evict()
+
+    def _evict(self):
+        for path, _, size in sorted(self._entries(), key=lambda entry: entry[1]):
+            if self._size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._size -= size
+
+    def clear(self):
+        """Method to remove every entry."""
+        with self._lock:
+            for path, _, _ in list(self._entries()):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._size = 0
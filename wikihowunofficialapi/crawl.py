@@ -0,0 +1,536 @@
+"""
+Bulk crawling of wikiHow articles.
+
+Pages are downloaded on a thread pool and parsed on a process pool, since
+parsing is CPU-bound and holds the GIL. Parsed articles are appended to a JSONL
+file as Article.to_dict() records, and every finished URL is appended to a
+checkpoint file so that an interrupted crawl resumes where it stopped. URLs
+that failed with a 429, a 5xx or a network error are not recorded, so a resumed
+crawl tries them again.
+
+A crawl given a manifest records the validators, last update date and body
+hash of every article in it. A later refresh against the manifest downloads
+each page conditionally and parses only the articles that changed: a 304, an
+identical body or an unchanged last update date, read from the first
+kilobytes of the page, all skip the full parse.
+
+Usage:
+    python -m wikihowunofficialapi.crawl urls.txt -o articles.jsonl --manifest articles.manifest
+    python -m wikihowunofficialapi.crawl --random 1000 --lang en es -o articles.jsonl
+    python -m wikihowunofficialapi.crawl --refresh --manifest articles.manifest -o changes.jsonl
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+import sys
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from wikihowunofficialapi import Article, WikiHow, _PageStream
+from wikihowunofficialapi.cache import canonical_url
+from wikihowunofficialapi.exceptions import FetchError, HTTPError
+from wikihowunofficialapi.scheduler import RETRY_STATUSES
+from wikihowunofficialapi.transport import fetch_error, get_transport
+
+
+_BYLINE_CHUNK_SIZE = 1024
+# bytes read at a time, from the end of the output, while looking for the last complete record
+_TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def content_hash(read_content):
+    """Method to return the hash a manifest keeps of a page body.
+
+    Args:
+        read_content(bytes): HTML of the page.
+
+    Returns:
+        str: Hex digest of the body
+    """
+    return hashlib.blake2b(read_content, digest_size=16).hexdigest()
+
+
+def _byline_prefix(read_content):
+    """Method to return the start of a page, up to the end of its byline.
+
+    Args:
+        read_content(bytes): HTML of the page.
+
+    Returns:
+        bytes: The HTML up to the closing tag of the byline, or the whole page when it has none.
+    """
+    stream = _PageStream({'byline'})
+    end = 0
+    while not stream.complete and end < len(read_content):
+        end += _BYLINE_CHUNK_SIZE
+        stream.feed(read_content[end - _BYLINE_CHUNK_SIZE:end].decode('utf-8', 'ignore'))
+    return read_content[:end]
+
+
+def _trim_partial_line(path):
+    """Method to drop a line cut short by a crash from the end of a file.
+
+    Only the tail of the file is read, a block at a time from the end back to
+    the last newline, so that resuming a large crawl stays cheap.
+
+    Args:
+        path(str): Path of the file.
+    """
+    with open(path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        if not end:
+            return
+        f.seek(end - 1)
+        if f.read(1) == b'\n':
+            return
+        start = end
+        while start > 0:
+            block_start = max(0, start - _TAIL_BLOCK_SIZE)
+            f.seek(block_start)
+            newline = f.read(start - block_start).rfind(b'\n')
+            if newline >= 0:
+                f.truncate(block_start + newline + 1)
+                return
+            start = block_start
+        f.truncate(0)
+
+
+def _is_transient(error):
+    """Method to tell whether a failed download may succeed if it is tried again later.
+
+    Args:
+        error(Exception): The error raised while downloading a page.
+
+    Returns:
+        bool: True for 429 and 5xx answers, timeouts and network errors.
+    """
+    error = fetch_error(error, '') or error
+    if isinstance(error, HTTPError):
+        return error.status in RETRY_STATUSES
+    return isinstance(error, FetchError)
+
+
+def _parse_page(url, read_content, backend, last_updated=None):
+    """Method run in a parse process: parse one page and return its compact fields.
+
+    Args:
+        url(str): Final URL of the page.
+        read_content(bytes): HTML of the page.
+        backend(str): Tree builder used to parse the page.
+        last_updated(str, optional): Last update date the manifest holds for the page, as Article.to_dict
+            writes it. When the byline still shows it, the rest of the page is not parsed. Defaults to None.
+
+    Returns:
+        dict: The output of Article.to_dict, an empty dict when the page was last updated on last_updated,
+        or None when the page could not be parsed.
+    """
+    article = Article(url, backend=backend)
+    if last_updated:
+        try:
+            article._parse_content(_byline_prefix(read_content), ('last_updated',))
+        except Exception:
+            pass
+        if article._last_updated and article._last_updated.strftime('%Y-%m-%dT%H:%M:%S') == last_updated:
+            return {}
+        article = Article(url, backend=backend)
+    try:
+        article._parse_content(read_content)
+    except Exception:
+        return None
+    return article.to_dict()
+
+
+class Checkpoint:
+    """Append-only record of the URLs a crawl has finished, successfully or not.
+
+    Args:
+        path(str): Path of the checkpoint file. Created if missing.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        self.parsed = 0
+        line = '\n'
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    url, _, status = line.rstrip('\n').partition('\t')
+                    if line.endswith('\n') and url and status:
+                        self.done.add(url)
+                        self.parsed += status == 'ok'
+        self._file = open(path, 'a', encoding='utf-8')
+        if not line.endswith('\n'):
+            # end a line cut short by a crash, so the next URL starts on its own
+            self._file.write('\n')
+
+    def __contains__(self, url):
+        return canonical_url(url) in self.done
+
+    def add(self, url, status):
+        """Method to record a finished URL.
+
+        Args:
+            url(str): The URL.
+            status(str): 'ok' when it was parsed, otherwise the reason it failed.
+        """
+        key = canonical_url(url)
+        self.done.add(key)
+        self.parsed += status == 'ok'
+        self._file.write('{}\t{}\n'.format(key, status))
+        self._file.flush()
+
+    def close(self):
+        """Method to close the checkpoint file."""
+        self._file.close()
+
+
+ManifestEntry = namedtuple('ManifestEntry', ('last_updated', 'etag', 'last_modified', 'hash'))
+
+
+class Manifest:
+    """Append-only record of what each crawled article looked like, used to tell which have changed since.
+
+    Every line holds a canonical URL and the fields of a ManifestEntry, separated
+    by tabs; a later line for the same URL replaces the earlier ones.
+
+    Args:
+        path(str): Path of the manifest file. Created if missing.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._entries = {}
+        self._lines = 0
+        line = '\n'
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    fields = line.rstrip('\n').split('\t')
+                    if line.endswith('\n') and len(fields) == len(ManifestEntry._fields) + 1:
+                        self._entries[fields[0]] = ManifestEntry(*(field or None for field in fields[1:]))
+                        self._lines += 1
+        self._file = open(path, 'a', encoding='utf-8')
+        if not line.endswith('\n'):
+            # end a line cut short by a crash, so the next entry starts on its own
+            self._file.write('\n')
+
+    def __contains__(self, url):
+        return canonical_url(url) in self._entries
+
+    def __iter__(self):
+        return iter(list(self._entries))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, url):
+        """Method to look up what an article looked like when it was last crawled.
+
+        Args:
+            url(str): URL of the article.
+
+        Returns:
+            ManifestEntry: The entry, or None when the article is not in the manifest.
+        """
+        return self._entries.get(canonical_url(url))
+
+    def add(self, url, entry):
+        """Method to record what an article looks like now.
+
+        Args:
+            url(str): URL of the article.
+            entry(ManifestEntry): Its last update date, validators and body hash.
+        """
+        key = canonical_url(url)
+        if self._entries.get(key) == entry:
+            return
+        self._entries[key] = entry
+        self._lines += 1
+        self._file.write('\t'.join([key] + [field or '' for field in entry]) + '\n')
+        self._file.flush()
+
+    def compact(self):
+        """Method to rewrite the file with one line per article."""
+        self._file.close()
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for key, entry in self._entries.items():
+                f.write('\t'.join([key] + [field or '' for field in entry]) + '\n')
+        os.replace(tmp, self.path)
+        self._lines = len(self._entries)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def close(self):
+        """Method to close the manifest file, compacting it first if most of its lines are outdated."""
+        if self._lines > 2 * len(self._entries):
+            self.compact()
+        self._file.close()
+
+
+class Crawler:
+    """Fetch-and-parse pipeline writing articles to a JSONL file.
+
+    Args:
+        output(str): Path of the JSONL file articles are appended to.
+        checkpoint(str, optional): Path of the checkpoint file. Defaults to output + '.checkpoint'.
+        fetch_workers(int, optional): Threads downloading pages. Defaults to 16.
+        parse_processes(int, optional): Processes parsing pages. Defaults to the number of CPUs.
+        transport(Transport, optional): Transport used for every request. Defaults to the shared transport.
+        backend(str, optional): Tree builder used to parse HTML. Defaults to 'auto'.
+        manifest(str, optional): Path of the manifest parsed articles are recorded in. Required by refresh.
+            Defaults to None.
+    """
+
+    def __init__(self, output, checkpoint=None, fetch_workers=16, parse_processes=None, transport=None,
+                 backend='auto', manifest=None):
+        self.output = output
+        self.checkpoint_path = checkpoint or output + '.checkpoint'
+        self.fetch_workers = fetch_workers
+        self.parse_processes = parse_processes or os.cpu_count() or 1
+        self.transport = transport
+        self.backend = backend
+        self.manifest_path = manifest
+
+    def _fetch(self, url, known=None):
+        """Method run in a fetch thread: download one page, conditionally when it has a manifest entry.
+
+        Args:
+            url(str): URL of the page.
+            known(ManifestEntry, optional): What the page looked like when it was last crawled. Defaults to None.
+
+        Returns:
+            tuple: The final URL, the HTML of the page or None when the server answered 304 Not Modified,
+            and the ManifestEntry of the page without its last update date.
+        """
+        headers = {}
+        if known is not None:
+            if known.etag:
+                headers['If-None-Match'] = known.etag
+            if known.last_modified:
+                headers['If-Modified-Since'] = known.last_modified
+        with (self.transport or get_transport()).open(url, headers or None) as content:
+            read_content = content.read()
+            etag = content.headers.get('ETag') or (known and known.etag)
+            last_modified = content.headers.get('Last-Modified') or (known and known.last_modified)
+            if content.status == 304:
+                return content.url, None, ManifestEntry(None, etag, last_modified, known.hash)
+            return content.url, read_content, ManifestEntry(None, etag, last_modified, content_hash(read_content))
+
+    def _open_output(self):
+        # drop a record cut short by a previous crash so the file stays valid JSONL
+        if os.path.exists(self.output):
+            _trim_partial_line(self.output)
+        return open(self.output, 'a', encoding='utf-8')
+
+    def run(self, urls, limit=None):
+        """Method to crawl URLs, skipping those the checkpoint already has.
+
+        Args:
+            urls(iterable): URLs to crawl. Read lazily, so it may be a generator or an open file.
+            limit(int, optional): Stop once the checkpoint holds this many parsed articles. Defaults to None.
+
+        Returns:
+            dict: Counts of 'parsed', 'failed', 'duplicate', 'skipped' and 'unchanged' URLs in this run.
+        """
+        return self._crawl(urls, limit, refresh=False)
+
+    def refresh(self, urls=None):
+        """Method to crawl articles again, parsing and writing only those that changed since the manifest.
+
+        Each page is requested with the validators the manifest holds for it. A
+        304 answer, a body with the same hash or a byline with the same last
+        update date counts the article as unchanged; everything else is parsed
+        in full, appended to the output and recorded in the manifest.
+
+        A refresh keeps its own checkpoint, the crawl checkpoint path with
+        '.refresh' appended. An interrupted refresh resumes from it, and it is
+        removed once a refresh finishes, so the next refresh visits every
+        article again.
+
+        Args:
+            urls(iterable, optional): URLs to refresh. Defaults to None, every article of the manifest.
+
+        Raises:
+            ValueError: The crawler has no manifest.
+
+        Returns:
+            dict: Counts of 'parsed', 'failed', 'duplicate', 'skipped' and 'unchanged' URLs in this run.
+        """
+        if self.manifest_path is None:
+            raise ValueError('refresh needs a manifest')
+        return self._crawl(urls, None, refresh=True)
+
+    def _crawl(self, urls, limit, refresh):
+        stats = {'parsed': 0, 'failed': 0, 'duplicate': 0, 'skipped': 0, 'unchanged': 0}
+        checkpoint_path = self.checkpoint_path + '.refresh' if refresh else self.checkpoint_path
+        checkpoint = Checkpoint(checkpoint_path)
+        finished = False
+        manifest = Manifest(self.manifest_path) if self.manifest_path else None
+        if urls is None:
+            urls = manifest
+        output = self._open_output()
+        max_in_flight = self.fetch_workers * 2 + self.parse_processes * 2
+        urls = iter(urls)
+        fetching, parsing = {}, {}
+        try:
+            with ThreadPoolExecutor(self.fetch_workers) as fetch_pool, \
+                    ProcessPoolExecutor(self.parse_processes) as parse_pool:
+                while True:
+                    while len(fetching) + len(parsing) < max_in_flight:
+                        if limit is not None and checkpoint.parsed + len(fetching) + len(parsing) >= limit:
+                            break
+                        url = next(urls, None)
+                        if url is None:
+                            break
+                        url = url.strip()
+                        if not url:
+                            continue
+                        if url in checkpoint:
+                            stats['skipped'] += 1
+                            continue
+                        known = manifest.get(url) if refresh else None
+                        fetching[fetch_pool.submit(self._fetch, url, known)] = url, known
+                    if not fetching and not parsing:
+                        finished = True
+                        break
+
+                    done, _ = wait(list(fetching) + list(parsing), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if future in fetching:
+                            url, known = fetching.pop(future)
+                            try:
+                                final_url, read_content, entry = future.result()
+                            except Exception as e:
+                                # a randomizer URL names no article, so it is never marked done, and
+                                # a URL that failed for now is left for a resumed crawl to try again
+                                if 'Special:Randomizer' not in url and not _is_transient(e):
+                                    checkpoint.add(url, type(e).__name__)
+                                stats['failed'] += 1
+                                continue
+                            if final_url in checkpoint:
+                                stats['duplicate'] += 1
+                                continue
+                            if known is not None and (read_content is None or entry.hash == known.hash):
+                                self._unchanged(final_url, entry._replace(last_updated=known.last_updated),
+                                                checkpoint, manifest, stats)
+                                continue
+                            last_updated = known.last_updated if known is not None else None
+                            parsing[parse_pool.submit(
+                                _parse_page, final_url, read_content, self.backend, last_updated)] = \
+                                final_url, entry, last_updated
+                        else:
+                            url, entry, last_updated = parsing.pop(future)
+                            try:
+                                data = future.result()
+                            except Exception:
+                                data = None
+                            if data == {}:
+                                self._unchanged(url, entry._replace(last_updated=last_updated),
+                                                checkpoint, manifest, stats)
+                                continue
+                            if data is None:
+                                checkpoint.add(url, 'ParseError')
+                                stats['failed'] += 1
+                                continue
+                            if url in checkpoint:
+                                stats['duplicate'] += 1
+                                continue
+                            output.write(json.dumps(data, ensure_ascii=False) + '\n')
+                            output.flush()
+                            if manifest is not None:
+                                manifest.add(url, entry._replace(last_updated=data['last_updated']))
+                            checkpoint.add(url, 'ok')
+                            stats['parsed'] += 1
+        finally:
+            for future in fetching:
+                future.cancel()
+            output.close()
+            checkpoint.close()
+            if manifest is not None:
+                manifest.close()
+        if refresh and finished:
+            os.remove(checkpoint_path)
+        return stats
+
+    @ staticmethod
+    def _unchanged(url, entry, checkpoint, manifest, stats):
+        # the validators may have changed even though the article has not
+        manifest.add(url, entry)
+        checkpoint.add(url, 'unchanged')
+        stats['unchanged'] += 1
+
+    def sample(self, n, langs=None, max_attempts=None):
+        """Method to crawl random articles until the checkpoint holds n parsed articles.
+
+        Args:
+            n(int): Number of parsed articles wanted in total, counting earlier runs.
+            langs(list, optional): Keys of WikiHow.lang2url to draw from. Defaults to all of them.
+            max_attempts(int, optional): Randomizer requests made before giving up. Defaults to 5 * n.
+
+        Returns:
+            dict: Counts of 'parsed', 'failed', 'duplicate', 'skipped' and 'unchanged' URLs in this run.
+        """
+        langs = list(langs or WikiHow.lang2url)
+        randomizer = (WikiHow.lang2url[random.choice(langs)] + 'Special:Randomizer'
+                      for _ in itertools.count())
+        return self.run(itertools.islice(randomizer, max_attempts or 5 * n), limit=n)
+
+
+def read_articles(path):
+    """Method to read the articles written by a crawl.
+
+    Args:
+        path(str): Path of the JSONL file.
+
+    Yields:
+        Article: The parsed articles.
+    """
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield Article.from_dict(json.loads(line))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m wikihowunofficialapi.crawl', description='Crawl wikiHow articles into a JSONL file.')
+    parser.add_argument('urls', nargs='?', help='file with one article URL per line, - for stdin')
+    parser.add_argument('-o', '--output', required=True, help='JSONL file articles are appended to')
+    parser.add_argument('--checkpoint', help='checkpoint file, defaults to OUTPUT.checkpoint')
+    parser.add_argument('--random', type=int, metavar='N', help='crawl N random articles instead of a URL list')
+    parser.add_argument('--lang', nargs='+', choices=sorted(WikiHow.lang2url), help='languages for --random')
+    parser.add_argument('--manifest', help='file recording the validators and hash of every parsed article')
+    parser.add_argument('--refresh', action='store_true',
+                        help='crawl the URLs, or every article of --manifest, again and keep only changed articles')
+    parser.add_argument('--fetch-workers', type=int, default=16)
+    parser.add_argument('--parse-processes', type=int)
+    parser.add_argument('--backend', default='auto')
+    args = parser.parse_args(argv)
+    if args.refresh:
+        if args.manifest is None or args.random is not None:
+            parser.error('--refresh needs --manifest and cannot be combined with --random')
+    elif (args.urls is None) == (args.random is None):
+        parser.error('give either a URL file or --random N')
+
+    crawler = Crawler(args.output, args.checkpoint, args.fetch_workers, args.parse_processes,
+                      backend=args.backend, manifest=args.manifest)
+    run = crawler.refresh if args.refresh else crawler.run
+    if args.random is not None:
+        stats = crawler.sample(args.random, args.lang)
+    elif args.urls is None:
+        stats = crawler.refresh()
+    elif args.urls == '-':
+        stats = run(sys.stdin)
+    else:
+        with open(args.urls, encoding='utf-8') as urls:
+            stats = run(urls)
+    print(' '.join('{}={}'.format(key, value) for key, value in stats.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -4,3 +4,36 @@ class ParseError(RuntimeError):
 
 class UnsupportedLanguage(ValueError):
     """ Unsupported lang, see https://www.wikihow.com/wikiHow:Language-Projects"""
+
+
+class SerializationError(ValueError):
+    """ Serialized article is corrupt or was written by another parser version"""
+
+
+class FetchError(ParseError):
+    """ Error downloading wikiHow page"""
+
+
+class HTTPError(FetchError):
+    """ wikiHow answered with an HTTP error status"""
+
+    def __init__(self, url, status, retry_after=None):
+        super().__init__(url, status, retry_after)
+        self.url = url
+        self.status = status
+        self.retry_after = retry_after
+
+    def __str__(self):
+        return 'HTTP {} for {}'.format(self.status, self.url)
+
+
+class RateLimited(HTTPError):
+    """ wikiHow answered 429 Too Many Requests, see retry_after for how long to wait"""
+
+
+class FetchTimeout(FetchError):
+    """ Timed out downloading wikiHow page"""
+
+
+class NetworkError(FetchError):
+    """ Could not connect to wikiHow"""
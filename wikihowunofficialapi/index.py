@@ -0,0 +1,504 @@
+"""
+Local full-text search over parsed wikiHow articles.
+
+An Index is a directory of immutable segments listed in segments.json. Each
+call to Index.add writes the articles it is given as new segments, so the
+index grows without rewriting what is already on disk; an article added again
+replaces its earlier copy. Index.merge rewrites the live articles into a
+single segment.
+
+A segment holds three files: NAME.meta, the zlib-compressed JSON term
+dictionary and document table; NAME.post, the postings as little-endian
+unsigned 32-bit integers, for each term its document numbers followed by
+their term frequencies; and NAME.docs, the articles as Article.to_bytes
+blobs. Postings and articles are read through mmap, so only the pages a
+query touches are loaded. Queries are ranked with BM25; until the next merge,
+document frequencies still count the copies that re-added articles replaced.
+
+Usage:
+    python -m wikihowunofficialapi.index DIR add articles.jsonl
+    python -m wikihowunofficialapi.index DIR search "train a dog" -n 5
+    python -m wikihowunofficialapi.index DIR merge
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import math
+import mmap
+import os
+import re
+import sys
+import threading
+import zlib
+from array import array
+from collections import Counter
+
+from wikihowunofficialapi import Article, SearchResult
+from wikihowunofficialapi.cache import canonical_url
+from wikihowunofficialapi.exceptions import SerializationError
+
+INDEX_VERSION = 1
+
+# weight of each article field, as the number of times its words are counted
+FIELD_WEIGHTS = (('title', 3), ('intro', 1), ('methods', 2), ('steps', 1), ('tips', 1), ('warnings', 1))
+
+_MANIFEST = 'segments.json'
+# combining marks, which \w leaves out although they belong to the letter before them: generic
+# diacritics, then those of Arabic, Devanagari, Thai and kana
+_MARKS = ('\u0300-\u036f'
+          '\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06dc\u06df-\u06e4\u06e7\u06e8\u06ea-\u06ed'
+          '\u0900-\u0903\u093a-\u094f\u0951-\u0957\u0962\u0963'
+          '\u0e31\u0e34-\u0e3a\u0e47-\u0e4e'
+          '\u3099\u309a')
+_WORD = re.compile('[\\w{}]+'.format(_MARKS))
+# a character with the marks that follow it
+_CLUSTER = re.compile('.[{}]*'.format(_MARKS))
+# scripts written without spaces between words: Thai, kana and CJK ideographs
+_UNSPACED = re.compile('[\u0e00-\u0e7f\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]')
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+def tokenize(text):
+    """Method to split text into the terms the index stores.
+
+    Words are lowercased and keep their combining marks, such as the vowel
+    signs of Hindi and Thai. Runs of Thai, Japanese or Chinese characters,
+    which are written without spaces between words, become overlapping pairs
+    of characters, each with its marks.
+
+    Args:
+        text(str): The text.
+
+    Returns:
+        list: The terms, in order.
+    """
+    terms = []
+    for word in _WORD.findall(text.lower()):
+        clusters = _CLUSTER.findall(word) if _UNSPACED.search(word) else ()
+        if len(clusters) > 1:
+            terms.extend(clusters[i] + clusters[i + 1] for i in range(len(clusters) - 1))
+        else:
+            terms.append(word)
+    return terms
+
+
+def _field_texts(data):
+    # the text of every field of FIELD_WEIGHTS, from Article.to_dict data
+    steps = [text for _, method_steps in data['methods'] for title, description, _ in method_steps
+             for text in (title, description)]
+    return {
+        'title': [data['title']],
+        'intro': [data['intro']],
+        'methods': [title for title, _ in data['methods']],
+        'steps': steps,
+        'tips': data['tips'],
+        'warnings': data['warnings'],
+    }
+
+
+def article_terms(data):
+    """Method to count the weighted terms of an article.
+
+    Args:
+        data(dict): Output of Article.to_dict.
+
+    Returns:
+        Counter: Weighted frequency of every term of the article.
+    """
+    texts = _field_texts(data)
+    counts = Counter()
+    for field, weight in FIELD_WEIGHTS:
+        for text in texts[field]:
+            if text:
+                for term in tokenize(text):
+                    counts[term] += weight
+    return counts
+
+
+def _uint32(values):
+    numbers = array('I', values)
+    if not _LITTLE_ENDIAN:
+        numbers.byteswap()
+    return numbers
+
+
+def _replace(path, data):
+    # write next to the destination, then rename, so that readers never see a partial file
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _map(path):
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class _Segment:
+    """One immutable segment of an Index, with its postings and articles mapped into memory."""
+
+    def __init__(self, directory, name):
+        self.name = name
+        base = os.path.join(directory, name)
+        with open(base + '.meta', 'rb') as f:
+            meta = json.loads(zlib.decompress(f.read()).decode('utf-8'))
+        self.terms = meta['terms']
+        self.urls = meta['urls']
+        self.offsets = meta['offsets']
+        self.lengths = array('I', meta['lengths'])
+        self._postings = _map(base + '.post')
+        self._docs = _map(base + '.docs')
+        # native integers over the mapped file, no copy, on little-endian machines
+        self._numbers = memoryview(self._postings).cast('I') if _LITTLE_ENDIAN and self._postings else None
+
+    def df(self, term):
+        entry = self.terms.get(term)
+        return entry[1] if entry else 0
+
+    def postings(self, term):
+        entry = self.terms.get(term)
+        if entry is None:
+            return None
+        start, df = entry
+        if self._numbers is not None:
+            return self._numbers[start:start + df], self._numbers[start + df:start + 2 * df]
+        numbers = array('I')
+        numbers.frombytes(self._postings[start * 4:(start + 2 * df) * 4])
+        numbers.byteswap()
+        return numbers[:df], numbers[df:]
+
+    def document(self, doc):
+        return bytes(self._docs[self.offsets[doc]:self.offsets[doc + 1]])
+
+    def close(self):
+        try:
+            if self._numbers is not None:
+                self._numbers.release()
+            for mapped in (self._postings, self._docs):
+                if isinstance(mapped, mmap.mmap):
+                    mapped.close()
+        except BufferError:
+            # a search still reads the postings; the mapping goes away with its last reference
+            pass
+
+
+def _write_segment(directory, name, documents):
+    """Method to write articles as a new segment.
+
+    Args:
+        directory(str): Directory of the index.
+        name(str): Name of the segment.
+        documents(list): (url, to_dict data, to_bytes blob) of every article, in document order.
+    """
+    postings = {}
+    lengths = []
+    for doc, (_, data, _) in enumerate(documents):
+        counts = article_terms(data)
+        lengths.append(sum(counts.values()))
+        for term, tf in counts.items():
+            postings.setdefault(term, []).append((doc, tf))
+
+    terms = {}
+    numbers = []
+    for term in sorted(postings):
+        entries = postings[term]
+        terms[term] = [len(numbers), len(entries)]
+        numbers.extend(doc for doc, _ in entries)
+        numbers.extend(tf for _, tf in entries)
+
+    offsets = [0]
+    for _, _, blob in documents:
+        offsets.append(offsets[-1] + len(blob))
+    meta = {'terms': terms, 'urls': [url for url, _, _ in documents], 'offsets': offsets, 'lengths': lengths}
+
+    base = os.path.join(directory, name)
+    _replace(base + '.post', _uint32(numbers).tobytes())
+    _replace(base + '.docs', b''.join(blob for _, _, blob in documents))
+    payload = json.dumps(meta, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    _replace(base + '.meta', zlib.compress(payload))
+
+
+class _Snapshot:
+    """The segments of an Index at one point in time, with the statistics BM25 needs.
+
+    Args:
+        segments(list): The segments, oldest first.
+        next_segment(int): Number of the next segment to write.
+        k1(float): BM25 term frequency saturation.
+        b(float): BM25 document length normalisation.
+    """
+
+    def __init__(self, segments, next_segment, k1, b):
+        self.segments = segments
+        self.next_segment = next_segment
+        # the newest copy of a page hides the older ones
+        self.live = {}
+        for number, segment in enumerate(segments):
+            for doc, url in enumerate(segment.urls):
+                self.live[url] = (number, doc)
+        self.deleted = [{doc for doc, url in enumerate(segment.urls) if self.live[url] != (number, doc)}
+                        for number, segment in enumerate(segments)]
+        self.count = len(self.live)
+        total = sum(segments[number].lengths[doc] for number, doc in self.live.values())
+        avgdl = total / self.count if self.count else 1
+        # the length part of the BM25 denominator of every document
+        self.norms = [array('d', (k1 * (1 - b + b * length / avgdl) for length in segment.lengths))
+                      for segment in segments]
+
+
+class Index:
+    """On-disk inverted index of parsed wikiHow articles, searched with BM25.
+
+    One process may add to an index while others search it; searchers see
+    the new articles after calling refresh.
+
+    Args:
+        directory(str): Directory holding the index. Created if missing.
+        k1(float, optional): BM25 term frequency saturation. Defaults to 1.2.
+        b(float, optional): BM25 document length normalisation. Defaults to 0.75.
+
+    Raises:
+        SerializationError: The directory holds an index written by another version.
+    """
+
+    def __init__(self, directory, k1=1.2, b=0.75):
+        self.directory = directory
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._opened = {}
+        self._snapshot = _Snapshot([], 1, k1, b)
+        os.makedirs(directory, exist_ok=True)
+        self.refresh()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._snapshot.count
+
+    def __contains__(self, url):
+        return canonical_url(url) in self._snapshot.live
+
+    def _read_manifest(self):
+        path = os.path.join(self.directory, _MANIFEST)
+        if not os.path.exists(path):
+            return [], 1
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') != INDEX_VERSION:
+            raise SerializationError
+        return manifest['segments'], manifest['next']
+
+    def _write_manifest(self, names, next_segment):
+        data = {'version': INDEX_VERSION, 'segments': names, 'next': next_segment}
+        _replace(os.path.join(self.directory, _MANIFEST), json.dumps(data).encode('utf-8'))
+
+    def refresh(self):
+        """Method to pick up segments added or merged by another Index on the same directory."""
+        with self._lock:
+            self._load(*self._read_manifest())
+
+    def _load(self, names, next_segment):
+        segments = []
+        for name in names:
+            segment = self._opened.get(name)
+            if segment is None:
+                segment = self._opened[name] = _Segment(self.directory, name)
+            segments.append(segment)
+        self._snapshot = _Snapshot(segments, next_segment, self.k1, self.b)
+
+    def add(self, articles, segment_size=100000):
+        """Method to add articles to the index, replacing earlier copies of the same pages.
+
+        Args:
+            articles(iterable): Parsed Article objects. Read lazily, so it may be a generator.
+            segment_size(int, optional): Articles written per segment. Defaults to 100000.
+
+        Returns:
+            int: Number of articles added.
+        """
+        articles = iter(articles)
+        added = 0
+        with self._lock:
+            names, next_segment = self._read_manifest()
+            while True:
+                batch = list(itertools.islice(articles, segment_size))
+                if not batch:
+                    break
+                documents = []
+                for article in batch:
+                    data = article.to_dict()
+                    documents.append((canonical_url(data['url']), data, article.to_bytes()))
+                name = '{:06d}'.format(next_segment)
+                _write_segment(self.directory, name, documents)
+                names.append(name)
+                next_segment += 1
+                self._write_manifest(names, next_segment)
+                added += len(documents)
+            self._load(names, next_segment)
+        return added
+
+    def merge(self):
+        """Method to rewrite every live article into a single segment, dropping replaced copies.
+
+        The manifest is read again first, so that segments another Index on the
+        same directory added since the last refresh are merged too and the new
+        segment does not reuse their names.
+        """
+        with self._lock:
+            self._load(*self._read_manifest())
+            snapshot = self._snapshot
+            documents = []
+            for url, (number, doc) in snapshot.live.items():
+                blob = snapshot.segments[number].document(doc)
+                documents.append((url, Article.from_bytes(blob).to_dict(), blob))
+            name = '{:06d}'.format(snapshot.next_segment)
+            _write_segment(self.directory, name, documents)
+            self._write_manifest([name], snapshot.next_segment + 1)
+            self._load([name], snapshot.next_segment + 1)
+            for old in snapshot.segments:
+                self._opened.pop(old.name).close()
+                for suffix in ('.meta', '.post', '.docs'):
+                    try:
+                        os.remove(os.path.join(self.directory, old.name + suffix))
+                    except OSError:
+                        # still open elsewhere, on platforms that forbid removing it
+                        pass
+
+    def _rank(self, query, max_results):
+        snapshot = self._snapshot
+        if not snapshot.count:
+            return []
+        weights = {}
+        for term in set(tokenize(query)):
+            df = sum(segment.df(term) for segment in snapshot.segments)
+            if df:
+                weights[term] = math.log(1 + (snapshot.count - df + 0.5) / (df + 0.5)) * (self.k1 + 1)
+        ranked = []
+        for number, segment in enumerate(snapshot.segments):
+            norms = snapshot.norms[number]
+            deleted = snapshot.deleted[number]
+            # scores of one segment, keyed by document number
+            scores = {}
+            get = scores.get
+            for term, weight in weights.items():
+                postings = segment.postings(term)
+                if postings is None:
+                    continue
+                for doc, tf in zip(*postings):
+                    scores[doc] = get(doc, 0.0) + weight * tf / (tf + norms[doc])
+            for doc in deleted.intersection(scores):
+                del scores[doc]
+            docs = heapq.nlargest(max_results, scores, key=get) if max_results > 0 else scores
+            ranked.extend((scores[doc], number, doc) for doc in docs)
+        ranked.sort(key=lambda item: item[0], reverse=True)
+        if max_results > 0:
+            del ranked[max_results:]
+        return [(score, snapshot.segments[number], doc) for score, number, doc in ranked]
+
+    def scores(self, query, max_results=10):
+        """Method to rank the articles matching a query.
+
+        Args:
+            query(str): Search string.
+            max_results(int, optional): Number of results, or a value below 1 for all matches. Defaults to 10.
+
+        Returns:
+            list: (score, url) pairs, best first.
+        """
+        return [(score, segment.urls[doc]) for score, segment, doc in self._rank(query, max_results)]
+
+    def search(self, query, max_results=10):
+        """Method to search the index, like WikiHow.search but without any request.
+
+        Args:
+            query(str): Search string.
+            max_results(int, optional): Number of results, or a value below 1 for all matches. Defaults to 10.
+
+        Yields:
+            Article: The matching articles, best first, already parsed.
+        """
+        for _, segment, doc in self._rank(query, max_results):
+            yield Article.from_bytes(segment.document(doc))
+
+    def search_results(self, query, max_results=10):
+        """Method to search the index, like WikiHow.search_results.
+
+        Args:
+            query(str): Search string.
+            max_results(int, optional): Number of results, or a value below 1 for all matches. Defaults to 10.
+
+        Yields:
+            SearchResult: The matching articles, best first, with the intro as snippet.
+        """
+        for article in self.search(query, max_results):
+            data = article.to_dict()
+            result = SearchResult(data['url'], data['title'], (data['intro'] or '')[:200] or None, data['views'],
+                                  data['last_updated'])
+            result._article = article
+            yield result
+
+    def get(self, url):
+        """Method to return the indexed copy of an article.
+
+        Args:
+            url(str): URL of the article.
+
+        Returns:
+            Article: The article, or None when it is not in the index.
+        """
+        snapshot = self._snapshot
+        location = snapshot.live.get(canonical_url(url))
+        if location is None:
+            return None
+        number, doc = location
+        return Article.from_bytes(snapshot.segments[number].document(doc))
+
+    def close(self):
+        """Method to unmap every segment."""
+        with self._lock:
+            for segment in self._opened.values():
+                segment.close()
+            self._opened = {}
+            self._snapshot = _Snapshot([], self._snapshot.next_segment, self.k1, self.b)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m wikihowunofficialapi.index',
+                                     description='Build and search a local index of crawled wikiHow articles.')
+    parser.add_argument('directory', help='directory of the index')
+    commands = parser.add_subparsers(dest='command', required=True)
+    add = commands.add_parser('add', help='add the articles of JSONL files written by wikihowunofficialapi.crawl')
+    add.add_argument('files', nargs='+')
+    search = commands.add_parser('search', help='print the best matches of a query')
+    search.add_argument('query')
+    search.add_argument('-n', '--max-results', type=int, default=10)
+    commands.add_parser('merge', help='rewrite the index as a single segment')
+    args = parser.parse_args(argv)
+
+    with Index(args.directory) as index:
+        if args.command == 'add':
+            from wikihowunofficialapi.crawl import read_articles
+            for path in args.files:
+                print('{}: {} articles'.format(path, index.add(read_articles(path))))
+        elif args.command == 'search':
+            for score, url in index.scores(args.query, args.max_results):
+                print('{:8.3f}  {}'.format(score, url))
+        else:
+            index.merge()
+        print('{} articles'.format(len(index)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Instrumentation hooks for wikiHowUnofficialAPI.
+
+Listeners registered with add_listener are called with the name of an event
+and a dict describing it. Call sites check whether any listener is registered
+before taking a timestamp, so instrumentation costs one attribute lookup per
+phase when nothing listens.
+
+Events:
+    request      One HTTP exchange: url, method, status, seconds to the response headers.
+    retry        A request will be sent again: url, attempt, error, delay in seconds.
+    cache        A cached lookup by Transport.open: url, result ('hit', 'revalidated' or 'miss').
+    fetch        An article download was answered: url, final_url, status, from_cache, seconds.
+    transfer     A response body from the network was read or closed: url, encoding, bytes_received as sent,
+                 bytes_decoded after decompression, complete.
+    read         The article body was read: url, bytes after decompression, bytes_received, seconds.
+    soup         The HTML was turned into a tree: url, backend, bytes, seconds.
+    parse_field  One Article._parse_* method ran: url, phase, fields, seconds.
+    parse        An article parse finished: url, fields, seconds, counting fetch and read.
+    parse_error  An article could not be parsed: url, phase ('fetch', 'soup' or the _parse_* method),
+                 fields it was extracting, error.
+"""
+
+import threading
+
+# copied on write, so that emit can iterate it without a lock
+_listeners = ()
+_lock = threading.Lock()
+
+
+def add_listener(listener):
+    """Method to register a listener for every instrumentation event.
+
+    Args:
+        listener(callable): Called as listener(event, data) with the event name and a dict of its values.
+            Exceptions it raises propagate to the code that emitted the event.
+    """
+    global _listeners
+    with _lock:
+        _listeners = _listeners + (listener,)
+
+
+def remove_listener(listener):
+    """Method to unregister a listener.
+
+    Args:
+        listener(callable): A listener given to add_listener.
+
+    Raises:
+        ValueError: The listener is not registered.
+    """
+    global _listeners
+    with _lock:
+        listeners = list(_listeners)
+        listeners.remove(listener)
+        _listeners = tuple(listeners)
+
+
+def emit(event, **data):
+    """Method to send an event to every listener.
+
+    Args:
+        event(str): Name of the event.
+        **data: Values describing the event.
+    """
+    for listener in _listeners:
+        listener(event, data)
+
+
+class Recorder:
+    """Listener keeping every event it receives, registered while used as a context manager.
+
+    Example:
+        with Recorder() as recorder:
+            wha.Article(url).title
+        print(recorder.totals())
+    """
+
+    def __init__(self):
+        self.events = []
+        self._lock = threading.Lock()
+
+    def __call__(self, event, data):
+        with self._lock:
+            self.events.append((event, data))
+
+    def __enter__(self):
+        add_listener(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        remove_listener(self)
+
+    def totals(self):
+        """Method to add up the seconds recorded per phase.
+
+        Returns:
+            dict: Total seconds per event name, with parse_field events keyed by their _parse_* method.
+        """
+        totals = {}
+        with self._lock:
+            for event, data in self.events:
+                if 'seconds' in data:
+                    key = data['phase'] if event == 'parse_field' else event
+                    totals[key] = totals.get(key, 0) + data['seconds']
+        return totals
@@ -0,0 +1,380 @@
+"""
+Local stand-in for the wikiHow sites, for load and concurrency testing.
+
+Serves the recorded article and search pages bundled in the package for every host
+in WikiHow.lang2url, answers Special:Randomizer with a redirect to one of them,
+and can add latency, cap bandwidth and inject errors and 429 responses. A
+Transport built with host_overrides sends its requests to the server instead
+of the real sites.
+
+Usage:
+    python -m wikihowunofficialapi.mockserver --port 8080 --latency 0.2 --throttle-rate 0.05
+
+    transport = wha.Transport(host_overrides=mockserver.host_overrides('127.0.0.1:8080'))
+"""
+
+import argparse
+import collections
+import glob
+import hashlib
+import http.server
+import os
+import random
+import re
+import threading
+import time
+import gzip
+import urllib.parse
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from wikihowunofficialapi import WikiHow
+from wikihowunofficialapi.cache import url_lang
+from wikihowunofficialapi.transport import Transport
+
+# installed with the package, so that the server works outside a checkout too
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+_RESULT_LINK = re.compile(rb'<a class="result_link".*?</a>\n?', re.S)
+_RESULT_HREF = re.compile(rb'(class="result_link" href="[^"]*)"')
+
+
+def host_overrides(address):
+    """Method to return the Transport host_overrides sending every wikiHow host to one address.
+
+    Args:
+        address(str): 'host:port' the mock server listens on.
+
+    Returns:
+        dict: Mapping of every wikiHow hostname, with and without 'www.', to address.
+    """
+    overrides = {}
+    for base in WikiHow.lang2url.values():
+        host = urllib.parse.urlsplit(base).hostname
+        overrides[host] = address
+        if host.startswith('www.'):
+            overrides[host[len('www.'):]] = address
+    return overrides
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        if self.server.mock.verbose:
+            super().log_message(format, *args)
+
+    def handle(self):
+        # a client closing its connection is routine under load, not an error worth a traceback
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def do_HEAD(self):
+        self.do_GET(send_body=False)
+
+    def do_GET(self, send_body=True):
+        mock = self.server.mock
+        mock._begin()
+        try:
+            status, headers, body = mock._respond(self.headers.get('Host', ''), self.path, self.headers)
+            # counted before answering, so that a client never sees a response the counters miss
+            mock._count(status)
+            if mock.latency:
+                time.sleep(mock.latency)
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if send_body:
+                self._write(body, mock.bandwidth)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        finally:
+            mock._end()
+
+    def _write(self, body, bandwidth):
+        if not bandwidth:
+            self.wfile.write(body)
+            return
+        # send in slices ten times a second so that the rate holds for small pages too
+        chunk = max(1, int(bandwidth / 10))
+        for start in range(0, len(body), chunk):
+            self.wfile.write(body[start:start + chunk])
+            self.wfile.flush()
+            time.sleep(len(body[start:start + chunk]) / bandwidth)
+
+
+class MockWikiHow:
+    """Local HTTP server imitating the wikiHow sites.
+
+    The fault settings are plain attributes and may be changed while the
+    server runs.
+
+    Args:
+        fixtures(str, optional): Directory with articles/<name>.html and search/<lang>.html pages.
+            Defaults to the pages bundled in wikihowunofficialapi/fixtures.
+        host(str, optional): Address to listen on. Defaults to '127.0.0.1'.
+        port(int, optional): Port to listen on. Defaults to 0, a free port.
+        latency(float, optional): Seconds added before every response. Defaults to 0.
+        bandwidth(int, optional): Bytes per second each response is sent at. Defaults to None, unlimited.
+        error_rate(float, optional): Fraction of requests answered with 500. Defaults to 0.
+        throttle_rate(float, optional): Fraction of requests answered with 429. Defaults to 0.
+        rate_limit(float, optional): Requests per second allowed per host before answering 429. Defaults to None, unlimited.
+        retry_after(int, optional): Retry-After seconds sent with every 429. Defaults to 1.
+        random_articles(int, optional): Distinct articles Special:Randomizer redirects to. Defaults to 2 ** 30.
+        compress(bool, optional): Send pages gzip, deflate or brotli encoded to clients accepting it. Defaults to True.
+        search_pages(int, optional): Results pages every search has, each linking to the next. Defaults to 3.
+        https_only(bool, optional): Redirect every http:// request to its https:// URL, as wikiHow does. The
+            scheme is read from X-Forwarded-Proto, which Transport sends to overridden hosts. Defaults to False.
+        seed(int, optional): Seed of the fault and randomizer draws. Defaults to None.
+        verbose(bool, optional): Log every request to stderr. Defaults to False.
+    """
+
+    def __init__(self, fixtures=None, host='127.0.0.1', port=0, latency=0, bandwidth=None, error_rate=0,
+                 throttle_rate=0, rate_limit=None, retry_after=1, random_articles=1 << 30, compress=True,
+                 search_pages=3, https_only=False, seed=None, verbose=False):
+        fixtures = fixtures or DEFAULT_FIXTURES
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.random_articles = random_articles
+        self.compress = compress
+        self.search_pages = search_pages
+        self.https_only = https_only
+        self.verbose = verbose
+        self.stats = collections.Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        self._articles = collections.defaultdict(dict)
+        for path in sorted(glob.glob(os.path.join(fixtures, 'articles', '*.html'))):
+            name = os.path.splitext(os.path.basename(path))[0]
+            with open(path, 'rb') as f:
+                self._articles[name.partition('_')[0]][name] = f.read()
+        self._searches = {}
+        for path in glob.glob(os.path.join(fixtures, 'search', '*.html')):
+            with open(path, 'rb') as f:
+                self._searches[os.path.splitext(os.path.basename(path))[0]] = f.read()
+        if not self._articles:
+            raise FileNotFoundError('no fixture articles in {}'.format(fixtures))
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._encoded = {}
+        self._server = http.server.ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        self._thread = None
+
+    @property
+    def address(self):
+        """str: The 'host:port' the server listens on."""
+        host, port = self._server.server_address[:2]
+        return '{}:{}'.format(host, port)
+
+    @property
+    def host_overrides(self):
+        """dict: Transport host_overrides sending every wikiHow host to this server."""
+        return host_overrides(self.address)
+
+    def transport(self, **kwargs):
+        """Method to build a Transport whose requests go to this server.
+
+        Args:
+            **kwargs: Other Transport arguments.
+
+        Returns:
+            Transport: The transport.
+        """
+        kwargs.setdefault('proxies', {})
+        return Transport(host_overrides=self.host_overrides, **kwargs)
+
+    def start(self):
+        """Method to serve requests on a background thread.
+
+        Returns:
+            MockWikiHow: The server itself.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+            self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Method to serve requests on the calling thread until interrupted."""
+        self._server.serve_forever()
+
+    def stop(self):
+        """Method to stop serving and close the listening socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def reset_stats(self):
+        """Method to clear the request counters."""
+        with self._lock:
+            self.stats.clear()
+            self.max_in_flight = self.in_flight
+
+    def _begin(self):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _count(self, status):
+        with self._lock:
+            self.stats[status] += 1
+
+    def _end(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def _allow(self, host):
+        # token bucket per host holding up to one second of requests
+        now = time.monotonic()
+        tokens, last = self._buckets.get(host, (self.rate_limit, now))
+        tokens = min(self.rate_limit, tokens + (now - last) * self.rate_limit)
+        allowed = tokens >= 1
+        self._buckets[host] = (tokens - allowed, now)
+        return allowed
+
+    def _respond(self, host, target, request_headers):
+        lang = url_lang('http://' + host)
+        if lang is None:
+            return 404, {'Content-Type': 'text/plain'}, b'unknown host'
+        if self.https_only and request_headers.get('X-Forwarded-Proto', 'http') != 'https':
+            return 301, {'Location': 'https://{}{}'.format(host, target)}, b''
+
+        with self._lock:
+            draw = self._random.random()
+            throttled = self.rate_limit is not None and not self._allow(host)
+        if draw < self.error_rate:
+            return 500, {'Content-Type': 'text/plain'}, b'injected error'
+        if throttled or draw < self.error_rate + self.throttle_rate:
+            return 429, {'Content-Type': 'text/plain', 'Retry-After': str(self.retry_after)}, b'slow down'
+
+        parts = urllib.parse.urlsplit(target)
+        path = urllib.parse.unquote(parts.path).lstrip('/')
+        articles = self._articles.get(lang) or self._articles['en']
+        if path == 'Special:Randomizer':
+            with self._lock:
+                slug = 'Random-Article-{}'.format(self._random.randrange(self.random_articles))
+            return 302, {'Location': '/' + slug, 'Cache-Control': 'no-store'}, b''
+        if path == 'wikiHowTo':
+            body = self._search_page(lang, urllib.parse.parse_qs(parts.query))
+        elif path in articles:
+            body = articles[path]
+        else:
+            # any other article path maps to a fixture of its language, the same one every time
+            names = sorted(articles)
+            body = articles[names[zlib.crc32(path.encode('utf-8')) % len(names)]]
+
+        etag = '"{}"'.format(hashlib.sha1(body).hexdigest()[:16])
+        headers = {'Content-Type': 'text/html; charset=utf-8', 'ETag': etag}
+        if request_headers.get('If-None-Match') == etag:
+            return 304, headers, b''
+        encoding = self._encoding(request_headers.get('Accept-Encoding', ''))
+        if encoding is not None:
+            headers['Content-Encoding'] = encoding
+            body = self._encode(body, etag, encoding)
+        return 200, headers, body
+
+    def _search_page(self, lang, query):
+        body = self._searches.get(lang) or self._searches['en']
+        per_page = max(1, body.count(b'class="result_link"'))
+        start = query.get('start', ['0'])[0]
+        page = int(start) // per_page if start.isdigit() else 0
+        if page >= self.search_pages:
+            return _RESULT_LINK.sub(b'', body)
+        if page:
+            # later pages list other articles: the fixture's with a page suffix
+            body = _RESULT_HREF.sub(lambda match: match.group(1) + b'-page-%d"' % page, body)
+        link = '<a class="button" href="/wikiHowTo?search={}&amp;start={{}}">{{}}</a>'.format(
+            urllib.parse.quote(query.get('search', [''])[0]))
+        pager = ''
+        if page:
+            pager += link.format((page - 1) * per_page, 'Prev')
+        if page + 1 < self.search_pages:
+            pager += link.format((page + 1) * per_page, 'Next')
+        if pager:
+            body = body.replace(b'</body>', '<div id="searchresults_footer">{}</div></body>'.format(pager).encode('utf-8'), 1)
+        return body
+
+    def _encoding(self, accept_encoding):
+        if not self.compress:
+            return None
+        accepted = {part.split(';')[0].strip().lower() for part in accept_encoding.split(',')}
+        for encoding in ('br', 'gzip', 'deflate'):
+            if encoding in accepted and (encoding != 'br' or brotli is not None):
+                return encoding
+        return None
+
+    def _encode(self, body, etag, encoding):
+        key = (etag, encoding)
+        encoded = self._encoded.get(key)
+        if encoded is None:
+            if encoding == 'br':
+                encoded = brotli.compress(body)
+            elif encoding == 'gzip':
+                encoded = gzip.compress(body)
+            else:
+                encoded = zlib.compress(body)
+            self._encoded[key] = encoded
+        return encoded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m wikihowunofficialapi.mockserver', description='Serve fixture wikiHow pages locally.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--fixtures', help='fixture directory, defaults to the bundled pages')
+    parser.add_argument('--latency', type=float, default=0, help='seconds added to every response')
+    parser.add_argument('--bandwidth', type=int, help='bytes per second per response')
+    parser.add_argument('--error-rate', type=float, default=0, help='fraction of requests answered with 500')
+    parser.add_argument('--throttle-rate', type=float, default=0, help='fraction of requests answered with 429')
+    parser.add_argument('--rate-limit', type=float, help='requests per second per host before answering 429')
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--random-articles', type=int, default=1 << 30,
+                        help='distinct articles Special:Randomizer redirects to')
+    parser.add_argument('--no-compress', dest='compress', action='store_false', help='always send pages uncompressed')
+    parser.add_argument('--search-pages', type=int, default=3, help='results pages every search has')
+    parser.add_argument('--https-only', action='store_true', help='redirect http:// requests to https://')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('-v', '--verbose', action='store_true')
+    args = parser.parse_args(argv)
+
+    mock = MockWikiHow(args.fixtures, args.host, args.port, args.latency, args.bandwidth, args.error_rate,
+                       args.throttle_rate, args.rate_limit, args.retry_after, args.random_articles,
+                       args.compress, args.search_pages, args.https_only, args.seed, args.verbose)
+    print('serving wikiHow fixtures on {}'.format(mock.address))
+    try:
+        mock.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        mock.stop()
+        print(' '.join('{}={}'.format(status, count) for status, count in sorted(mock.stats.items())))
+
+
+if __name__ == '__main__':
+    main()
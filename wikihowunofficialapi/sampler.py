@@ -0,0 +1,174 @@
+"""
+Random sampling of unique wikiHow articles.
+
+Every draw first resolves Special:Randomizer with HEAD requests, which cost
+only headers, following its redirects until they leave Special:Randomizer, and
+looks the article it points to up in a Bloom filter of the articles already
+drawn. Only articles not seen before are downloaded and
+parsed, on a thread pool.
+"""
+
+import hashlib
+import math
+import threading
+import urllib.parse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from wikihowunofficialapi import Article, WikiHow
+from wikihowunofficialapi.cache import canonical_url
+from wikihowunofficialapi.exceptions import FetchError, ParseError, UnsupportedLanguage
+from wikihowunofficialapi.transport import fetch_error, get_transport
+
+# redirects followed while Special:Randomizer points at itself, as from http:// to https://
+_RANDOMIZER_HOPS = 3
+
+
+def _is_randomizer(url):
+    return urllib.parse.unquote(urllib.parse.urlsplit(url).path).endswith('Special:Randomizer')
+
+
+class BloomFilter:
+    """Set of strings with a fixed memory size that may report false positives but never false negatives.
+
+    Args:
+        capacity(int, optional): Number of items it is sized for. Defaults to 1000000.
+        error_rate(float, optional): False positive rate once capacity items have been added. Defaults to 0.001.
+    """
+
+    def __init__(self, capacity=1000000, error_rate=0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.n_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.n_hashes = max(1, int(round(self.n_bits / capacity * math.log(2))))
+        self._bits = bytearray((self.n_bits + 7) // 8)
+        self._count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        # double hashing: k positions from two independent 64-bit hashes
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.n_bits for i in range(self.n_hashes)]
+
+    def __contains__(self, item):
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def __len__(self):
+        return self._count
+
+    def add(self, item):
+        """Method to add an item.
+
+        Args:
+            item(str): The item.
+
+        Returns:
+            bool: False when the item was, probably, already present.
+        """
+        new = False
+        for pos in self._positions(item):
+            mask = 1 << (pos & 7)
+            if not self._bits[pos >> 3] & mask:
+                self._bits[pos >> 3] |= mask
+                new = True
+        self._count += new
+        return new
+
+
+class RandomSampler:
+    """Draws random wikiHow articles, never the same article twice.
+
+    Args:
+        workers(int, optional): Draws in flight at once. Defaults to 8.
+        transport(Transport, optional): Transport used for every request. Defaults to the shared transport.
+        backend(str, optional): Tree builder used to parse HTML, 'lxml' or 'html.parser'. Defaults to 'auto', the fastest one installed.
+        seen(BloomFilter, optional): Articles to skip, shared with earlier samplers. Defaults to an empty filter.
+    """
+
+    def __init__(self, workers=8, transport=None, backend='auto', seen=None):
+        self.workers = workers
+        self.transport = transport
+        self.backend = backend
+        self.seen = BloomFilter() if seen is None else seen
+        self.stats = {'drawn': 0, 'duplicate': 0, 'failed': 0}
+        self._lock = threading.Lock()
+
+    def _draw(self, lang):
+        randomizer = WikiHow.lang2url[lang] + 'Special:Randomizer'
+        transport = self.transport or get_transport()
+        url = randomizer
+        try:
+            for _ in range(_RANDOMIZER_HOPS):
+                url = transport.resolve(url, max_hops=1)
+                if not _is_randomizer(url):
+                    break
+            else:
+                raise FetchError('{} keeps redirecting to itself'.format(randomizer))
+        except Exception as e:
+            error = fetch_error(e, randomizer)
+            if error is None:
+                raise
+            raise error from e
+        with self._lock:
+            if not self.seen.add(canonical_url(url)):
+                self.stats['duplicate'] += 1
+                return None
+        article = Article(url, transport=self.transport, backend=self.backend)
+        article._parse()
+        return article
+
+    def draw(self, n, lang='en', max_attempts=None):
+        """Method to draw unique random articles of one language.
+
+        Args:
+            n(int): Number of articles wanted.
+            lang(str, optional): Language of the wikiHow articles. Defaults to 'en'.
+            max_attempts(int, optional): Randomizer requests made before giving up. Defaults to 5 * n.
+
+        Raises:
+            UnsupportedLanguage: There are no wikiHow articles with this language.
+
+        Yields:
+            Article: The parsed articles, in the order they finished.
+        """
+        if lang not in WikiHow.lang2url:
+            raise UnsupportedLanguage
+        attempts = max_attempts or 5 * n
+        remaining = n
+        pending = set()
+        with ThreadPoolExecutor(self.workers) as executor:
+            try:
+                while remaining > 0:
+                    while attempts > 0 and len(pending) < min(self.workers, remaining):
+                        pending.add(executor.submit(self._draw, lang))
+                        attempts -= 1
+                    if not pending:
+                        return
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        try:
+                            article = future.result()
+                        except ParseError:
+                            self.stats['failed'] += 1
+                            continue
+                        if article is None or remaining <= 0:
+                            continue
+                        self.stats['drawn'] += 1
+                        remaining -= 1
+                        yield article
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def sample(self, n, langs=None, max_attempts=None):
+        """Method to draw n unique random articles for each of several languages.
+
+        Args:
+            n(int): Number of articles wanted per language.
+            langs(list, optional): Keys of WikiHow.lang2url to draw from. Defaults to all of them.
+            max_attempts(int, optional): Randomizer requests made per language before giving up. Defaults to 5 * n.
+
+        Returns:
+            dict: Language to the list of its articles, which may be shorter than n if attempts ran out.
+        """
+        return {lang: list(self.draw(n, lang, max_attempts)) for lang in (langs or WikiHow.lang2url)}
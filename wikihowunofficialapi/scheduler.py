@@ -0,0 +1,203 @@
+"""
+Per-host request scheduling for Transport.
+
+Each wikiHow host gets a token bucket bounding its request rate and a
+concurrency limit adjusted by AIMD: it grows by one for every window of
+successful requests and halves when the host answers 429 or 5xx or the
+connection fails. Failed requests are retried after a jittered exponential
+backoff, and a Retry-After header pauses every request to that host.
+"""
+
+import email.utils
+import http.client
+import random
+import socket
+import threading
+import time
+import urllib.parse
+
+from wikihowunofficialapi.cache import canonical_url
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# errors after which a request may succeed if sent again; socket.timeout is
+# only an alias of TimeoutError from Python 3.10
+RETRY_ERRORS = (ConnectionError, TimeoutError, socket.timeout, http.client.HTTPException)
+
+
+def parse_retry_after(value):
+    """Method to read a Retry-After header.
+
+    Args:
+        value(str): Header value, either seconds or an HTTP date.
+
+    Returns:
+        float: Seconds to wait, or None when the header is missing or malformed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date is None:
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+class _HostState:
+    __slots__ = ('limit', 'in_flight', 'tokens', 'refilled', 'blocked_until', 'last_decrease')
+
+    def __init__(self, limit, tokens, now):
+        self.limit = limit
+        self.in_flight = 0
+        self.tokens = tokens
+        self.refilled = now
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+
+
+class HostScheduler:
+    """Rate limit, adaptive concurrency and retry policy shared by every request to a host.
+
+    Hosts are keyed by canonical URL, so www., m., http and https share one state.
+
+    Args:
+        rate(float, optional): Requests per second allowed per host. Defaults to 5. None disables the rate limit.
+        burst(float, optional): Requests a host may receive at once after being idle. Defaults to rate.
+        concurrency(int, optional): Requests in flight per host to start with. Defaults to 4.
+        min_concurrency(int, optional): Lowest concurrency limit. Defaults to 1.
+        max_concurrency(int, optional): Highest concurrency limit. Defaults to 32.
+        retries(int, optional): Retries of a request that failed with 429, 5xx or a network error. Defaults to 3.
+        backoff(float, optional): Seconds of the first retry delay, doubled for each further retry. Defaults to 0.5.
+        max_backoff(float, optional): Longest retry delay in seconds, not counting Retry-After. Defaults to 30.
+    """
+
+    def __init__(self, rate=5, burst=None, concurrency=4, min_concurrency=1, max_concurrency=32, retries=3,
+                 backoff=0.5, max_backoff=30):
+        self.rate = rate
+        self.burst = burst or rate
+        self.concurrency = concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._hosts = {}
+        self._cond = threading.Condition()
+
+    @staticmethod
+    def host_key(url):
+        """Method to return the key a URL's host is scheduled under.
+
+        Args:
+            url(str): URL of a request.
+
+        Returns:
+            str: The canonical host of the URL.
+        """
+        return urllib.parse.urlsplit(canonical_url(url)).netloc
+
+    def _state(self, key, now):
+        state = self._hosts.get(key)
+        if state is None:
+            state = self._hosts[key] = _HostState(float(self.concurrency), self.burst or 0, now)
+        return state
+
+    def acquire(self, url, timeout=None):
+        """Method to wait until a request to the URL's host may be sent, and count it as in flight.
+
+        Args:
+            url(str): URL of the request.
+            timeout(float, optional): Seconds to wait at most. Defaults to None, which waits as long as it takes.
+
+        Raises:
+            TimeoutError: The request could not be sent within timeout seconds.
+        """
+        key = self.host_key(url)
+        until = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                state = self._state(key, now)
+                if self.rate:
+                    state.tokens = min(self.burst, state.tokens + (now - state.refilled) * self.rate)
+                    state.refilled = now
+                if state.blocked_until > now:
+                    wait = state.blocked_until - now
+                elif state.in_flight >= int(state.limit):
+                    wait = None
+                elif self.rate and state.tokens < 1:
+                    wait = (1 - state.tokens) / self.rate
+                else:
+                    break
+                if until is not None:
+                    if now >= until:
+                        raise TimeoutError('timed out waiting to send a request to {}'.format(key))
+                    wait = until - now if wait is None else min(wait, until - now)
+                self._cond.wait(wait)
+            state.in_flight += 1
+            if self.rate:
+                state.tokens -= 1
+
+    def release(self, url):
+        """Method to mark a request to the URL's host as no longer in flight.
+
+        Args:
+            url(str): URL of the request.
+        """
+        with self._cond:
+            state = self._state(self.host_key(url), time.monotonic())
+            state.in_flight -= 1
+            self._cond.notify_all()
+
+    def record(self, url, ok, retry_after=None):
+        """Method to adjust the host's concurrency limit after a request.
+
+        Args:
+            url(str): URL of the request.
+            ok(bool): False when the host answered 429 or 5xx or the connection failed.
+            retry_after(float, optional): Seconds the host asked to wait before the next request.
+        """
+        with self._cond:
+            now = time.monotonic()
+            state = self._state(self.host_key(url), now)
+            if ok:
+                # additive increase: one more slot per full window of successes
+                state.limit = min(self.max_concurrency, state.limit + 1 / state.limit)
+            elif now - state.last_decrease >= self.backoff:
+                # multiplicative decrease, once per backoff period so that the
+                # failures of one window count as a single congestion signal
+                state.limit = max(self.min_concurrency, state.limit / 2)
+                state.last_decrease = now
+            if retry_after:
+                state.blocked_until = max(state.blocked_until, now + retry_after)
+            self._cond.notify_all()
+
+    def retry_delay(self, attempt):
+        """Method to return how long to wait before retrying a failed request.
+
+        Args:
+            attempt(int): Number of retries made so far.
+
+        Returns:
+            float: Seconds to wait, or None when no retries are left.
+        """
+        if attempt >= self.retries:
+            return None
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def limit(self, url):
+        """Method to return the current concurrency limit of a host.
+
+        Args:
+            url(str): URL on the host.
+
+        Returns:
+            int: Requests allowed in flight at once.
+        """
+        with self._cond:
+            return int(self._state(self.host_key(url), time.monotonic()).limit)
@@ -0,0 +1,68 @@
+"""
+Single-flight execution of duplicate work.
+
+A call made with the same key as a call still running in another thread
+does not run: it waits for the running call and shares its result, or the
+exception it raised. Keys are forgotten once their call returns, so later
+calls run again.
+"""
+
+import threading
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Registry of the calls in progress, keyed by what they compute."""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._calls)
+
+    def run(self, key, function, timeout=None):
+        """Method to call a function, or wait for the call already running under the same key.
+
+        Args:
+            key(hashable): What the function computes.
+            function(callable): Called without arguments if no call with this key is running.
+            timeout(float, optional): Seconds to wait for a call made by another thread. Defaults to None, no limit.
+
+        Raises:
+            Exception: Whatever the function raised, in every thread that waited for it.
+            TimeoutError: The call made by another thread did not return within timeout seconds.
+
+        Returns:
+            tuple: The result, and whether it was shared from a call made by another thread.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            if not call.done.wait(timeout):
+                raise TimeoutError('timed out waiting for a call made by another thread')
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = function()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
@@ -0,0 +1,669 @@
+"""
+HTTP transport used by wikiHowUnofficialAPI.
+
+Keeps keep-alive connections pooled per host so that consecutive requests to
+the same wikiHow language site reuse one TCP/TLS connection instead of paying
+a new handshake every time.
+
+A process forked from one holding pooled connections starts with empty
+pools: the sockets are shared with the parent, and two processes reading
+responses from one connection would corrupt each other's pages.
+"""
+
+import base64
+import email.message
+import http.client
+import os
+import socket
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import weakref
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from wikihowunofficialapi import instrument
+from wikihowunofficialapi.exceptions import FetchError, FetchTimeout, HTTPError, NetworkError, RateLimited
+from wikihowunofficialapi.scheduler import RETRY_ERRORS, RETRY_STATUSES, parse_retry_after
+
+# brotli is only offered when the optional brotli package is installed
+ACCEPT_ENCODING = 'gzip, deflate, br' if brotli is not None else 'gzip, deflate'
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'wikiHowUnofficialAPI',
+    'Accept': 'text/html,application/xhtml+xml',
+    'Accept-Encoding': ACCEPT_ENCODING,
+}
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+# methods retried by a scheduler, since sending them twice does no harm
+IDEMPOTENT_METHODS = ('GET', 'HEAD')
+
+
+def time_left(until):
+    """Method to return the seconds left before a deadline.
+
+    Args:
+        until(float): time.monotonic() value of the deadline, or None for no deadline.
+
+    Returns:
+        float: Seconds left, at least 0, or None without a deadline.
+    """
+    if until is None:
+        return None
+    return max(0.0, until - time.monotonic())
+
+
+def _bounded(timeout, until):
+    # the timeout of one socket operation, cut short by the deadline
+    left = time_left(until)
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise TimeoutError('deadline exceeded')
+    return left if timeout is None else min(timeout, left)
+
+
+def _proxy_authorization(proxy):
+    """Method to return the Proxy-Authorization header for the credentials of a proxy URL.
+
+    Args:
+        proxy(urllib.parse.SplitResult): The proxy URL.
+
+    Returns:
+        str: Basic credentials, as urllib sends them, or None when the URL has no user.
+    """
+    if proxy.username is None:
+        return None
+    credentials = '{}:{}'.format(urllib.parse.unquote(proxy.username), urllib.parse.unquote(proxy.password or ''))
+    return 'Basic ' + base64.b64encode(credentials.encode('utf-8')).decode('ascii')
+
+
+def fetch_error(error, url):
+    """Method to translate an error raised while fetching a page into a FetchError.
+
+    Args:
+        error(Exception): The error raised by Transport.open.
+        url(str): URL that was requested.
+
+    Returns:
+        FetchError: The matching FetchError, or None when the error did not come from the network.
+    """
+    if isinstance(error, FetchError):
+        return error
+    if isinstance(error, urllib.error.HTTPError):
+        retry_after = parse_retry_after(error.headers.get('Retry-After')) if error.headers else None
+        return (RateLimited if error.code == 429 else HTTPError)(error.url or url, error.code, retry_after)
+    if isinstance(error, urllib.error.URLError) and isinstance(error.reason, Exception):
+        error = error.reason
+    if isinstance(error, (TimeoutError, socket.timeout)):
+        return FetchTimeout('timed out fetching {}'.format(url))
+    if isinstance(error, (OSError, http.client.HTTPException)):
+        return NetworkError('{} fetching {}: {}'.format(type(error).__name__, url, error))
+    return None
+
+
+class _Body:
+    """Stands in for an http.client.HTTPResponse whose body is already in memory."""
+
+    will_close = True
+
+    def __init__(self, data):
+        self._data = data
+        self._pos = 0
+
+    def read(self, amt=None):
+        end = len(self._data) if amt is None else self._pos + amt
+        data = self._data[self._pos:end]
+        self._pos += len(data)
+        return data
+
+    def isclosed(self):
+        return self._pos >= len(self._data)
+
+
+class _Decoder:
+    """Incremental decompressor for one Content-Encoding."""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._decompressor = brotli.Decompressor()
+        elif encoding in ('gzip', 'x-gzip'):
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        else:
+            self._decompressor = None
+
+    @classmethod
+    def for_headers(cls, headers):
+        encoding = (headers.get('Content-Encoding') or '').strip().lower()
+        if encoding in ('gzip', 'x-gzip', 'deflate') or (encoding == 'br' and brotli is not None):
+            return cls(encoding)
+        return None
+
+    def decode(self, data, final):
+        if self._decompressor is None:
+            # servers send "deflate" both with and without the zlib header
+            zlib_header = len(data) >= 2 and data[0] & 0x0F == 8 and (data[0] << 8 | data[1]) % 31 == 0
+            self._decompressor = zlib.decompressobj(zlib.MAX_WBITS if zlib_header else -zlib.MAX_WBITS)
+        if self.encoding == 'br':
+            return self._decompressor.process(data)
+        decoded = self._decompressor.decompress(data)
+        if final:
+            decoded += self._decompressor.flush()
+        return decoded
+
+
+class Response:
+    """A response returned by Transport.open.
+
+    The underlying connection goes back to its pool once the body has been
+    read to the end; closing the response early discards the connection.
+    A gzip, deflate or brotli body is decompressed as it is read.
+
+    Attributes:
+        bytes_received(int): Body bytes read from the network so far, as sent, 0 for a cached body.
+        bytes_decoded(int): Body bytes returned by read so far, after decompression.
+    """
+
+    # bytes read at a time while a deadline is checked between reads
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, url, status, reason, headers, raw, release, from_cache=False, decode=False, sock=None,
+                 read_timeout=None, until=None):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.from_cache = from_cache
+        self.bytes_received = 0
+        self.bytes_decoded = 0
+        self._raw = raw
+        self._release = release
+        self._network = decode
+        self._decoder = _Decoder.for_headers(headers) if decode else None
+        self._sock = sock
+        self._read_timeout = read_timeout
+        self._until = until
+
+    @classmethod
+    def from_bytes(cls, url, status, headers, body, from_cache=False):
+        """Method to build a response whose body is already in memory.
+
+        Args:
+            url(str): URL of the response.
+            status(int): HTTP status of the response.
+            headers(mapping): Response headers.
+            body(bytes): Response body.
+            from_cache(bool, optional): Whether the body was served by a ResponseCache. Defaults to False.
+
+        Returns:
+            Response: The response.
+        """
+        message = email.message.Message()
+        for name, value in headers.items():
+            message[name] = value
+        return cls(url, status, http.client.responses.get(status, ''), message,
+                   _Body(body), lambda reusable: None, from_cache)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def geturl(self):
+        """Method to return the final URL of the response, after redirects.
+
+        Returns:
+            str: The final URL of the response
+        """
+        return self.url
+
+    def read(self, amt=None):
+        """Method to read the response body.
+
+        Args:
+            amt(int, optional): Maximum number of bytes to read. Defaults to None, which reads everything.
+
+        Returns:
+            bytes: The data read
+        """
+        if self._raw is None:
+            return b''
+        if self._until is not None:
+            if amt is None:
+                # one read of the whole body could outlast the deadline, so check it between chunks
+                chunks = []
+                while self._raw is not None:
+                    chunks.append(self.read(self.CHUNK_SIZE))
+                return b''.join(chunks)
+            self._sock.settimeout(_bounded(self._read_timeout, self._until))
+        while True:
+            if self._until is not None:
+                # read1 makes at most one read from the socket, so the timeout set above bounds it
+                chunk = self._raw.read1(amt)
+            else:
+                chunk = self._raw.read(amt) if amt is not None else self._raw.read()
+            done = amt is None or not chunk or self._raw.isclosed()
+            if self._network:
+                self.bytes_received += len(chunk)
+            data = chunk if self._decoder is None else self._decoder.decode(chunk, done)
+            # a compressed chunk may decode to nothing yet, which read must not pass off as the end
+            if data or done:
+                break
+        self.bytes_decoded += len(data)
+        if done:
+            self._finish(reusable=True)
+        return data
+
+    def close(self):
+        """Method to close the response, discarding the connection if the body was not fully read."""
+        if self._raw is not None:
+            self._finish(reusable=self._raw.isclosed())
+
+    def _finish(self, reusable):
+        raw, self._raw = self._raw, None
+        reusable = reusable and raw.isclosed() and not raw.will_close
+        self._release(reusable)
+        if self._network and instrument._listeners:
+            instrument.emit('transfer', url=self.url, encoding=self._decoder.encoding if self._decoder else None,
+                            bytes_received=self.bytes_received, bytes_decoded=self.bytes_decoded,
+                            complete=raw.isclosed())
+
+
+class _HostPool:
+    """Idle keep-alive connections to a single (scheme, host, port)."""
+
+    def __init__(self, factory, size):
+        self._factory = factory
+        self._size = size
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._factory(), False
+
+    def release(self, conn, reusable):
+        if reusable:
+            with self._lock:
+                if len(self._idle) < self._size:
+                    self._idle.append(conn)
+                    return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class Transport:
+    """Pooled HTTP/1.1 client for wikiHow pages.
+
+    Args:
+        pool_size(int, optional): Idle connections kept per host. Defaults to 10.
+        headers(dict, optional): Headers sent with every request, merged over DEFAULT_HEADERS.
+        proxies(dict, optional): Mapping of scheme to proxy URL, which may carry user:password credentials.
+            Defaults to the environment proxies, as urllib does.
+        max_redirects(int, optional): Redirects followed before giving up. Defaults to 10.
+        cache(ResponseCache, optional): Cache consulted for GET requests. Defaults to None, which disables caching.
+        host_overrides(dict, optional): Mapping of hostname to the 'host:port' address its requests are sent to
+            over plain HTTP, keeping the original Host header and passing the original scheme in
+            X-Forwarded-Proto. Used to point the package at a local server.
+        scheduler(HostScheduler, optional): Per-host rate limit, concurrency limit and retry policy.
+            Defaults to None, which sends every request at once and never retries.
+        connect_timeout(float, optional): Seconds to open a connection, TLS handshake included. Defaults to 10.
+        read_timeout(float, optional): Seconds to wait for each read of a response. Defaults to 30.
+            None waits forever.
+    """
+
+    def __init__(self, pool_size=10, headers=None, proxies=None, max_redirects=10, cache=None, host_overrides=None,
+                 scheduler=None, connect_timeout=10, read_timeout=30):
+        self.pool_size = pool_size
+        self.headers = dict(DEFAULT_HEADERS)
+        if headers:
+            self.headers.update(headers)
+        self.proxies = urllib.request.getproxies() if proxies is None else dict(proxies)
+        self.max_redirects = max_redirects
+        self.cache = cache
+        self.host_overrides = dict(host_overrides or {})
+        self.scheduler = scheduler
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._pools = {}
+        self._lock = threading.Lock()
+        _transports.add(self)
+
+    def _proxy_for(self, scheme, host):
+        proxy = self.proxies.get(scheme)
+        if not proxy or host in self.host_overrides or urllib.request.proxy_bypass(host):
+            return None
+        return urllib.parse.urlsplit(proxy if '://' in proxy else 'http://' + proxy)
+
+    def _pool(self, scheme, host, port):
+        key = (scheme, host, port)
+        pool = self._pools.get(key)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(key)
+                if pool is None:
+                    pool = _HostPool(
+                        lambda: self._connect(scheme, host, port), self.pool_size)
+                    self._pools[key] = pool
+        return pool
+
+    def _connect(self, scheme, host, port):
+        if host in self.host_overrides:
+            return http.client.HTTPConnection(self.host_overrides[host], timeout=self.connect_timeout)
+        proxy = self._proxy_for(scheme, host)
+        if proxy is None:
+            if scheme == 'https':
+                return http.client.HTTPSConnection(host, port, timeout=self.connect_timeout)
+            return http.client.HTTPConnection(host, port, timeout=self.connect_timeout)
+        # the port defaults by the scheme of the proxy URL, not of the page
+        proxy_port = proxy.port or (443 if proxy.scheme == 'https' else 80)
+        if scheme == 'https':
+            conn = http.client.HTTPSConnection(proxy.hostname, proxy_port, timeout=self.connect_timeout)
+            authorization = _proxy_authorization(proxy)
+            conn.set_tunnel(host, port, headers={'Proxy-Authorization': authorization} if authorization else None)
+            return conn
+        return http.client.HTTPConnection(proxy.hostname, proxy_port, timeout=self.connect_timeout)
+
+    def _prepare(self, conn, until):
+        # connect with the connect timeout, then leave the read timeout on the socket
+        if conn.sock is None:
+            conn.timeout = _bounded(self.connect_timeout, until)
+            conn.connect()
+        conn.sock.settimeout(_bounded(self.read_timeout, until))
+
+    def _send(self, url, method, headers, until=None):
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ('http', 'https'):
+            raise urllib.error.URLError('unknown url type: {}'.format(scheme))
+        host = parts.hostname
+        port = parts.port or (443 if scheme == 'https' else 80)
+        target = urllib.parse.urlunsplit(('', '', parts.path or '/', parts.query, ''))
+        proxy = self._proxy_for(scheme, host) if scheme == 'http' else None
+        if proxy is not None:
+            target = urllib.parse.urlunsplit(
+                (scheme, parts.netloc, parts.path or '/', parts.query, ''))
+
+        request_headers = dict(self.headers)
+        request_headers['Host'] = parts.netloc
+        if proxy is not None:
+            # an HTTPS page gets the credentials in its CONNECT request instead, see _connect
+            authorization = _proxy_authorization(proxy)
+            if authorization:
+                request_headers['Proxy-Authorization'] = authorization
+        if host in self.host_overrides:
+            request_headers['X-Forwarded-Proto'] = scheme
+        if headers:
+            request_headers.update(headers)
+
+        pool = self._pool(scheme, host, port)
+        conn, reused = pool.acquire()
+        try:
+            try:
+                self._prepare(conn, until)
+                conn.request(method, target, headers=request_headers)
+                raw = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if not reused:
+                    raise
+                # the server dropped an idle keep-alive connection, retry once on a fresh one
+                conn.close()
+                conn = pool._factory()
+                self._prepare(conn, until)
+                conn.request(method, target, headers=request_headers)
+                raw = conn.getresponse()
+        except Exception:
+            conn.close()
+            raise
+        return raw, lambda reusable: pool.release(conn, reusable), conn.sock
+
+    def open(self, url, headers=None, method='GET', timeout=None):
+        """Method to request a URL, following redirects.
+
+        With a scheduler, requests wait for their host's rate and concurrency
+        limits, and GET and HEAD requests failing with 429, 5xx or a network
+        error are retried after a backoff.
+
+        Args:
+            url(str): URL to request.
+            headers(dict, optional): Extra headers for this request only.
+            method(str, optional): HTTP method. Defaults to 'GET'.
+            timeout(float, optional): Seconds the whole exchange may take, from waiting for the scheduler
+                through redirects and retries to reading the body. Defaults to None, which only applies
+                connect_timeout and read_timeout.
+
+        Raises:
+            urllib.error.HTTPError: The server answered with an error status.
+            urllib.error.URLError: The URL could not be requested.
+            TimeoutError: A connection, a read or the whole exchange timed out.
+
+        Returns:
+            Response: The response for the final URL.
+        """
+        until = None if timeout is None else time.monotonic() + timeout
+        return self._retrying(url, method, lambda: self._open_cached(url, headers, method, until), until)
+
+    def resolve(self, url, max_hops=None, timeout=None):
+        """Method to find where a URL redirects to without downloading any page.
+
+        Redirects are followed with HEAD requests, so only headers travel.
+
+        Args:
+            url(str): URL to resolve.
+            max_hops(int, optional): Redirects followed at most. Defaults to max_redirects; 1 stops at the
+                article Special:Randomizer points to.
+            timeout(float, optional): Seconds all the requests may take together. Defaults to None.
+
+        Raises:
+            urllib.error.HTTPError: The server answered with an error status.
+            urllib.error.URLError: The URL could not be requested.
+            TimeoutError: A connection, a read or the whole exchange timed out.
+
+        Returns:
+            str: The URL the redirects led to.
+        """
+        until = None if timeout is None else time.monotonic() + timeout
+        return self._retrying(url, 'HEAD', lambda: self._resolve(url, max_hops, until), until)
+
+    def _retrying(self, url, method, request, until=None):
+        if self.scheduler is None:
+            return request()
+        attempt = 0
+        while True:
+            try:
+                return request()
+            except urllib.error.HTTPError as e:
+                if e.code not in RETRY_STATUSES:
+                    raise
+                error = e
+            except RETRY_ERRORS as e:
+                error = e
+            delay = self.scheduler.retry_delay(attempt) if method in IDEMPOTENT_METHODS else None
+            if delay is None or until is not None and time.monotonic() + delay >= until:
+                raise error
+            if instrument._listeners:
+                instrument.emit('retry', url=url, attempt=attempt + 1, error=error, delay=delay)
+            time.sleep(delay)
+            attempt += 1
+
+    def _open_cached(self, url, headers, method, until=None):
+        if self.cache is None or method != 'GET':
+            return self._open(url, headers, method, until)
+
+        entry = self.cache.get(url)
+        if entry is not None and self.cache.is_fresh(entry):
+            if instrument._listeners:
+                instrument.emit('cache', url=url, result='hit')
+            return Response.from_bytes(entry.url, entry.status, entry.headers, entry.body, True)
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry.etag:
+                request_headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                request_headers['If-Modified-Since'] = entry.last_modified
+        response = self._open(url, request_headers, method, until)
+        if response.status == 304 and entry is not None:
+            with response:
+                response.read()
+            self.cache.refresh(entry, response.headers)
+            if instrument._listeners:
+                instrument.emit('cache', url=url, result='revalidated')
+            return Response.from_bytes(entry.url, entry.status, entry.headers, entry.body, True)
+
+        # closed even when the read fails, so that the connection and its scheduler slot are released
+        with response:
+            body = response.read()
+        if instrument._listeners:
+            instrument.emit('cache', url=url, result='miss')
+        if response.status == 200 and 'no-store' not in (response.headers.get('Cache-Control') or ''):
+            # a body is only stored under the URL that served it, so that a
+            # redirecting URL such as Special:Randomizer is never cached
+            self.cache.put(response.url, response.status, response.headers, body)
+        cached = Response.from_bytes(response.url, response.status, response.headers, body)
+        cached.bytes_received = response.bytes_received
+        return cached
+
+    def _open(self, url, headers, method, until=None):
+        for _ in range(self.max_redirects + 1):
+            raw, release, sock = self._request(url, method, headers, until)
+            response = Response(url, raw.status, raw.reason, raw.headers, raw, release, decode=True, sock=sock,
+                                read_timeout=self.read_timeout, until=until)
+            location = raw.getheader('Location')
+            if raw.status in REDIRECT_CODES and location:
+                with response:
+                    response.read()
+                url = urllib.parse.urljoin(url, location)
+                if raw.status == 303:
+                    method = 'GET'
+                continue
+            if raw.status >= 400:
+                with response:
+                    response.read()
+                raise urllib.error.HTTPError(
+                    url, raw.status, raw.reason, raw.headers, None)
+            return response
+        raise urllib.error.HTTPError(
+            url, raw.status, 'Too many redirects', raw.headers, None)
+
+    def _resolve(self, url, max_hops, until=None):
+        for _ in range(self.max_redirects if max_hops is None else max_hops):
+            raw, release, _ = self._request(url, 'HEAD', None, until)
+            # a HEAD response has no body, reading it just hands the connection back
+            with Response(url, raw.status, raw.reason, raw.headers, raw, release, decode=True) as response:
+                response.read()
+            location = raw.getheader('Location')
+            if raw.status in REDIRECT_CODES and location:
+                url = urllib.parse.urljoin(url, location)
+                continue
+            if raw.status >= 400:
+                raise urllib.error.HTTPError(url, raw.status, raw.reason, raw.headers, None)
+            break
+        return url
+
+    def _request(self, url, method, headers, until=None):
+        listening = instrument._listeners
+        if listening:
+            start = time.perf_counter()
+        if self.scheduler is None:
+            raw, release, sock = self._send(url, method, headers, until)
+        else:
+            raw, release, sock = self._send_scheduled(url, method, headers, until)
+        if listening:
+            instrument.emit('request', url=url, method=method, status=raw.status,
+                            seconds=time.perf_counter() - start)
+        return raw, release, sock
+
+    def _send_scheduled(self, url, method, headers, until=None):
+        scheduler = self.scheduler
+        scheduler.acquire(url, time_left(until))
+        try:
+            raw, release, sock = self._send(url, method, headers, until)
+        except Exception as e:
+            scheduler.release(url)
+            scheduler.record(url, not isinstance(e, RETRY_ERRORS))
+            raise
+        retry_after = None
+        if raw.status in (429, 503):
+            retry_after = parse_retry_after(raw.getheader('Retry-After'))
+        scheduler.record(url, raw.status not in RETRY_STATUSES, retry_after)
+
+        def release_slot(reusable):
+            # the request stays in flight until its body has been read
+            try:
+                release(reusable)
+            finally:
+                scheduler.release(url)
+        return raw, release_slot, sock
+
+    def close(self):
+        """Method to close every pooled connection."""
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close()
+
+
+_default_transport = None
+_default_lock = threading.Lock()
+# every transport, so that a forked child can drop the connections it inherited
+_transports = weakref.WeakSet()
+
+
+def _forget_connections():
+    """Method run in a forked child: drop the pooled connections inherited from the parent.
+
+    The child never sends or reads on them again, so the parent keeps using
+    them undisturbed. Locks are replaced because a thread of the parent may
+    have held them at the time of the fork.
+    """
+    global _default_lock
+    _default_lock = threading.Lock()
+    for transport in list(_transports):
+        transport._lock = threading.Lock()
+        transport._pools = {}
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_connections)
+
+
+def get_transport():
+    """Method to return the transport shared by the whole package.
+
+    Returns:
+        Transport: The shared transport, created on first use
+    """
+    global _default_transport
+    if _default_transport is None:
+        with _default_lock:
+            if _default_transport is None:
+                _default_transport = Transport()
+    return _default_transport
+
+
+def set_transport(transport):
+    """Method to replace the transport shared by the whole package.
+
+    Args:
+        transport(Transport): The transport to use from now on.
+    """
+    global _default_transport
+    with _default_lock:
+        _default_transport = transport